@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+import argparse
+import collections
+import json
+import os
+import random
+import re
+import resource
+import socketserver
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import server
+
+JPEG_HEADER = bytes.fromhex(
+    "ffd8ffe000104a46494600010100000100010000ffdb004300080606070605080707070909"
+    "080a0c140d0c0b0b0c1912130f141d1a1f1e1d1a1c1c20242e2720222c231c1c2837292c30"
+    "313434341f27393d38323c2e333432ffc0000b080001000101011100ffc4001f0000010501"
+    "010101010100000000000000000102030405060708090a0bffc400b5100002010303020403"
+    "050504040000017d01020300041105122131410613516107227114328191a1082342b1c115"
+    "52d1f02433627282090a161718191a25262728292a3435363738393a434445464748494a53"
+    "5455565758595a636465666768696a737475767778797a838485868788898a929394959697"
+    "98999aa2a3a4a5a6a7a8a9aab2b3b4b5b6b7b8b9bac2c3c4c5c6c7c8c9cad2d3d4d5d6d7d8"
+    "d9dae1e2e3e4e5e6e7e8e9eaf1f2f3f4f5f6f7f8f9faffda0008010100003f00fbd3ffd9"
+)
+SESSION_TOKEN = "bench-session"
+
+
+def build_frame(size, sequence):
+    body = JPEG_HEADER[2:]
+    padding = max(0, size - len(JPEG_HEADER))
+    segments = []
+    marker = f"bench-frame-{sequence}".encode("ascii")
+    while padding > 0:
+        chunk = min(padding, 65000)
+        content = (marker + b" " * chunk)[:chunk]
+        segments.append(b"\xff\xfe" + (len(content) + 2).to_bytes(2, "big") + content)
+        padding -= chunk + 4
+    return JPEG_HEADER[:2] + b"".join(segments) + body
+
+
+class FakeCameraHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        return None
+
+    def do_GET(self):
+        match = re.match(r"^/camera/([^/]+)\.(jpg|mjpeg)$", self.path)
+        if not match:
+            self.send_error(404)
+            return
+        camera_id, kind = match.groups()
+        stats = self.server.stats
+        with stats["lock"]:
+            stats["frames"] += 1
+            stats["fetched_at"][camera_id].append(time.time())
+            sequence = stats["frames"]
+        frame = build_frame(self.server.frame_bytes, sequence)
+        if kind == "jpg":
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(frame)))
+            self.end_headers()
+            self.wfile.write(frame)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+        self.end_headers()
+        try:
+            for _ in range(10):
+                self.wfile.write(b"--frame\r\nContent-Type: image/jpeg\r\n")
+                self.wfile.write(f"Content-Length: {len(frame)}\r\n\r\n".encode())
+                self.wfile.write(frame + b"\r\n")
+                time.sleep(0.1)
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        return None
+
+    def _send_json(self, payload, status=200):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            return self._send_json({"models": [{"name": self.server.model}]})
+        if self.path == "/api/ps":
+            return self._send_json({"models": [{"name": self.server.model}]})
+        return self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", "0"))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path == "/api/pull":
+            return self._send_json({"status": "success"})
+        if self.path != "/api/generate":
+            return self._send_json({"error": "not found"}, 404)
+        stats = self.server.stats
+        with stats["lock"]:
+            stats["active"] += 1
+            stats["peak_active"] = max(stats["peak_active"], stats["active"])
+        try:
+            delay = self.server.latency + random.uniform(0, self.server.jitter)
+            time.sleep(delay)
+            triggered = random.random() < self.server.trigger_rate
+            text = "YES. A person is lying on the floor." if triggered else "NO."
+            with stats["lock"]:
+                stats["requests"] += 1
+                stats["image_bytes"] += sum(
+                    len(item) for item in body.get("images", [])
+                )
+            return self._send_json(
+                {
+                    "model": body.get("model", ""),
+                    "response": text,
+                    "done": True,
+                    "total_duration": int(delay * 1e9),
+                    "load_duration": 0,
+                }
+            )
+        finally:
+            with stats["lock"]:
+                stats["active"] -= 1
+
+
+class FakeSmtpHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self):
+        self._reply("220 bench.local ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.wfile.write(b"250-bench.local\r\n250 AUTH PLAIN LOGIN\r\n")
+            elif command.startswith("AUTH"):
+                self._reply("235 Authenticated")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                self._reply("250 OK")
+            elif command == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(data_line)
+                self._record(b"".join(lines).decode("utf-8", "replace"))
+                self._reply("250 Queued")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("250 OK")
+
+    def _record(self, message):
+        received_at = time.time()
+        match = re.search(r"Camera: (bench-\d+)", message)
+        stats = self.server.stats
+        with stats["lock"]:
+            stats["messages"] += 1
+            if match:
+                stats["received"].append((match.group(1), received_at))
+
+
+class FakeSmtpServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _serve(httpd):
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    return httpd
+
+
+def start_fake_camera(frame_bytes=150000):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeCameraHandler)
+    httpd.daemon_threads = True
+    httpd.frame_bytes = frame_bytes
+    httpd.stats = {
+        "lock": threading.Lock(),
+        "frames": 0,
+        "fetched_at": collections.defaultdict(list),
+    }
+    return _serve(httpd)
+
+
+def start_mock_ollama(latency=0.5, jitter=0.2, trigger_rate=0.0, model="bench-vision"):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllamaHandler)
+    httpd.daemon_threads = True
+    httpd.latency = latency
+    httpd.jitter = jitter
+    httpd.trigger_rate = trigger_rate
+    httpd.model = model
+    httpd.stats = {
+        "lock": threading.Lock(),
+        "requests": 0,
+        "active": 0,
+        "peak_active": 0,
+        "image_bytes": 0,
+    }
+    return _serve(httpd)
+
+
+def start_smtp_sink():
+    sink = FakeSmtpServer(("127.0.0.1", 0), FakeSmtpHandler)
+    sink.stats = {"lock": threading.Lock(), "messages": 0, "received": []}
+    return _serve(sink)
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summarize(values):
+    return {
+        "count": len(values),
+        "p50": _percentile(values, 0.5),
+        "p99": _percentile(values, 0.99),
+        "max": max(values) if values else 0.0,
+    }
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/status", encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _api(port, path, payload=None):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}{path}",
+        data=data,
+        method="POST" if data is not None else "GET",
+        headers={"Content-Type": "application/json", "X-Session-Token": SESSION_TOKEN},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            return response.status, json.loads(response.read() or b"{}")
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read() or b"{}")
+
+
+def build_config(camera_port, ollama_port, smtp_port, cameras, interval, mode):
+    profiles = []
+    for index in range(cameras):
+        camera_id = f"bench-{index}"
+        extension = "mjpeg" if mode == "mjpeg" else "jpg"
+        profiles.append(
+            {
+                "id": camera_id,
+                "name": camera_id,
+                "model": "Bench camera",
+                "previewUrl": (
+                    f"http://127.0.0.1:{camera_port}/camera/{camera_id}.{extension}"
+                ),
+                "previewMode": "mjpeg",
+                "verdictCacheSeconds": 0,
+            }
+        )
+    return {
+        "cameras": profiles,
+        "activeCameraId": profiles[0]["id"] if profiles else None,
+        "monitorAllCameras": True,
+        "ollama": {
+            "host": "127.0.0.1",
+            "port": ollama_port,
+            "model": "bench-vision",
+            "prompt": "Return YES if a person is lying on the floor, otherwise NO.",
+            "trigger": "YES",
+            "timeoutSeconds": 60,
+            "intervalSeconds": interval,
+        },
+        "alerts": {
+            "emailEnabled": True,
+            "gmailUser": "bench@example.com",
+            "gmailAppPassword": "bench",
+            "senderEmail": "bench@example.com",
+            "smtpHost": "127.0.0.1",
+            "smtpPort": smtp_port,
+            "smtpSsl": False,
+        },
+        "responders": [{"name": "Bench", "email": "responder@example.com"}],
+    }
+
+
+def _api_load(port, ollama_port, cameras, clients, stop_event, latencies, errors):
+    def worker(worker_index):
+        index = worker_index
+        while not stop_event.is_set():
+            camera = cameras[index % len(cameras)]
+            index += clients
+            started_at = time.time()
+            status, payload = _api(
+                port,
+                "/api/ollama-analyze",
+                {
+                    "host": "127.0.0.1",
+                    "port": ollama_port,
+                    "model": "bench-vision",
+                    "prompt": "bench",
+                    "trigger": "YES",
+                    "previewUrl": camera["previewUrl"],
+                    "previewMode": "mjpeg",
+                    "cameraId": camera["id"],
+                    "cameraName": camera["name"],
+                    "verdictCacheSeconds": 0,
+                },
+            )
+            latencies.append(time.time() - started_at)
+            if status != 200:
+                errors[status] += 1
+                retry_after = payload.get("retry_after") or 1
+                stop_event.wait(min(float(retry_after), 1.0))
+            _api(port, "/api/state")
+
+    threads = [
+        threading.Thread(target=worker, args=(index,), daemon=True)
+        for index in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def _reset_server_state():
+    with server.RESPONSE_LOCK:
+        server.OLLAMA_RESPONSES.clear()
+    with server.INFERENCE_COND:
+        server.INFERENCE_QUEUE["waiting"].clear()
+        server.INFERENCE_QUEUE["backends"].clear()
+        server.INFERENCE_QUEUE["sequence"] = 0
+        server.RECENT_TRIGGERS.clear()
+    with server.ADAPTIVE_LOCK:
+        server.ADAPTIVE_STATE.clear()
+    with server.VERDICT_LOCK:
+        server.VERDICT_CACHE.clear()
+        server.VERDICT_STATS.update({"hits": 0, "misses": 0, "saved_seconds": 0.0})
+    with server.MONITOR_LOCK:
+        server.MONITOR_STATE["consecutive_timeouts"] = 0
+
+
+def run_scenario(args, cameras):
+    camera_server = start_fake_camera(args.frame_bytes)
+    ollama_server = start_mock_ollama(args.latency, args.jitter, args.trigger_rate)
+    smtp_sink = start_smtp_sink()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), server.RequestHandler)
+    httpd.daemon_threads = True
+    _serve(httpd)
+    port = httpd.server_address[1]
+
+    _reset_server_state()
+    server.MIN_MONITOR_INTERVAL = 0
+    server.TRACES = collections.deque(maxlen=100000)
+    server.TRACE_SETTINGS["sample_rate"] = 1.0
+    server.TRACE_SETTINGS["export_path"] = ""
+
+    _api(port, "/api/session/start", {"name": "bench", "token": SESSION_TOKEN})
+    config = build_config(
+        camera_server.server_address[1],
+        ollama_server.server_address[1],
+        smtp_sink.server_address[1],
+        cameras,
+        args.interval,
+        args.camera_mode,
+    )
+    _api(port, "/api/config", config)
+
+    baseline_rss = _rss_bytes()
+    peak_rss = baseline_rss
+    peak_threads = threading.active_count()
+    stop_event = threading.Event()
+    api_latencies = []
+    api_errors = collections.Counter()
+    started_at = time.time()
+    if args.mode in ("monitor", "mixed"):
+        _api(port, "/api/state", {"armed": True, "armed_by": "bench"})
+        server.start_monitor_thread()
+    load_threads = []
+    if args.mode in ("api", "mixed"):
+        load_threads = _api_load(
+            port,
+            ollama_server.server_address[1],
+            config["cameras"],
+            args.clients,
+            stop_event,
+            api_latencies,
+            api_errors,
+        )
+    while time.time() - started_at < args.duration:
+        time.sleep(0.25)
+        peak_rss = max(peak_rss, _rss_bytes())
+        peak_threads = max(peak_threads, threading.active_count())
+    stop_event.set()
+    _api(port, "/api/state", {"armed": False})
+    server.stop_monitor_thread()
+    if server.MONITOR_THREAD:
+        server.MONITOR_THREAD.join()
+    for thread in load_threads:
+        thread.join(timeout=5)
+    elapsed = time.time() - started_at
+
+    stages = collections.defaultdict(list)
+    for trace in list(server.TRACES):
+        for span in trace["spans"]:
+            stages[span["name"]].append(span["duration"])
+
+    alert_latencies = []
+    fetched_at = camera_server.stats["fetched_at"]
+    for camera_id, received_at in smtp_sink.stats["received"]:
+        earlier = [item for item in fetched_at[camera_id] if item <= received_at]
+        if earlier:
+            alert_latencies.append(received_at - max(earlier))
+
+    result = {
+        "cameras": cameras,
+        "mode": args.mode,
+        "duration": elapsed,
+        "interval": args.interval,
+        "ollama_latency": args.latency,
+        "ollama_jitter": args.jitter,
+        "frame_bytes": args.frame_bytes,
+        "frames_captured": camera_server.stats["frames"],
+        "inferences": ollama_server.stats["requests"],
+        "frames_per_second": ollama_server.stats["requests"] / elapsed,
+        "peak_concurrent_generations": ollama_server.stats["peak_active"],
+        "alerts_sent": smtp_sink.stats["messages"],
+        "alert_latency": _summarize(alert_latencies),
+        "api_latency": _summarize(api_latencies),
+        "api_errors": dict(api_errors),
+        "stages": {name: _summarize(values) for name, values in sorted(stages.items())},
+        "rss_bytes": peak_rss,
+        "rss_growth_bytes": peak_rss - baseline_rss,
+        "threads": peak_threads,
+        "inference_queue": server.get_inference_queue_snapshot(),
+    }
+
+    server.TRACE_SETTINGS["sample_rate"] = 0.0
+    for listener in (httpd, camera_server, ollama_server, smtp_sink):
+        listener.shutdown()
+        listener.server_close()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark server.py against local camera, Ollama and SMTP fakes."
+    )
+    parser.add_argument("--cameras", default="1,4,16", help="Comma-separated counts.")
+    parser.add_argument(
+        "--mode", choices=("monitor", "api", "mixed"), default="monitor"
+    )
+    parser.add_argument("--camera-mode", choices=("jpeg", "mjpeg"), default="jpeg")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--trigger-rate", type=float, default=0.05)
+    parser.add_argument("--frame-bytes", type=int, default=150000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--output", default="", help="Write JSON results to a file.")
+    args = parser.parse_args(argv)
+
+    results = []
+    for count in [int(item) for item in args.cameras.split(",") if item.strip()]:
+        print(f"Running scenario: cameras={count} mode={args.mode}", file=sys.stderr)
+        results.append(run_scenario(args, count))
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "cpu_count": os.cpu_count(),
+        "scenarios": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
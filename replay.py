@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+import argparse
+import collections
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bench
+import server
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".avi", ".mov", ".m4v", ".webm")
+
+
+def _parse_label(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value != 0
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes", "fall", "y"):
+        return True
+    if text in ("0", "false", "no", "none", "n", ""):
+        return False
+    raise ValueError(f"Unrecognised label: {value}")
+
+
+def load_labels(path):
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        if path.lower().endswith(".json"):
+            raw = json.load(handle)
+            if not isinstance(raw, dict):
+                raise ValueError("Labels JSON must be an object keyed by file name.")
+            labels = {}
+            for name, value in raw.items():
+                if isinstance(value, list):
+                    labels[name] = [(float(start), float(end)) for start, end in value]
+                else:
+                    labels[name] = _parse_label(value)
+            return labels
+        labels = {}
+        for row in csv.reader(handle):
+            if not row or row[0].startswith("#") or row[0] == "name":
+                continue
+            labels[row[0].strip()] = _parse_label(row[1] if len(row) > 1 else "")
+        return labels
+
+
+def label_for(labels, name, offset):
+    value = labels.get(name)
+    if value is None:
+        value = labels.get(os.path.basename(name))
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return any(start <= (offset or 0) <= end for start, end in value)
+    return value
+
+
+def collect_sources(paths):
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _dirs, files in os.walk(path):
+                for filename in sorted(files):
+                    full_path = os.path.join(root, filename)
+                    if filename.lower().endswith(IMAGE_EXTENSIONS + VIDEO_EXTENSIONS):
+                        sources.append((os.path.relpath(full_path, path), full_path))
+        elif os.path.isfile(path):
+            sources.append((os.path.basename(path), path))
+        else:
+            raise FileNotFoundError(path)
+    return sorted(sources)
+
+
+def iter_video_frames(path, sample_interval):
+    try:
+        import cv2  # type: ignore
+    except Exception:
+        raise RuntimeError("opencv-python is not installed")
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Failed to open video: {path}")
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0
+        index = 0
+        next_offset = 0.0
+        while True:
+            if not cap.grab():
+                return
+            offset = index / fps if fps > 0 else cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+            index += 1
+            if offset + 1e-6 < next_offset:
+                continue
+            with server.trace_span("replay.decode"):
+                ok, frame = cap.retrieve()
+            if ok and frame is not None:
+                yield offset, frame
+            next_offset = offset + sample_interval
+    finally:
+        cap.release()
+
+
+def iter_samples(sources, sample_interval):
+    for name, path in sources:
+        if path.lower().endswith(VIDEO_EXTENSIONS):
+            for offset, frame in iter_video_frames(path, sample_interval):
+                yield name, offset, frame
+            continue
+        with open(path, "rb") as handle:
+            yield name, None, handle.read()
+
+
+def preprocess(sample, max_width, quality):
+    if not isinstance(sample, bytes):
+        return server.encode_frame_jpeg(sample, max_width, quality)
+    reencode = max_width or quality != server.IMAGE_JPEG_QUALITY
+    if not reencode and sample[:2] == b"\xff\xd8":
+        return sample
+    try:
+        import cv2  # type: ignore
+        import numpy  # type: ignore
+    except Exception:
+        raise RuntimeError("opencv-python is not installed")
+
+    with server.trace_span("replay.decode"):
+        frame = cv2.imdecode(numpy.frombuffer(sample, dtype=numpy.uint8), 1)
+    if frame is None:
+        raise RuntimeError("Failed to decode image")
+    return server.encode_frame_jpeg(frame, max_width, quality)
+
+
+def _score(outcomes):
+    counts = collections.Counter()
+    for outcome in outcomes:
+        if outcome["label"] is None or outcome["error"]:
+            continue
+        if outcome["triggered"]:
+            counts["tp" if outcome["label"] else "fp"] += 1
+        else:
+            counts["fn" if outcome["label"] else "tn"] += 1
+    predicted = counts["tp"] + counts["fp"]
+    actual = counts["tp"] + counts["fn"]
+    precision = counts["tp"] / predicted if predicted else None
+    recall = counts["tp"] / actual if actual else None
+    f1 = None
+    if precision and recall:
+        f1 = 2 * precision * recall / (precision + recall)
+    return {
+        "true_positive": counts["tp"],
+        "false_positive": counts["fp"],
+        "true_negative": counts["tn"],
+        "false_negative": counts["fn"],
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+    }
+
+
+def run_replay(args, settings, model, sources, labels):
+    server.TRACES = collections.deque(maxlen=1000000)
+    server.TRACE_SETTINGS["sample_rate"] = 1.0
+    server.TRACE_SETTINGS["export_path"] = ""
+    server.INFERENCE_MAX_CONCURRENCY = args.workers
+    server.INFERENCE_MAX_QUEUE = max(server.INFERENCE_MAX_QUEUE, args.workers * 2)
+
+    payload = {
+        "host": settings["host"],
+        "port": settings["port"],
+        "model": model,
+        "prompt": settings["prompt"],
+        "trigger": settings["trigger"],
+        "timeoutSeconds": settings["timeoutSeconds"],
+        "maxFrameAgeSeconds": 24 * 60 * 60,
+        "cameraId": "replay",
+        "cameraName": "replay",
+        "priority": "routine",
+    }
+    outcomes = []
+    outcomes_lock = threading.Lock()
+    in_flight = threading.BoundedSemaphore(args.workers * 2)
+
+    def analyze(name, offset, sample):
+        try:
+            with server.trace_span("replay.sample", source=name):
+                with server.trace_span("replay.preprocess"):
+                    image_bytes = preprocess(sample, args.max_width, args.quality)
+                result, _status = server.ollama_analyze_payload(
+                    dict(payload, cameraName=name), image_bytes
+                )
+            outcome = {
+                "source": name,
+                "offset": offset,
+                "label": label_for(labels, name, offset),
+                "triggered": bool(result.get("triggered")),
+                "response": result.get("response", ""),
+                "error": "" if result.get("ok") else result.get("error", ""),
+                "duration": result.get("duration"),
+                "bytes": len(image_bytes),
+            }
+        except Exception as exc:  # pylint: disable=broad-except
+            outcome = {
+                "source": name,
+                "offset": offset,
+                "label": label_for(labels, name, offset),
+                "triggered": False,
+                "response": "",
+                "error": str(exc),
+                "duration": None,
+                "bytes": 0,
+            }
+        finally:
+            in_flight.release()
+        with outcomes_lock:
+            outcomes.append(outcome)
+
+    started_at = time.time()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for name, offset, sample in iter_samples(sources, args.sample_interval):
+            in_flight.acquire()
+            executor.submit(analyze, name, offset, sample)
+    elapsed = time.time() - started_at
+
+    stages = collections.defaultdict(list)
+    for trace in list(server.TRACES):
+        for span in trace["spans"]:
+            stages[span["name"]].append(span["duration"])
+    footage_seconds = 0.0
+    for name in {outcome["source"] for outcome in outcomes}:
+        offsets = [
+            outcome["offset"]
+            for outcome in outcomes
+            if outcome["source"] == name and outcome["offset"] is not None
+        ]
+        if offsets:
+            footage_seconds += max(offsets) + args.sample_interval
+    outcomes.sort(key=lambda item: (item["source"], item["offset"] or 0))
+    mistakes = [
+        {key: outcome[key] for key in ("source", "offset", "label", "response")}
+        for outcome in outcomes
+        if outcome["label"] is not None
+        and not outcome["error"]
+        and outcome["label"] != outcome["triggered"]
+    ]
+    return {
+        "model": model,
+        "host": f"{settings['host']}:{settings['port']}",
+        "workers": args.workers,
+        "max_width": args.max_width,
+        "quality": args.quality,
+        "samples": len(outcomes),
+        "labelled": sum(1 for outcome in outcomes if outcome["label"] is not None),
+        "errors": sum(1 for outcome in outcomes if outcome["error"]),
+        "triggered": sum(1 for outcome in outcomes if outcome["triggered"]),
+        "duration": elapsed,
+        "samples_per_second": len(outcomes) / elapsed if elapsed else 0.0,
+        "footage_seconds": footage_seconds,
+        "realtime_factor": footage_seconds / elapsed if elapsed else 0.0,
+        "mean_image_bytes": (
+            sum(outcome["bytes"] for outcome in outcomes) / len(outcomes)
+            if outcomes
+            else 0
+        ),
+        "scores": _score(outcomes),
+        "stages": {
+            name: bench._summarize(values)  # pylint: disable=protected-access
+            for name, values in sorted(stages.items())
+        },
+        "mistakes": mistakes,
+        "first_errors": [outcome for outcome in outcomes if outcome["error"]][:5],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=(
+            "Replay recorded footage through the server.py inference pipeline "
+            "and score it against labels."
+        )
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="Video files, JPEG files or directories of them."
+    )
+    parser.add_argument("--labels", default="", help="Labels file (.json or .csv).")
+    parser.add_argument("--config", default="", help="Exported config JSON.")
+    parser.add_argument("--host", default="")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument(
+        "--models", default="", help="Comma-separated models to compare."
+    )
+    parser.add_argument("--prompt", default="")
+    parser.add_argument("--trigger", default="")
+    parser.add_argument("--timeout", type=float, default=0)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=1.0,
+        help="Seconds of video between sampled frames.",
+    )
+    parser.add_argument("--max-width", type=int, default=0)
+    parser.add_argument("--quality", type=int, default=server.IMAGE_JPEG_QUALITY)
+    parser.add_argument(
+        "--mock", action="store_true", help="Use the bench.py mock Ollama."
+    )
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--trigger-rate", type=float, default=0.05)
+    parser.add_argument("--output", default="", help="Write JSON results to a file.")
+    args = parser.parse_args(argv)
+    args.workers = max(1, args.workers)
+
+    settings = {
+        "host": "",
+        "port": 0,
+        "model": "",
+        "prompt": "Return YES if a person is lying on the floor, otherwise NO.",
+        "trigger": "YES",
+        "timeoutSeconds": 60,
+    }
+    if args.config:
+        with open(args.config, encoding="utf-8") as handle:
+            config = json.load(handle)
+        # pylint: disable-next=protected-access
+        loaded, error = server._get_ollama_settings(config)
+        if loaded is None:
+            parser.error(f"--config: {error}")
+        settings.update(loaded)
+    mock = None
+    if args.mock:
+        mock = bench.start_mock_ollama(args.latency, args.jitter, args.trigger_rate)
+        settings.update(
+            host="127.0.0.1", port=mock.server_address[1], model="bench-vision"
+        )
+    for key, value in (
+        ("host", args.host),
+        ("port", args.port),
+        ("prompt", args.prompt),
+        ("trigger", args.trigger),
+        ("timeoutSeconds", args.timeout),
+    ):
+        if value:
+            settings[key] = value
+    models = [item.strip() for item in args.models.split(",") if item.strip()]
+    models = models or [settings["model"]]
+    if not settings["host"] or not settings["port"] or not all(models):
+        parser.error("Ollama host, port and model are required (or use --mock).")
+
+    sources = collect_sources(args.paths)
+    if not sources:
+        parser.error("No images or videos found.")
+    labels = load_labels(args.labels)
+
+    results = []
+    for model in models:
+        print(
+            f"Replaying {len(sources)} sources: model={model} workers={args.workers}",
+            file=sys.stderr,
+        )
+        results.append(run_replay(args, settings, model, sources, labels))
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "cpu_count": os.cpu_count(),
+        "sources": len(sources),
+        "runs": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+    if mock is not None:
+        mock.shutdown()
+        mock.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,93 @@
 #!/usr/bin/env python3
+import array
+import atexit
 import base64
+import bisect
+import collections
 import copy
+import csv
+import datetime
 import email.message
 import email.utils
+import io
 import json
+import logging
+import logging.handlers
+import math
 import mimetypes
+import multiprocessing
 import os
+import queue
+import random
+import re
 import smtplib
+import socket
+import sqlite3
+import subprocess
 import sys
 import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 
 WEB_ROOT = os.path.join(os.path.dirname(__file__), "web")
+PROCESS_STARTED_AT = time.time()
+STATE_FILE = os.environ.get(
+    "FALLDETECTOR_STATE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "falldetector-state.json"),
+)
+STATE_FILE_LOCK = threading.Lock()
+STATE_PERSIST = {"enabled": False}
+WARMUP_TIMEOUT_SECONDS = 90
+WARMUP_DONE = threading.Event()
+WARMUP_DONE.set()
+READINESS = {"components": {}, "warmup_seconds": None, "first_cycle_seconds": None}
+READINESS_LOCK = threading.Lock()
 RETENTION_SECONDS = 48 * 60 * 60
 DEFAULT_MONITOR_INTERVAL = 180
 MIN_MONITOR_INTERVAL = 10
+DEFAULT_SMTP_HOST = "smtp.gmail.com"
+DEFAULT_SMTP_PORT = 465
 OLLAMA_RESPONSES = []
-SESSIONS = {}
+RESPONSE_STATE = {"revision": 0, "bytes": 0}
+RESPONSE_RECORD_OVERHEAD = 256
+EXPORT_BATCH_SIZE = 200
+EXPORT_CHUNK_BYTES = 64 * 1024
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "zip": ("application/zip", "zip"),
+}
+EXPORT_CSV_COLUMNS = (
+    "id",
+    "time",
+    "camera_id",
+    "camera_name",
+    "camera_model",
+    "model",
+    "triggered",
+    "duration",
+    "cached",
+    "instance",
+    "evidence_frames",
+    "text",
+)
+RESPONSE_CHANGES = collections.deque(maxlen=500)
+RESPONSE_PAGE_LIMIT = 500
+SESSIONS = collections.OrderedDict()
 ACTIVE_SESSION = {"token": None}
 SESSION_LOCK = threading.Lock()
+SESSION_IDLE_SECONDS = int(os.environ.get("FALLDETECTOR_SESSION_IDLE_SECONDS", "600"))
+SESSION_HEARTBEAT_SECONDS = max(5, min(60, SESSION_IDLE_SECONDS // 4))
+SESSION_RETENTION_SECONDS = 60 * 60
+SESSION_MAX_ENTRIES = 200
+SESSION_STATUSES = ("active", "closed", "kicked", "expired")
 STATE_LOCK = threading.Lock()
 RESPONSE_LOCK = threading.Lock()
 SERVER_STATE = {"armed": False, "armed_at": 0, "armed_by": "", "config": {}}
@@ -35,43 +100,927 @@ MONITOR_STATE = {
     "consecutive_timeouts": 0,
 }
 MONITOR_LOCK = threading.Lock()
+ADAPTIVE_STATE = {}
+ADAPTIVE_LOCK = threading.Lock()
+ADAPTIVE_LATENCY_WINDOW = 20
+ADAPTIVE_LATENCY_HEADROOM = 2.0
+ADAPTIVE_BACKOFF = 1.25
+ADAPTIVE_MOTION_DISTANCE = 4
 MONITOR_STOP = threading.Event()
-MONITOR_THREAD = None
-PULL_STATE = {
-    "in_progress": False,
-    "status": "Idle.",
-    "completed": 0,
-    "total": 0,
-    "model": "",
-    "host": "",
-    "port": 0,
+MONITOR_RESCHEDULE = set()
+MONITOR_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="monitor")
+CONFIG_CAMERA_KEYS = ("cameras", "camera", "activeCameraId", "monitorAllCameras")
+CONFIG_CAPTURE_KEYS = (
+    "streamUrl",
+    "inferenceStreamUrl",
+    "previewStreamUrl",
+    "evidenceStreamUrl",
+    "autoSubstream",
+    "captureBackend",
+    "previewUrl",
+    "previewMode",
+)
+CONFIG_OLLAMA_CONNECTION_KEYS = ("host", "port")
+CONFIG_OLLAMA_SCHEDULE_KEYS = (
+    "intervalSeconds",
+    "adaptiveInterval",
+    "minIntervalSeconds",
+    "maxIntervalSeconds",
+    "nearTriggerWords",
+)
+CONFIG_ALERT_KEYS = ("alerts", "responders")
+CLUSTER_DB = os.environ.get("FALLDETECTOR_CLUSTER_DB", "")
+CLUSTER_INSTANCE_ID = os.environ.get(
+    "FALLDETECTOR_INSTANCE_ID", f"{socket.gethostname()}-{os.getpid()}"
+)
+CLUSTER_INSTANCE_URL = os.environ.get("FALLDETECTOR_INSTANCE_URL", "")
+CLUSTER_LEASE_SECONDS = float(
+    os.environ.get("FALLDETECTOR_CLUSTER_LEASE_SECONDS", "15")
+)
+CLUSTER_IMPORT_BATCH = 500
+CLUSTER_FORGET_LEASES = 20
+CLUSTER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS instances (
+    id TEXT PRIMARY KEY,
+    url TEXT,
+    started_at REAL,
+    heartbeat_at REAL,
+    active INTEGER,
+    status TEXT
+);
+CREATE TABLE IF NOT EXISTS leases (
+    camera_key TEXT PRIMARY KEY,
+    instance_id TEXT,
+    expires_at REAL,
+    acquired_at REAL
+);
+CREATE TABLE IF NOT EXISTS shared (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    version INTEGER,
+    updated_by TEXT,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS responses (
+    instance_id TEXT,
+    timestamp REAL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS responses_timestamp ON responses (timestamp);
+"""
+CLUSTER_STATE = {
+    "store": None,
+    "owned": set(),
+    "versions": {},
+    "response_cursor": 0,
+    "last_sync": 0.0,
+    "pruned_at": 0.0,
     "error": "",
-    "started_at": 0,
 }
+CLUSTER_LOCK = threading.Lock()
+CLUSTER_STOP = threading.Event()
+CLUSTER_THREAD = None
+MONITOR_THREAD = None
+PULL_STATE = {"model": "", "started_at": 0, "hosts": collections.OrderedDict()}
 PULL_LOCK = threading.Lock()
-PULL_CANCEL = False
-PULL_RESPONSE = None
+PULL_ACTIVE_STATES = ("queued", "pulling", "retrying")
+PULL_MAX_ATTEMPTS = 5
+PULL_RETRY_SECONDS = 5
+PULL_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="pull")
+INFERENCE_PRIORITIES = {"manual": 0, "triggered": 1, "routine": 2}
+INFERENCE_MAX_CONCURRENCY = int(
+    os.environ.get("FALLDETECTOR_INFERENCE_CONCURRENCY", "1")
+)
+INFERENCE_MAX_QUEUE = int(os.environ.get("FALLDETECTOR_INFERENCE_QUEUE", "8"))
+INFERENCE_MONITOR_RESERVE = min(
+    INFERENCE_MAX_QUEUE - 1,
+    int(os.environ.get("FALLDETECTOR_MONITOR_RESERVE", "2")),
+)
+INFERENCE_MANUAL_QUEUE = int(os.environ.get("FALLDETECTOR_MANUAL_QUEUE", "2"))
+INFERENCE_FRAME_MAX_AGE = 60
+RECENT_TRIGGER_WINDOW = 10 * 60
+RECENT_TRIGGERS_MAX = 256
+INFERENCE_QUEUE = {"waiting": [], "backends": {}, "sequence": 0}
+INFERENCE_COND = threading.Condition()
+RECENT_TRIGGERS = {}
+MODEL_RESIDENCY = {}
+MODEL_RESIDENCY_LOCK = threading.Lock()
+MIN_KEEP_ALIVE_SECONDS = 5 * 60
+COLD_LOAD_THRESHOLD = 1.0
+ADMISSION_ROUTES = {
+    "/api/ollama-analyze": {"concurrency": 2, "rate": 1.0, "burst": 6},
+    "/api/rtsp-snapshot": {"concurrency": 2, "rate": 1.0, "burst": 4},
+    "/api/check-preview": {"concurrency": 4, "rate": 1.0, "burst": 6},
+    "/api/check-ollama": {"concurrency": 4, "rate": 1.0, "burst": 6},
+    "/api/ollama-tags": {"concurrency": 2, "rate": 0.5, "burst": 4},
+    "/api/ollama-pull": {"concurrency": 1, "rate": 0.1, "burst": 2},
+    "/api/email-alert": {"concurrency": 1, "rate": 0.2, "burst": 3},
+    "/api/ollama-responses/export": {"concurrency": 2, "rate": 0.2, "burst": 3},
+}
+ADMISSION_MAX_CLIENTS = 1024
+TRUSTED_PROXIES = frozenset(
+    address.strip()
+    for address in os.environ.get("FALLDETECTOR_TRUSTED_PROXIES", "").split(",")
+    if address.strip()
+)
+ADMISSION_STATE = {"routes": {}, "buckets": collections.OrderedDict()}
+ADMISSION_LOCK = threading.Lock()
+HEALTH_TTL_SECONDS = 15
+HEALTH_STALE_SECONDS = 5 * 60
+HEALTH_REFRESH_SECONDS = 30
+HEALTH_CACHE = {}
+HEALTH_LOCK = threading.Lock()
+HEALTH_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="health")
+HEALTH_STOP = threading.Event()
+HEALTH_THREAD = None
+TAPO_MAIN_STREAM = re.compile(r"/stream1(\?|$)")
+SUBSTREAM_RETRY_SECONDS = 600
+SUBSTREAM_STATUS = {}
+SUBSTREAM_LOCK = threading.Lock()
+STREAMS = {}
+STREAMS_LOCK = threading.Lock()
+STREAM_MAX_FPS = 10.0
+STREAM_IDLE_SECONDS = 10
+STREAM_KEEPALIVE_SECONDS = 5
+STREAM_ERROR_GIVEUP_SECONDS = 30
+CAPTURE_OPEN_TIMEOUT_MS = 5000
+CAPTURE_READ_TIMEOUT_MS = 5000
+CAPTURE_DEADLINE_SECONDS = 12
+CAPTURE_ABANDON_SECONDS = 60
+CAPTURE_MAX_ABANDONED = 8
+CAPTURE_HEALTH = {}
+CAPTURE_LOCK = threading.Lock()
+CAPTURE_OPTIONS_STATE = {"configured": False}
+AVFORMAT_RTSP_TIMEOUT_MAJOR = 59
+RTSP_TRANSPORT = os.environ.get("FALLDETECTOR_RTSP_TRANSPORT", "tcp").strip().lower()
+FFMPEG_BIN = os.environ.get("FALLDETECTOR_FFMPEG", "ffmpeg")
+FFPROBE_BIN = os.environ.get("FALLDETECTOR_FFPROBE", "ffprobe")
+FFMPEG_FPS = float(os.environ.get("FALLDETECTOR_FFMPEG_FPS", "1"))
+FFMPEG_WIDTH = int(os.environ.get("FALLDETECTOR_FFMPEG_WIDTH", "640"))
+FFMPEG_KEYFRAMES_ONLY = os.environ.get("FALLDETECTOR_FFMPEG_KEYFRAMES", "1") != "0"
+FFMPEG_MAX_FRAME_AGE = 5
+FFMPEG_IDLE_SECONDS = 5 * 60
+FFMPEG_READERS = {}
+FFMPEG_LOCK = threading.Lock()
+IMAGE_WORKERS = int(os.environ.get("FALLDETECTOR_IMAGE_WORKERS", "0"))
+IMAGE_SLOT_BYTES = int(os.environ.get("FALLDETECTOR_IMAGE_SLOT_MB", "12")) * 1024 * 1024
+IMAGE_MAX_WIDTH = int(os.environ.get("FALLDETECTOR_IMAGE_MAX_WIDTH", "0"))
+IMAGE_JPEG_QUALITY = 95
+IMAGE_POOL = {"executor": None, "slots": [], "free": None}
+IMAGE_POOL_LOCK = threading.Lock()
+WORKER_SHARED_MEMORY = {}
+EVIDENCE_PRE_SECONDS = float(os.environ.get("FALLDETECTOR_EVIDENCE_PRE_SECONDS", "8"))
+EVIDENCE_POST_SECONDS = float(os.environ.get("FALLDETECTOR_EVIDENCE_POST_SECONDS", "4"))
+EVIDENCE_FPS = 2.0
+EVIDENCE_RING_BYTES = int(
+    float(os.environ.get("FALLDETECTOR_EVIDENCE_RING_MB", "4")) * 1024 * 1024
+)
+EVIDENCE_TOTAL_BYTES = int(
+    float(os.environ.get("FALLDETECTOR_EVIDENCE_MB", "64")) * 1024 * 1024
+)
+EVIDENCE_MAX_FRAMES = 24
+EVIDENCE_MAX_CLIPS = 50
+EVIDENCE_THUMB_WIDTH = 320
+FRAME_RINGS = collections.OrderedDict()
+FRAME_RINGS_LOCK = threading.Lock()
+EVIDENCE_CLIPS = collections.OrderedDict()
+EVIDENCE_FEED_HOLD_SECONDS = 5
+EVIDENCE_FEED_STOP = threading.Event()
+EVIDENCE_FEED_THREAD = None
+EVIDENCE_LOCK = threading.Lock()
+VERDICT_CACHE_SECONDS = float(
+    os.environ.get("FALLDETECTOR_VERDICT_CACHE_SECONDS", "0")
+)
+VERDICT_CACHE_DISTANCE = int(os.environ.get("FALLDETECTOR_VERDICT_CACHE_DISTANCE", "4"))
+VERDICT_CACHE_MAX_ENTRIES = 256
+VERDICT_CACHE = collections.OrderedDict()
+VERDICT_STATS = {"hits": 0, "misses": 0, "saved_seconds": 0.0}
+VERDICT_LOCK = threading.Lock()
+MEMORY_BUDGET_BYTES = int(
+    float(os.environ.get("FALLDETECTOR_MEMORY_MB", "256")) * 1024 * 1024
+)
+MEMORY_CATEGORIES = (
+    "responses",
+    "evidence",
+    "verdict_cache",
+    "stream_frames",
+    "frame_rings",
+    "ffmpeg_buffers",
+    "traces",
+    "sessions",
+)
+MEMORY_LIVE_CATEGORIES = ("stream_frames", "frame_rings", "ffmpeg_buffers", "sessions")
+MEMORY_VERDICT_ENTRY_BYTES = 512
+MEMORY_TRACE_BYTES = 512
+MEMORY_SPAN_BYTES = 768
+MEMORY_SESSION_BYTES = 1024
+MEMORY_STATE = {"evicted": {}}
+MEMORY_LOCK = threading.Lock()
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+BYTES_BUCKETS = (16384, 65536, 131072, 262144, 524288, 1048576, 2097152, 4194304)
+METRICS = {}
+METRIC_ADHOC_LABEL = "adhoc"
+HTTP_METRIC_ROUTES = frozenset(
+    (
+        "/metrics",
+        "/api/admission",
+        "/api/capture-health",
+        "/api/check-ollama",
+        "/api/check-preview",
+        "/api/config",
+        "/api/email-alert",
+        "/api/evidence",
+        "/api/health-cache",
+        "/api/health/ready",
+        "/api/inference-queue",
+        "/api/memory",
+        "/api/model-residency",
+        "/api/ollama-analyze",
+        "/api/ollama-pull",
+        "/api/ollama-pull-cancel",
+        "/api/ollama-pull-status",
+        "/api/ollama-responses",
+        "/api/ollama-responses/export",
+        "/api/ollama-tags",
+        "/api/rtsp-snapshot",
+        "/api/session/close",
+        "/api/session/heartbeat",
+        "/api/session/start",
+        "/api/session/takeover",
+        "/api/state",
+        "/api/stream",
+        "/api/streams",
+        "/api/traces",
+        "/api/verdict-cache",
+    )
+)
+METRICS_LOCK = threading.Lock()
+TRACE_SETTINGS = {
+    "sample_rate": float(os.environ.get("FALLDETECTOR_TRACE_SAMPLE", "0")),
+    "export_path": os.environ.get("FALLDETECTOR_TRACE_EXPORT", ""),
+}
+TRACE_BUFFER_SIZE = 50
+TRACES = collections.deque(maxlen=TRACE_BUFFER_SIZE)
+TRACE_LOCK = threading.Lock()
+TRACE_LOCAL = threading.local()
+LOG_SETTINGS = {
+    "level": getattr(
+        logging, os.environ.get("FALLDETECTOR_LOG_LEVEL", "INFO").upper(), logging.INFO
+    ),
+    "format": os.environ.get("FALLDETECTOR_LOG_FORMAT", "json").lower(),
+    "file": os.environ.get("FALLDETECTOR_LOG_FILE", ""),
+    "max_bytes": int(os.environ.get("FALLDETECTOR_LOG_MAX_MB", "10")) * 1024 * 1024,
+    "backups": int(os.environ.get("FALLDETECTOR_LOG_BACKUPS", "5")),
+    "samples": os.environ.get("FALLDETECTOR_LOG_SAMPLE", ""),
+}
+LOG_QUEUE_SIZE = 10000
+LOG_RATE_LIMIT = 5
+LOG_RATE_WINDOW = 60
+LOG_STATE = {
+    "configured": False,
+    "listener": None,
+    "windows": collections.OrderedDict(),
+}
+LOG_LOCK = threading.Lock()
+LOGGER = logging.getLogger("falldetector")
 
 
-def _json_response(handler, payload, status=200):
+def _json_response(handler, payload, status=200, headers=None):
     data = json.dumps(payload).encode("utf-8")
     handler.send_response(status)
     handler.send_header("Content-Type", "application/json")
     handler.send_header("Content-Length", str(len(data)))
+    for name, value in (headers or {}).items():
+        handler.send_header(name, str(value))
     handler.end_headers()
     try:
         handler.wfile.write(data)
     except BrokenPipeError:
         if hasattr(handler, "_log_broken_pipe"):
             handler._log_broken_pipe()
+    return status
+
+
+class _JsonLogFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(
+                record.created, datetime.timezone.utc
+            ).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "category": getattr(record, "category", "app"),
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _TextLogFormatter(logging.Formatter):
+    def format(self, record):
+        fields = getattr(record, "fields", {})
+        details = " ".join(f"{name}={value}" for name, value in fields.items())
+        message = record.getMessage()
+        return f"{message} {details}" if details else message
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metric_inc("falldetector_log_dropped_total", reason="queue_full")
+
+    def prepare(self, record):
+        return record
+
+
+def _parse_log_samples(value):
+    samples = {}
+    for item in value.split(","):
+        name, _, rate = item.partition("=")
+        try:
+            samples[name.strip()] = max(0.0, min(1.0, float(rate)))
+        except ValueError:
+            continue
+    return samples
+
+
+def configure_logging():
+    with LOG_LOCK:
+        if LOG_STATE["configured"]:
+            return
+        if isinstance(LOG_SETTINGS["samples"], str):
+            LOG_SETTINGS["samples"] = _parse_log_samples(LOG_SETTINGS["samples"])
+        formatter = (
+            _TextLogFormatter()
+            if LOG_SETTINGS["format"] == "text"
+            else _JsonLogFormatter()
+        )
+        handlers = [logging.StreamHandler(sys.stderr)]
+        if LOG_SETTINGS["file"]:
+            handlers.append(
+                logging.handlers.RotatingFileHandler(
+                    LOG_SETTINGS["file"],
+                    maxBytes=LOG_SETTINGS["max_bytes"],
+                    backupCount=LOG_SETTINGS["backups"],
+                    encoding="utf-8",
+                )
+            )
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=False
+        )
+        LOGGER.handlers[:] = [_DroppingQueueHandler(log_queue)]
+        LOGGER.setLevel(LOG_SETTINGS["level"])
+        LOGGER.propagate = False
+        listener.start()
+        LOG_STATE["listener"] = listener
+        LOG_STATE["configured"] = True
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    with LOG_LOCK:
+        listener = LOG_STATE["listener"]
+        LOG_STATE["listener"] = None
+    if listener is not None:
+        listener.stop()
+
+
+def _log_allowed_locked(level, category, key, now):
+    if level >= logging.WARNING:
+        window = LOG_STATE["windows"].get(key)
+        if window is None or now - window["started_at"] >= LOG_RATE_WINDOW:
+            suppressed = window["suppressed"] if window else 0
+            LOG_STATE["windows"][key] = {"started_at": now, "count": 1, "suppressed": 0}
+            if len(LOG_STATE["windows"]) > 1000:
+                LOG_STATE["windows"].popitem(last=False)
+            return True, suppressed
+        if window["count"] >= LOG_RATE_LIMIT:
+            window["suppressed"] += 1
+            return False, 0
+        window["count"] += 1
+        return True, 0
+    rate = LOG_SETTINGS["samples"].get(category, LOG_SETTINGS["samples"].get("*", 1.0))
+    return rate >= 1.0 or random.random() < rate, 0
+
+
+def log_event(level, category, message, **fields):
+    if not LOG_STATE["configured"]:
+        configure_logging()
+    if not LOGGER.isEnabledFor(level):
+        return
+    key = (category, fields.pop("rate_key", message))
+    with LOG_LOCK:
+        allowed, suppressed = _log_allowed_locked(level, category, key, time.time())
+    if not allowed:
+        reason = "rate_limited" if level >= logging.WARNING else "sampled"
+        metric_inc("falldetector_log_dropped_total", reason=reason)
+        return
+    if suppressed:
+        fields["suppressed_repeats"] = suppressed
+    LOGGER.log(level, message, extra={"category": category, "fields": fields})
+
+
+def _metric_define(name, kind, help_text, buckets=None):
+    METRICS[name] = {
+        "kind": kind,
+        "help": help_text,
+        "buckets": buckets,
+        "series": {},
+        "lock": threading.Lock(),
+    }
+
+
+def _metric_series(family, labels):
+    key = tuple(sorted((name, str(value)) for name, value in labels.items()))
+    series = family["series"].get(key)
+    if series is None:
+        with METRICS_LOCK:
+            series = family["series"].get(key)
+            if series is None:
+                if family["kind"] == "histogram":
+                    series = [0] * (len(family["buckets"]) + 2)
+                else:
+                    series = [0]
+                family["series"][key] = series
+    return series
+
+
+def metric_observe(name, value, **labels):
+    family = METRICS[name]
+    series = _metric_series(family, labels)
+    buckets = family["buckets"]
+    index = len(buckets)
+    for position, bound in enumerate(buckets):
+        if value <= bound:
+            index = position
+            break
+    with family["lock"]:
+        series[index] += 1
+        series[-1] += value
+
+
+def metric_inc(name, amount=1, **labels):
+    family = METRICS[name]
+    series = _metric_series(family, labels)
+    with family["lock"]:
+        series[0] += amount
+
+
+def metric_set(name, value, **labels):
+    family = METRICS[name]
+    _metric_series(family, labels)[0] = value
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    escaped = [
+        (name, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in pairs
+    ]
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _metric_labels(camera_id, model, backend):
+    with STATE_LOCK:
+        config = SERVER_STATE.get("config") or {}
+        cameras = _get_configured_cameras(config)
+        settings, _error = _get_ollama_settings(config)
+    settings = settings or {}
+    configured_backend = f"{settings.get('host')}:{settings.get('port')}"
+    return (
+        camera_id if camera_id in cameras else METRIC_ADHOC_LABEL,
+        model if model and model == settings.get("model") else METRIC_ADHOC_LABEL,
+        backend if backend == configured_backend else METRIC_ADHOC_LABEL,
+    )
+
+
+def render_metrics():
+    inference_queue = get_inference_queue_snapshot()
+    depths = collections.Counter()
+    active = collections.Counter()
+    for backend, stats in inference_queue["backends"].items():
+        label = _metric_labels("", "", backend)[2]
+        depths[label] += stats["depth"]
+        active[label] += stats["active"]
+    for backend, depth in depths.items():
+        metric_set("falldetector_inference_queue_depth", depth, backend=backend)
+        metric_set("falldetector_inference_active", active[backend], backend=backend)
+    with MONITOR_LOCK:
+        metric_set("falldetector_monitor_running", int(MONITOR_STATE["running"]))
+    with RESPONSE_LOCK:
+        metric_set("falldetector_responses_stored", len(OLLAMA_RESPONSES))
+    with CAPTURE_LOCK:
+        stuck = sum(len(health["stuck_workers"]) for health in CAPTURE_HEALTH.values())
+    metric_set("falldetector_capture_stuck_workers", stuck)
+    for status, count in get_session_stats()["statuses"].items():
+        metric_set("falldetector_sessions", count, status=status)
+    for category, size in _memory_collect().items():
+        metric_set("falldetector_memory_bytes", size, category=category)
+
+    lines = []
+    for name, family in list(METRICS.items()):
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['kind']}")
+        with family["lock"]:
+            snapshot = [(key, list(series)) for key, series in family["series"].items()]
+        for key, series in snapshot:
+            if family["kind"] != "histogram":
+                lines.append(f"{name}{_format_labels(key)} {series[0]}")
+                continue
+            cumulative = 0
+            for bound, count in zip(family["buckets"], series):
+                cumulative += count
+                labels = _format_labels(key + (("le", repr(float(bound))),))
+                lines.append(f"{name}_bucket{labels} {cumulative}")
+            cumulative += series[len(family["buckets"])]
+            labels = _format_labels(key + (("le", "+Inf"),))
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(key)} {series[-1]}")
+            lines.append(f"{name}_count{_format_labels(key)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+_metric_define(
+    "falldetector_capture_seconds",
+    "histogram",
+    "Time to acquire a frame from a camera.",
+    SECONDS_BUCKETS,
+)
+_metric_define(
+    "falldetector_encode_seconds",
+    "histogram",
+    "Time spent encoding frames and payloads.",
+    SECONDS_BUCKETS,
+)
+_metric_define(
+    "falldetector_payload_bytes",
+    "histogram",
+    "Size of images sent for inference.",
+    BYTES_BUCKETS,
+)
+_metric_define(
+    "falldetector_ollama_seconds",
+    "histogram",
+    "Ollama generate latency by cold or warm model load.",
+    SECONDS_BUCKETS,
+)
+_metric_define(
+    "falldetector_ollama_load_seconds",
+    "histogram",
+    "Model load time reported by Ollama.",
+    SECONDS_BUCKETS,
+)
+_metric_define(
+    "falldetector_inference_queue_wait_seconds",
+    "histogram",
+    "Time inference requests wait for a backend slot.",
+    SECONDS_BUCKETS,
+)
+_metric_define(
+    "falldetector_email_send_seconds",
+    "histogram",
+    "Time to deliver an email alert.",
+    SECONDS_BUCKETS,
+)
+_metric_define(
+    "falldetector_http_request_seconds",
+    "histogram",
+    "HTTP handler latency by route.",
+    SECONDS_BUCKETS,
+)
+_metric_define(
+    "falldetector_capture_recovery_seconds",
+    "histogram",
+    "Time from a stuck capture to the next successful capture.",
+    SECONDS_BUCKETS,
+)
+_metric_define("falldetector_inferences_total", "counter", "Completed inferences.")
+_metric_define(
+    "falldetector_capture_stuck_total", "counter", "Captures that missed the deadline."
+)
+_metric_define(
+    "falldetector_capture_stuck_workers", "gauge", "Capture workers still blocked."
+)
+_metric_define("falldetector_triggers_total", "counter", "Triggered inferences.")
+_metric_define("falldetector_errors_total", "counter", "Errors by stage.")
+_metric_define("falldetector_timeouts_total", "counter", "Inference timeouts.")
+_metric_define(
+    "falldetector_inference_rejected_total",
+    "counter",
+    "Inference requests rejected or dropped by the queue.",
+)
+_metric_define(
+    "falldetector_inference_queue_depth", "gauge", "Requests waiting per backend."
+)
+_metric_define(
+    "falldetector_inference_active", "gauge", "Generations running per backend."
+)
+_metric_define("falldetector_monitor_running", "gauge", "Monitor loop is armed.")
+_metric_define("falldetector_responses_stored", "gauge", "Stored AI responses.")
+_metric_define("falldetector_sessions", "gauge", "Session table entries by status.")
+_metric_define(
+    "falldetector_first_cycle_seconds",
+    "gauge",
+    "Seconds from process start to the first successful monitor cycle.",
+)
+_metric_define(
+    "falldetector_verdict_cache_total",
+    "counter",
+    "Perceptual-hash verdict cache lookups by result.",
+)
+_metric_define(
+    "falldetector_verdict_cache_saved_seconds_total",
+    "counter",
+    "Inference seconds avoided by reusing cached verdicts.",
+)
+_metric_define(
+    "falldetector_http_rejected_total",
+    "counter",
+    "Requests rejected by admission control by route and reason.",
+)
+_metric_define(
+    "falldetector_memory_bytes",
+    "gauge",
+    "Accounted memory by category.",
+)
+_metric_define(
+    "falldetector_memory_evicted_total",
+    "counter",
+    "Entries evicted to stay within the memory budget by category.",
+)
+_metric_define(
+    "falldetector_cluster_cameras_owned",
+    "gauge",
+    "Cameras leased to this instance in multi-instance mode.",
+)
+_metric_define(
+    "falldetector_log_dropped_total",
+    "counter",
+    "Log records dropped by sampling, rate limiting or a full queue.",
+)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+    def set(self, key, value):
         return None
 
 
+_NULL_SPAN = _NullSpan()
+
+
+class _UnsampledSpan(_NullSpan):
+    __slots__ = ()
+
+    def __enter__(self):
+        TRACE_LOCAL.span = _NULL_SPAN
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        TRACE_LOCAL.span = None
+        return False
+
+
+_UNSAMPLED_SPAN = _UnsampledSpan()
+
+
+class _Span:
+    __slots__ = (
+        "trace",
+        "name",
+        "span_id",
+        "parent",
+        "start",
+        "end",
+        "attributes",
+        "error",
+    )
+
+    def __init__(self, trace, name, parent, attributes):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent = parent
+        self.start = 0.0
+        self.end = 0.0
+        self.attributes = attributes
+        self.error = ""
+
+    def __enter__(self):
+        TRACE_LOCAL.span = self
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.end = time.time()
+        if exc is not None:
+            self.error = str(exc) or exc_type.__name__
+        TRACE_LOCAL.span = self.parent
+        self.trace["spans"].append(self)
+        if self.parent is None:
+            _trace_finish(self.trace, self)
+        return False
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+
+def trace_span(name, **attributes):
+    parent = getattr(TRACE_LOCAL, "span", None)
+    if parent is _NULL_SPAN:
+        return _NULL_SPAN
+    if parent is None:
+        sample_rate = TRACE_SETTINGS["sample_rate"]
+        if sample_rate <= 0:
+            return _NULL_SPAN
+        if sample_rate < 1 and random.random() >= sample_rate:
+            return _UNSAMPLED_SPAN
+        trace = {"trace_id": os.urandom(16).hex(), "spans": []}
+        return _Span(trace, name, None, attributes)
+    return _Span(parent.trace, name, parent, attributes)
+
+
+def _span_to_dict(span):
+    return {
+        "span_id": span.span_id,
+        "parent_id": span.parent.span_id if span.parent else "",
+        "name": span.name,
+        "start": span.start,
+        "duration": span.end - span.start,
+        "attributes": dict(span.attributes),
+        "error": span.error,
+    }
+
+
+def _span_to_otlp(trace_id, span):
+    attributes = [
+        {"key": key, "value": {"stringValue": str(value)}}
+        for key, value in span.attributes.items()
+    ]
+    return {
+        "traceId": trace_id,
+        "spanId": span.span_id,
+        "parentSpanId": span.parent.span_id if span.parent else "",
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(int(span.start * 1e9)),
+        "endTimeUnixNano": str(int(span.end * 1e9)),
+        "attributes": attributes,
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+
+
+def _trace_finish(trace, root):
+    spans = sorted(trace["spans"], key=lambda span: span.start)
+    record = {
+        "trace_id": trace["trace_id"],
+        "name": root.name,
+        "start": root.start,
+        "duration": root.end - root.start,
+        "error": root.error,
+        "spans": [_span_to_dict(span) for span in spans],
+    }
+    with TRACE_LOCK:
+        TRACES.appendleft(record)
+        export_path = TRACE_SETTINGS["export_path"]
+        if not export_path:
+            return
+        line = json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": [
+                                {
+                                    "key": "service.name",
+                                    "value": {"stringValue": "falldetector"},
+                                }
+                            ]
+                        },
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": "falldetector"},
+                                "spans": [
+                                    _span_to_otlp(trace["trace_id"], span)
+                                    for span in spans
+                                ],
+                            }
+                        ],
+                    }
+                ]
+            }
+        )
+        try:
+            with open(export_path, "a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+        except OSError as exc:
+            log_event(
+                logging.WARNING, "trace", "Trace export failed", error=str(exc)
+            )
+
+
+def get_traces_snapshot(limit=TRACE_BUFFER_SIZE):
+    with TRACE_LOCK:
+        return list(TRACES)[:limit]
+
+
+class ResponseRecord:
+    __slots__ = (
+        "id",
+        "seq",
+        "timestamp",
+        "text",
+        "model",
+        "triggered",
+        "camera_id",
+        "camera_name",
+        "camera_model",
+        "duration",
+        "cold_load",
+        "cached_from",
+        "evidence",
+        "instance",
+        "nbytes",
+    )
+
+    def __init__(self, entry):
+        self.id = str(entry.get("id") or uuid.uuid4().hex[:16])
+        self.seq = int(entry.get("seq") or 0)
+        self.timestamp = float(entry.get("timestamp") or time.time())
+        self.text = str(entry.get("text") or "")
+        self.model = sys.intern(str(entry.get("model") or ""))
+        self.triggered = bool(entry.get("triggered"))
+        self.camera_id = sys.intern(str(entry.get("camera_id") or ""))
+        self.camera_name = sys.intern(str(entry.get("camera_name") or ""))
+        self.camera_model = sys.intern(str(entry.get("camera_model") or ""))
+        self.duration = entry.get("duration")
+        self.cold_load = bool(entry.get("cold_load"))
+        self.cached_from = entry.get("cached_from") or None
+        self.evidence = entry.get("evidence") or None
+        self.instance = sys.intern(str(entry.get("instance") or ""))
+        self.nbytes = (
+            RESPONSE_RECORD_OVERHEAD
+            + sys.getsizeof(self.text)
+            + (len(json.dumps(self.evidence)) if self.evidence else 0)
+        )
+
+    def get(self, key, default=None):
+        if key == "cached":
+            return self.cached_from is not None
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def replace(self, **updates):
+        return ResponseRecord({**self.as_dict(), **updates})
+
+    def as_dict(self):
+        data = {
+            "id": self.id,
+            "seq": self.seq,
+            "timestamp": self.timestamp,
+            "text": self.text,
+            "model": self.model,
+            "triggered": self.triggered,
+            "camera_id": self.camera_id,
+            "camera_name": self.camera_name,
+            "camera_model": self.camera_model,
+            "duration": self.duration,
+            "cold_load": self.cold_load,
+        }
+        if self.cached_from is not None:
+            data["cached"] = True
+            data["cached_from"] = self.cached_from
+        if self.evidence is not None:
+            data["evidence"] = self.evidence
+        if self.instance:
+            data["instance"] = self.instance
+        return data
+
+
 def _prune_responses_locked():
     cutoff = time.time() - RETENTION_SECONDS
-    OLLAMA_RESPONSES[:] = [
-        item for item in OLLAMA_RESPONSES if item.get("timestamp", 0) >= cutoff
-    ]
+    while OLLAMA_RESPONSES and OLLAMA_RESPONSES[-1].timestamp < cutoff:
+        RESPONSE_STATE["bytes"] -= OLLAMA_RESPONSES.pop().nbytes
+    if not OLLAMA_RESPONSES:
+        RESPONSE_STATE["bytes"] = 0
 
 
 def prune_responses():
@@ -82,13 +1031,254 @@ def prune_responses():
 def store_response(entry):
     with RESPONSE_LOCK:
         _prune_responses_locked()
-        OLLAMA_RESPONSES.insert(0, entry)
+        RESPONSE_STATE["revision"] += 1
+        record = ResponseRecord({**entry, "seq": RESPONSE_STATE["revision"]})
+        RESPONSE_STATE["bytes"] += record.nbytes
+        OLLAMA_RESPONSES.insert(0, record)
+    cluster_publish_response(record.as_dict())
+    enforce_memory_budget()
+
+
+def update_response(response_id, **updates):
+    with RESPONSE_LOCK:
+        for index, item in enumerate(OLLAMA_RESPONSES):
+            if item.id == response_id:
+                RESPONSE_STATE["revision"] += 1
+                record = item.replace(**updates)
+                RESPONSE_STATE["bytes"] += record.nbytes - item.nbytes
+                OLLAMA_RESPONSES[index] = record
+                RESPONSE_CHANGES.append((RESPONSE_STATE["revision"], response_id))
+                return True
+    return False
+
+
+def get_responses_page(since=None, before=None, limit=None, triggered_only=False):
+    def matches(item):
+        return not triggered_only or item.triggered
+
+    with RESPONSE_LOCK:
+        _prune_responses_locked()
+        page = {"cursor": RESPONSE_STATE["revision"], "has_more": False}
+        if since is not None:
+            items = []
+            overflow = False
+            for item in OLLAMA_RESPONSES:
+                if item.seq <= since:
+                    break
+                if not matches(item):
+                    continue
+                if limit is not None and len(items) >= limit:
+                    overflow = True
+                    break
+                items.append(item.as_dict())
+            changed = {
+                response_id for rev, response_id in RESPONSE_CHANGES if rev > since
+            }
+            page["reset"] = overflow or (
+                len(RESPONSE_CHANGES) == RESPONSE_CHANGES.maxlen
+                and since < RESPONSE_CHANGES[0][0]
+            )
+            page["updated"] = []
+            for item in OLLAMA_RESPONSES:
+                if not changed:
+                    break
+                if item.id in changed:
+                    changed.discard(item.id)
+                    if item.seq <= since and matches(item):
+                        page["updated"].append(item.as_dict())
+            page["responses"] = items
+            return page
+        start = 0
+        if before is not None:
+            start = bisect.bisect_right(
+                OLLAMA_RESPONSES, -before, key=lambda item: -item.seq
+            )
+        items = []
+        for index in range(start, len(OLLAMA_RESPONSES)):
+            item = OLLAMA_RESPONSES[index]
+            if not matches(item):
+                continue
+            if limit is not None and len(items) >= limit:
+                page["has_more"] = True
+                break
+            items.append(item.as_dict())
+        page["responses"] = items
+        return page
+
+
+def iter_responses(since=None, until=None, cameras=None, triggered_only=False):
+    with RESPONSE_LOCK:
+        _prune_responses_locked()
+        last_seq = RESPONSE_STATE["revision"]
+    cursor = None
+    while True:
+        with RESPONSE_LOCK:
+            if cursor is None:
+                end = len(OLLAMA_RESPONSES)
+            else:
+                end = bisect.bisect_left(
+                    OLLAMA_RESPONSES, -cursor, key=lambda item: -item.seq
+                )
+            batch = OLLAMA_RESPONSES[max(0, end - EXPORT_BATCH_SIZE) : end]
+        if not batch:
+            return
+        cursor = batch[0].seq
+        for item in reversed(batch):
+            if item.seq > last_seq:
+                return
+            if triggered_only and not item.triggered:
+                continue
+            if cameras and item.camera_id not in cameras:
+                continue
+            if since is not None and item.timestamp < since:
+                continue
+            if until is not None and item.timestamp > until:
+                continue
+            yield item
+
+
+def _parse_export_time(value):
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.astimezone()
+    return parsed.timestamp()
+
+
+def _export_csv_row(item):
+    evidence = item.evidence or {}
+    return [
+        item.id,
+        datetime.datetime.fromtimestamp(
+            item.timestamp, datetime.timezone.utc
+        ).isoformat(),
+        item.camera_id,
+        item.camera_name,
+        item.camera_model,
+        item.model,
+        int(item.triggered),
+        "" if item.duration is None else round(item.duration, 3),
+        int(item.cached_from is not None),
+        item.instance,
+        evidence.get("frames", 0),
+        item.text,
+    ]
+
+
+class _ChunkedWriter:
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.buffer = bytearray()
+        self.written = 0
+
+    def write(self, data):
+        self.buffer += data
+        if len(self.buffer) >= EXPORT_CHUNK_BYTES:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self.buffer:
+            self.wfile.write(b"%x\r\n" % len(self.buffer) + self.buffer + b"\r\n")
+            self.written += len(self.buffer)
+            self.buffer.clear()
+        self.wfile.flush()
+
+    def close(self):
+        self.flush()
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def write_responses_export(out, export_format, filters):
+    count = 0
+    if export_format == "csv":
+        buffer = io.StringIO()
+        rows = csv.writer(buffer)
+        rows.writerow(EXPORT_CSV_COLUMNS)
+    for item in iter_responses(**filters):
+        count += 1
+        if export_format != "csv":
+            out.write(json.dumps(item.as_dict()).encode("utf-8") + b"\n")
+            continue
+        rows.writerow(_export_csv_row(item))
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            out.write(buffer.getvalue().encode("utf-8"))
+            buffer.seek(0)
+            buffer.truncate()
+    if export_format == "csv":
+        out.write(buffer.getvalue().encode("utf-8"))
+    return count
+
+
+def write_responses_zip(out, filters):
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("responses.ndjson", "w", force_zip64=True) as entry:
+            count = write_responses_export(entry, "ndjson", filters)
+        for item in iter_responses(**filters):
+            clip = get_evidence_clip(item.id) if item.evidence else None
+            if clip is None:
+                continue
+            for index, (captured_at, data) in enumerate(iter_evidence_frames(clip)):
+                offset = captured_at - clip["triggered_at"]
+                archive.writestr(
+                    f"evidence/{item.id}/{index:02d}_{offset:+.1f}s.jpg",
+                    data,
+                    compress_type=zipfile.ZIP_STORED,
+                )
+    return count
+
+
+def _prune_sessions_locked(now):
+    active_token = ACTIVE_SESSION["token"]
+    if active_token:
+        session = SESSIONS.get(active_token)
+        if session is None or now - session.get("last_seen", 0) > SESSION_IDLE_SECONDS:
+            ACTIVE_SESSION["token"] = None
+            active_token = None
+            if session is not None:
+                session.update({"status": "expired", "ended_at": now})
+                log_event(
+                    logging.INFO,
+                    "session",
+                    "Session expired after inactivity",
+                    name=session.get("name", ""),
+                )
+    cutoff = now - SESSION_RETENTION_SECONDS
+    for token in [
+        token
+        for token, session in SESSIONS.items()
+        if token != active_token and session.get("ended_at", 0) < cutoff
+    ]:
+        del SESSIONS[token]
+    while len(SESSIONS) > SESSION_MAX_ENTRIES:
+        oldest = next(token for token in SESSIONS if token != active_token)
+        del SESSIONS[oldest]
+
+
+def get_session_stats():
+    with SESSION_LOCK:
+        _prune_sessions_locked(time.time())
+        counts = collections.Counter(
+            session.get("status", "") for session in SESSIONS.values()
+        )
+        return {
+            "total": len(SESSIONS),
+            "active": bool(ACTIVE_SESSION["token"]),
+            "statuses": {status: counts[status] for status in SESSION_STATUSES},
+            "idle_timeout": SESSION_IDLE_SECONDS,
+        }
 
 
 def get_responses_snapshot():
     with RESPONSE_LOCK:
         _prune_responses_locked()
-        return list(OLLAMA_RESPONSES)
+        return [item.as_dict() for item in OLLAMA_RESPONSES]
 
 
 def extract_mjpeg_frame(response):
@@ -109,69 +1299,2573 @@ def extract_mjpeg_frame(response):
     raise RuntimeError("Failed to extract MJPEG frame")
 
 
-def fetch_preview_image(url):
-    req = urllib.request.Request(url, method="GET")
-    with urllib.request.urlopen(req, timeout=5) as response:
-        content_type = (response.headers.get("Content-Type", "") or "").lower()
-        if content_type.startswith("image/"):
-            return response.read()
-        if "multipart" in content_type or "mjpeg" in content_type:
-            return extract_mjpeg_frame(response)
-        raise RuntimeError(f"Unsupported content type: {content_type or 'unknown'}")
+def iter_mjpeg_frames(response, max_bytes=4 * 1024 * 1024):
+    buffer = b""
+    while True:
+        chunk = response.read1(65536) if hasattr(response, "read1") else None
+        if chunk is None:
+            chunk = response.read(4096)
+        if not chunk:
+            return
+        buffer += chunk
+        while True:
+            start = buffer.find(b"\xff\xd8")
+            if start == -1:
+                buffer = buffer[-1:]
+                break
+            end = buffer.find(b"\xff\xd9", start + 2)
+            if end == -1:
+                buffer = buffer[start:]
+                break
+            yield buffer[start : end + 2]
+            buffer = buffer[end + 2 :]
+        if len(buffer) > max_bytes:
+            raise RuntimeError("Failed to extract MJPEG frame")
 
 
-def capture_rtsp_jpeg(rtsp_url):
-    try:
-        import cv2  # type: ignore
-    except Exception:
-        raise RuntimeError("opencv-python is not installed")
+def _redact_url(url):
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.username is None and parsed.password is None:
+        return url
+    host = parsed.hostname or ""
+    if parsed.port:
+        host = f"{host}:{parsed.port}"
+    return urllib.parse.urlunsplit(parsed._replace(netloc=host))
 
-    cap = cv2.VideoCapture(rtsp_url)
-    try:
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        ok, frame = cap.read()
-        if not ok or frame is None:
-            return None
-        ok, jpeg = cv2.imencode(".jpg", frame)
-        if not ok:
-            raise RuntimeError("Failed to encode JPEG")
-        return jpeg.tobytes()
-    finally:
-        cap.release()
 
+def _capture_health_locked(key):
+    health = CAPTURE_HEALTH.get(key)
+    if health is None:
+        health = {
+            "active": 0,
+            "stuck_workers": [],
+            "stuck_since": 0,
+            "successes": 0,
+            "failures": 0,
+            "timeouts": 0,
+            "abandoned": 0,
+            "recoveries": 0,
+            "last_ok": 0,
+            "last_error": "",
+            "last_recovery_seconds": 0.0,
+        }
+        CAPTURE_HEALTH[key] = health
+    return health
 
-def ollama_analyze_payload(payload):
-    host = str(payload.get("host", "")).strip()
-    port = payload.get("port")
-    model = str(payload.get("model", "")).strip()
-    prompt = str(payload.get("prompt", "")).strip()
-    trigger = str(payload.get("trigger", "")).strip()
-    preview_mode = str(payload.get("previewMode", "")).strip()
-    timeout_seconds = payload.get("timeoutSeconds")
-    stream_url = str(payload.get("streamUrl", "")).strip()
-    preview_url = str(payload.get("previewUrl", "")).strip()
-    camera_id = str(payload.get("cameraId", "")).strip()
-    camera_name = str(payload.get("cameraName", "")).strip()
-    camera_model = str(payload.get("cameraModel", "")).strip()
 
-    if not host or not model or not prompt:
-        return {"ok": False, "error": "Missing host, model, or prompt"}, 400
-    try:
-        port_num = int(port)
-    except Exception:
-        return {"ok": False, "error": "Invalid port"}, 400
+def _capture_worker_done(key, worker, error):
+    now = time.time()
+    with CAPTURE_LOCK:
+        health = _capture_health_locked(key)
+        if worker in health["stuck_workers"]:
+            health["stuck_workers"].remove(worker)
+            return
+        health["active"] = max(0, health["active"] - 1)
+        if error:
+            health["failures"] += 1
+            health["last_error"] = error
+            return
+        health["successes"] += 1
+        health["last_ok"] = now
+        health["last_error"] = ""
+        if health["stuck_since"]:
+            recovery = now - health["stuck_since"]
+            health["recoveries"] += 1
+            health["last_recovery_seconds"] = recovery
+            health["stuck_since"] = 0
+            metric_observe("falldetector_capture_recovery_seconds", recovery)
+
+
+def run_capture_with_deadline(url, func, deadline=None):
+    key = _redact_url(url)
+    deadline = deadline or CAPTURE_DEADLINE_SECONDS
+    now = time.time()
+    with CAPTURE_LOCK:
+        health = _capture_health_locked(key)
+        for stuck in health["stuck_workers"]:
+            if (
+                not stuck["abandoned"]
+                and now - stuck["started_at"] >= CAPTURE_ABANDON_SECONDS
+            ):
+                stuck["abandoned"] = True
+                health["abandoned"] += 1
+        stuck_total = sum(
+            len(item["stuck_workers"]) for item in CAPTURE_HEALTH.values()
+        )
+        if health["stuck_workers"]:
+            health["failures"] += 1
+            raise RuntimeError(f"Capture worker still blocked for {key}")
+        if stuck_total >= CAPTURE_MAX_ABANDONED:
+            health["failures"] += 1
+            raise RuntimeError("Too many blocked capture workers")
+        health["active"] += 1
+
+    worker = {
+        "started_at": now,
+        "done": threading.Event(),
+        "result": None,
+        "abandoned": False,
+    }
+    parent_span = getattr(TRACE_LOCAL, "span", None)
+
+    def run():
+        TRACE_LOCAL.span = parent_span
+        error = ""
+        try:
+            worker["result"] = func(url)
+        except Exception as exc:  # pylint: disable=broad-except
+            worker["error"] = exc
+            error = str(exc)
+        finally:
+            worker["done"].set()
+            _capture_worker_done(key, worker, error)
+
+    threading.Thread(target=run, daemon=True).start()
+    if not worker["done"].wait(deadline):
+        with CAPTURE_LOCK:
+            health = _capture_health_locked(key)
+            if not worker["done"].is_set():
+                health["active"] = max(0, health["active"] - 1)
+                health["stuck_workers"].append(worker)
+                health["timeouts"] += 1
+                health["last_error"] = f"No frame within {deadline:.0f}s"
+                if not health["stuck_since"]:
+                    health["stuck_since"] = now
+        if not worker["done"].is_set():
+            metric_inc(
+                "falldetector_capture_stuck_total",
+                source=_get_capture_camera_ids().get(key, METRIC_ADHOC_LABEL),
+            )
+            log_event(
+                logging.WARNING,
+                "capture",
+                "Capture deadline exceeded",
+                source=key,
+                deadline=deadline,
+            )
+            raise RuntimeError(f"Capture deadline exceeded after {deadline:.0f}s")
+    if worker.get("error") is not None:
+        raise worker["error"]
+    return worker["result"]
+
+
+CAPTURE_HEALTH_COUNTERS = (
+    "stuck_workers",
+    "successes",
+    "failures",
+    "timeouts",
+    "abandoned",
+    "recoveries",
+)
+
+
+def _get_capture_camera_ids():
+    with STATE_LOCK:
+        config = copy.deepcopy(SERVER_STATE.get("config") or {})
+    cameras = config.get("cameras")
+    if not isinstance(cameras, list):
+        cameras = [config.get("camera")]
+    camera_ids = {}
+    for camera in cameras:
+        if not isinstance(camera, dict) or not camera.get("id"):
+            continue
+        streams = resolve_camera_streams(camera)
+        urls = list(streams.values())
+        urls.append(_derive_substream_url(streams["main"]))
+        urls.append(str(camera.get("previewUrl", "") or "").strip())
+        for url in urls:
+            if url:
+                camera_ids.setdefault(_redact_url(url), camera["id"])
+    return camera_ids
+
+
+def get_capture_health_snapshot():
+    camera_ids = _get_capture_camera_ids()
+    now = time.time()
+    with CAPTURE_LOCK:
+        sources = {
+            key: {
+                "stuck_workers": len(health["stuck_workers"]),
+                "stuck_for": (
+                    now - health["stuck_since"] if health["stuck_since"] else 0
+                ),
+                "successes": health["successes"],
+                "failures": health["failures"],
+                "timeouts": health["timeouts"],
+                "abandoned": health["abandoned"],
+                "recoveries": health["recoveries"],
+                "last_ok": health["last_ok"],
+                "last_error": health["last_error"],
+                "last_recovery_seconds": health["last_recovery_seconds"],
+            }
+            for key, health in CAPTURE_HEALTH.items()
+        }
+    cameras = {}
+    for key, source in sources.items():
+        camera_id = camera_ids.get(key, key)
+        camera = cameras.get(camera_id)
+        if camera is None:
+            camera = {name: 0 for name in CAPTURE_HEALTH_COUNTERS}
+            camera.update(
+                {
+                    "stuck_for": 0,
+                    "last_ok": 0,
+                    "last_error": "",
+                    "last_recovery_seconds": 0.0,
+                    "sources": {},
+                }
+            )
+            cameras[camera_id] = camera
+        for name in CAPTURE_HEALTH_COUNTERS:
+            camera[name] += source[name]
+        camera["stuck_for"] = max(camera["stuck_for"], source["stuck_for"])
+        if source["last_error"]:
+            camera["last_error"] = source["last_error"]
+        if source["last_recovery_seconds"]:
+            camera["last_recovery_seconds"] = source["last_recovery_seconds"]
+        camera["last_ok"] = max(camera["last_ok"], source["last_ok"])
+        camera["sources"][key] = source
+    return cameras
+
+
+def _resize_frame(cv2, frame, max_width):
+    height, width = frame.shape[:2]
+    if not max_width or width <= max_width:
+        return frame
+    scale = max_width / float(width)
+    return cv2.resize(
+        frame, (max_width, max(1, int(height * scale))), interpolation=cv2.INTER_AREA
+    )
+
+
+def _encode_frame_local(frame, max_width, quality):
+    import cv2  # type: ignore
+
+    frame = _resize_frame(cv2, frame, max_width)
+    ok, jpeg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    if not ok:
+        raise RuntimeError("Failed to encode JPEG")
+    return jpeg.tobytes()
+
+
+def _pool_encode(shm_name, shape, dtype, max_width, quality):
+    import numpy  # type: ignore
+    from multiprocessing import shared_memory
+
+    shm = WORKER_SHARED_MEMORY.get(shm_name)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        WORKER_SHARED_MEMORY[shm_name] = shm
+    frame = numpy.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return _encode_frame_local(frame, max_width, quality)
+
+
+def _get_image_pool():
+    if IMAGE_WORKERS <= 0:
+        return None
+    with IMAGE_POOL_LOCK:
+        if IMAGE_POOL["executor"] is None:
+            from multiprocessing import shared_memory
+
+            context = multiprocessing.get_context("spawn")
+            IMAGE_POOL["executor"] = ProcessPoolExecutor(
+                max_workers=IMAGE_WORKERS, mp_context=context
+            )
+            IMAGE_POOL["free"] = queue.Queue()
+            for index in range(IMAGE_WORKERS * 2):
+                slot = shared_memory.SharedMemory(create=True, size=IMAGE_SLOT_BYTES)
+                IMAGE_POOL["slots"].append(slot)
+                IMAGE_POOL["free"].put(index)
+            log_event(
+                logging.INFO,
+                "image_pool",
+                "Image pool started",
+                workers=IMAGE_WORKERS,
+                slots=len(IMAGE_POOL["slots"]),
+                slot_bytes=IMAGE_SLOT_BYTES,
+            )
+        return IMAGE_POOL
+
+
+def shutdown_image_pool():
+    with IMAGE_POOL_LOCK:
+        executor = IMAGE_POOL["executor"]
+        IMAGE_POOL["executor"] = None
+        slots = IMAGE_POOL["slots"]
+        IMAGE_POOL["slots"] = []
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+    for slot in slots:
+        try:
+            slot.close()
+            slot.unlink()
+        except Exception:  # pylint: disable=broad-except
+            pass
+
 
-    image_bytes = None
+atexit.register(shutdown_image_pool)
+
+
+def encode_frame_jpeg(frame, max_width=None, quality=IMAGE_JPEG_QUALITY):
+    if max_width is None:
+        max_width = IMAGE_MAX_WIDTH
+    pool = _get_image_pool()
+    if pool is None or frame.nbytes > IMAGE_SLOT_BYTES:
+        return _encode_frame_local(frame, max_width, quality)
     try:
-        if preview_mode == "rtsp" and stream_url.startswith("rtsp://"):
-            image_bytes = capture_rtsp_jpeg(stream_url)
-        elif preview_url:
-            image_bytes = fetch_preview_image(preview_url)
-    except Exception as exc:  # pylint: disable=broad-except
-        return {"ok": False, "error": str(exc)}, 502
+        index = pool["free"].get(timeout=1)
+    except Exception:  # pylint: disable=broad-except
+        return _encode_frame_local(frame, max_width, quality)
+    try:
+        import numpy  # type: ignore
 
-    if not image_bytes:
-        return {"ok": False, "error": "No preview image available"}, 400
+        slot = pool["slots"][index]
+        view = numpy.ndarray(frame.shape, dtype=frame.dtype, buffer=slot.buf)
+        view[...] = frame
+        future = pool["executor"].submit(
+            _pool_encode, slot.name, frame.shape, frame.dtype.str, max_width, quality
+        )
+    except BaseException:
+        pool["free"].put(index)
+        raise
+    future.add_done_callback(lambda _future: pool["free"].put(index))
+    return future.result(timeout=CAPTURE_DEADLINE_SECONDS)
+
+
+def _opencv_avformat_major(cv2):
+    match = re.search(r"avformat:\s+YES \((\d+)\.", cv2.getBuildInformation())
+    return int(match.group(1)) if match else 0
+
+
+def _configure_opencv_capture(cv2):
+    with CAPTURE_LOCK:
+        if CAPTURE_OPTIONS_STATE["configured"]:
+            return
+        CAPTURE_OPTIONS_STATE["configured"] = True
+        if "OPENCV_FFMPEG_CAPTURE_OPTIONS" in os.environ:
+            return
+        options = [f"rtsp_transport;{RTSP_TRANSPORT}"]
+        major = _opencv_avformat_major(cv2)
+        if major >= AVFORMAT_RTSP_TIMEOUT_MAJOR:
+            options.append(f"timeout;{CAPTURE_READ_TIMEOUT_MS * 1000}")
+        elif major:
+            options.append(f"stimeout;{CAPTURE_READ_TIMEOUT_MS * 1000}")
+        os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = "|".join(options)
+
+
+def _open_video_capture(cv2, url):
+    _configure_opencv_capture(cv2)
+    if hasattr(cv2, "CAP_PROP_OPEN_TIMEOUT_MSEC"):
+        return cv2.VideoCapture(
+            url,
+            cv2.CAP_FFMPEG,
+            [
+                cv2.CAP_PROP_OPEN_TIMEOUT_MSEC,
+                CAPTURE_OPEN_TIMEOUT_MS,
+                cv2.CAP_PROP_READ_TIMEOUT_MSEC,
+                CAPTURE_READ_TIMEOUT_MS,
+            ],
+        )
+    return cv2.VideoCapture(url)
+
+
+class FrameRing:
+    __slots__ = (
+        "arena",
+        "offsets",
+        "lengths",
+        "times",
+        "first",
+        "count",
+        "write_pos",
+        "dropped",
+        "last_at",
+    )
+
+    def __init__(self, arena_bytes, slots):
+        self.arena = bytearray(arena_bytes)
+        self.offsets = array.array("L", bytes(array.array("L").itemsize * slots))
+        self.lengths = array.array("L", bytes(array.array("L").itemsize * slots))
+        self.times = array.array("d", bytes(8 * slots))
+        self.first = 0
+        self.count = 0
+        self.write_pos = 0
+        self.dropped = 0
+        self.last_at = 0.0
+
+    def _drop_oldest(self):
+        self.first = (self.first + 1) % len(self.times)
+        self.count -= 1
+
+    def push(self, data, captured_at):
+        size = len(data)
+        if size > len(self.arena):
+            self.dropped += 1
+            return False
+        start = self.write_pos
+        if start + size > len(self.arena):
+            start = 0
+            while self.count and self.offsets[self.first] >= self.write_pos:
+                self._drop_oldest()
+        end = start + size
+        while self.count:
+            offset = self.offsets[self.first]
+            if offset >= end or offset + self.lengths[self.first] <= start:
+                break
+            self._drop_oldest()
+        if self.count == len(self.times):
+            self._drop_oldest()
+        index = (self.first + self.count) % len(self.times)
+        self.arena[start:end] = data
+        self.offsets[index] = start
+        self.lengths[index] = size
+        self.times[index] = captured_at
+        self.count += 1
+        self.write_pos = end
+        self.last_at = captured_at
+        return True
+
+    def frames(self, since, until):
+        result = []
+        for step in range(self.count):
+            index = (self.first + step) % len(self.times)
+            captured_at = self.times[index]
+            if since <= captured_at <= until:
+                start = self.offsets[index]
+                end = start + self.lengths[index]
+                result.append((captured_at, bytes(self.arena[start:end])))
+        return result
+
+    def used_bytes(self):
+        return sum(
+            self.lengths[(self.first + step) % len(self.times)]
+            for step in range(self.count)
+        )
+
+
+def _frame_ring_slots():
+    return int((EVIDENCE_PRE_SECONDS + EVIDENCE_POST_SECONDS) * EVIDENCE_FPS) + 4
+
+
+def record_frame(url, data, captured_at=None):
+    if not url or not data or EVIDENCE_TOTAL_BYTES < EVIDENCE_RING_BYTES:
+        return
+    if captured_at is None:
+        captured_at = time.time()
+    with FRAME_RINGS_LOCK:
+        ring = FRAME_RINGS.get(url)
+        if ring is None:
+            while (len(FRAME_RINGS) + 1) * EVIDENCE_RING_BYTES > EVIDENCE_TOTAL_BYTES:
+                FRAME_RINGS.popitem(last=False)
+            ring = FrameRing(EVIDENCE_RING_BYTES, _frame_ring_slots())
+            FRAME_RINGS[url] = ring
+        elif captured_at - ring.last_at < 1.0 / EVIDENCE_FPS:
+            return
+        FRAME_RINGS.move_to_end(url)
+        ring.push(data, captured_at)
+
+
+def get_recorded_frames(urls, since, until):
+    frames = []
+    with FRAME_RINGS_LOCK:
+        for url in set(urls):
+            ring = FRAME_RINGS.get(url)
+            if ring is not None:
+                frames.extend(ring.frames(since, until))
+    frames.sort(key=lambda item: item[0])
+    return frames
+
+
+def get_frame_rings_snapshot():
+    with FRAME_RINGS_LOCK:
+        return {
+            _redact_url(url): {
+                "frames": ring.count,
+                "used_bytes": ring.used_bytes(),
+                "arena_bytes": len(ring.arena),
+                "dropped": ring.dropped,
+                "last_frame_at": ring.last_at,
+            }
+            for url, ring in FRAME_RINGS.items()
+        }
+
+
+def _select_evidence_frames(frames):
+    if len(frames) <= EVIDENCE_MAX_FRAMES:
+        return frames
+    step = (len(frames) - 1) / (EVIDENCE_MAX_FRAMES - 1)
+    return [frames[round(index * step)] for index in range(EVIDENCE_MAX_FRAMES)]
+
+
+def store_evidence(response_id, camera_id, triggered_at, frames):
+    offsets = array.array("L")
+    times = array.array("d")
+    blob = bytearray()
+    for captured_at, data in frames:
+        offsets.append(len(blob))
+        times.append(captured_at)
+        blob.extend(data)
+    offsets.append(len(blob))
+    clip = {
+        "camera_id": camera_id,
+        "triggered_at": triggered_at,
+        "created_at": time.time(),
+        "data": bytes(blob),
+        "offsets": offsets,
+        "times": times,
+        "strip": None,
+    }
+    cutoff = time.time() - RETENTION_SECONDS
+    with EVIDENCE_LOCK:
+        EVIDENCE_CLIPS[response_id] = clip
+        while EVIDENCE_CLIPS and (
+            len(EVIDENCE_CLIPS) > EVIDENCE_MAX_CLIPS
+            or next(iter(EVIDENCE_CLIPS.values()))["created_at"] < cutoff
+        ):
+            EVIDENCE_CLIPS.popitem(last=False)
+    enforce_memory_budget()
+    return {
+        "frames": len(times),
+        "pre": sum(1 for captured_at in times if captured_at <= triggered_at),
+        "post": sum(1 for captured_at in times if captured_at > triggered_at),
+        "bytes": len(clip["data"]),
+    }
+
+
+def get_evidence_clip(response_id):
+    with EVIDENCE_LOCK:
+        return EVIDENCE_CLIPS.get(response_id)
+
+
+def iter_evidence_frames(clip):
+    offsets = clip["offsets"]
+    for index, captured_at in enumerate(clip["times"]):
+        yield captured_at, clip["data"][offsets[index] : offsets[index + 1]]
+
+
+def build_evidence_strip(clip, columns=4):
+    if clip["strip"] is not None:
+        return clip["strip"]
+    try:
+        import cv2  # type: ignore
+        import numpy  # type: ignore
+    except Exception:
+        raise RuntimeError("opencv-python is not installed")
+
+    tiles = []
+    for captured_at, data in iter_evidence_frames(clip):
+        image = cv2.imdecode(numpy.frombuffer(data, dtype=numpy.uint8), 1)
+        if image is None:
+            continue
+        height = max(1, round(image.shape[0] * EVIDENCE_THUMB_WIDTH / image.shape[1]))
+        tile = cv2.resize(image, (EVIDENCE_THUMB_WIDTH, height))
+        offset = captured_at - clip["triggered_at"]
+        color = (0, 0, 255) if abs(offset) < 0.5 else (255, 255, 255)
+        cv2.putText(
+            tile, f"{offset:+.1f}s", (8, 24), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2
+        )
+        tiles.append(tile)
+    if not tiles:
+        raise RuntimeError("No decodable evidence frames")
+    tile_height = max(tile.shape[0] for tile in tiles)
+    columns = min(columns, len(tiles))
+    rows = (len(tiles) + columns - 1) // columns
+    sheet = numpy.zeros(
+        (rows * tile_height, columns * EVIDENCE_THUMB_WIDTH, 3), dtype=numpy.uint8
+    )
+    for index, tile in enumerate(tiles):
+        top = (index // columns) * tile_height
+        left = (index % columns) * EVIDENCE_THUMB_WIDTH
+        sheet[top : top + tile.shape[0], left : left + EVIDENCE_THUMB_WIDTH] = tile
+    ok, encoded = cv2.imencode(".jpg", sheet, [int(cv2.IMWRITE_JPEG_QUALITY), 85])
+    if not ok:
+        raise RuntimeError("Failed to encode evidence strip")
+    clip["strip"] = encoded.tobytes()
+    return clip["strip"]
+
+
+def _collect_evidence(response_id, camera_id, urls, capture, triggered_at):
+    deadline = triggered_at + EVIDENCE_POST_SECONDS
+    try:
+        while time.time() < deadline:
+            if not any(get_stream_frame(url, 1.0 / EVIDENCE_FPS) for url in urls):
+                capture(urls[0])
+            time.sleep(max(0.0, min(1.0 / EVIDENCE_FPS, deadline - time.time())))
+    except Exception as exc:  # pylint: disable=broad-except
+        log_event(
+            logging.WARNING,
+            "evidence",
+            "Evidence post-capture stopped",
+            camera=camera_id,
+            error=str(exc),
+        )
+    frames = get_recorded_frames(
+        urls, triggered_at - EVIDENCE_PRE_SECONDS, deadline + 1.0 / EVIDENCE_FPS
+    )
+    if not frames:
+        return
+    summary = store_evidence(
+        response_id, camera_id, triggered_at, _select_evidence_frames(frames)
+    )
+    update_response(response_id, evidence=summary)
+    log_event(
+        logging.INFO,
+        "evidence",
+        "Evidence clip stored",
+        response=response_id,
+        camera=camera_id,
+        **summary,
+    )
+
+
+def start_evidence_capture(response_id, camera_id, urls, capture, triggered_at):
+    if EVIDENCE_TOTAL_BYTES < EVIDENCE_RING_BYTES:
+        return
+    threading.Thread(
+        target=_collect_evidence,
+        args=(response_id, camera_id, urls, capture, triggered_at),
+        daemon=True,
+    ).start()
+
+
+def fetch_preview_image(url, record=True):
+    data = run_capture_with_deadline(url, _fetch_preview_image)
+    if record:
+        record_frame(url, data)
+    return data
+
+
+def _fetch_preview_image(url):
+    with trace_span("fetch_preview_image") as span:
+        req = urllib.request.Request(url, method="GET")
+        with urllib.request.urlopen(req, timeout=5) as response:
+            content_type = (response.headers.get("Content-Type", "") or "").lower()
+            span.set("content_type", content_type)
+            if content_type.startswith("image/"):
+                return response.read()
+            if "multipart" in content_type or "mjpeg" in content_type:
+                return extract_mjpeg_frame(response)
+            raise RuntimeError(
+                f"Unsupported content type: {content_type or 'unknown'}"
+            )
+
+
+def capture_rtsp_jpeg(rtsp_url, record=True):
+    data = run_capture_with_deadline(rtsp_url, _capture_rtsp_jpeg)
+    if record:
+        record_frame(rtsp_url, data)
+    return data
+
+
+def _capture_rtsp_jpeg(rtsp_url):
+    try:
+        import cv2  # type: ignore
+    except Exception:
+        raise RuntimeError("opencv-python is not installed")
+
+    with trace_span("capture_rtsp_jpeg"):
+        with trace_span("rtsp.connect"):
+            cap = _open_video_capture(cv2, rtsp_url)
+        try:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            with trace_span("rtsp.decode"):
+                ok, frame = cap.read()
+            if not ok or frame is None:
+                return None
+            encode_started = time.time()
+            with trace_span("jpeg.encode"):
+                data = encode_frame_jpeg(frame)
+            metric_observe(
+                "falldetector_encode_seconds",
+                time.time() - encode_started,
+                stage="jpeg",
+            )
+            return data
+        finally:
+            cap.release()
+
+
+def _probe_stream_size(url):
+    result = subprocess.run(
+        [
+            FFPROBE_BIN,
+            "-v",
+            "error",
+            "-rtsp_transport",
+            RTSP_TRANSPORT,
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "stream=width,height",
+            "-of",
+            "csv=p=0",
+            url,
+        ],
+        capture_output=True,
+        text=True,
+        timeout=CAPTURE_DEADLINE_SECONDS,
+        check=False,
+    )
+    try:
+        width, height = (int(value) for value in result.stdout.split(",")[:2])
+    except ValueError:
+        raise RuntimeError(
+            f"ffprobe could not read the stream size ({result.returncode})"
+        )
+    return width, height
+
+
+def _build_ffmpeg_command(url, width, height):
+    select = f"isnan(prev_selected_t)+gte(t-prev_selected_t\\,{1.0 / FFMPEG_FPS:.3f})"
+    command = [FFMPEG_BIN, "-nostdin", "-loglevel", "error"]
+    command += ["-rtsp_transport", RTSP_TRANSPORT]
+    command += ["-timeout", str(CAPTURE_READ_TIMEOUT_MS * 1000)]
+    if FFMPEG_KEYFRAMES_ONLY:
+        command += ["-skip_frame", "nokey"]
+    command += ["-i", url, "-an", "-sn", "-dn"]
+    command += ["-vf", f"select='{select}',scale={width}:{height}", "-vsync", "vfr"]
+    command += ["-pix_fmt", "bgr24", "-f", "rawvideo", "pipe:1"]
+    return command
+
+
+def _ffmpeg_reader_loop(reader):
+    process = reader["process"]
+    frame_bytes = reader["width"] * reader["height"] * 3
+    exited = False
+    try:
+        while not reader["stop"].is_set():
+            if time.time() - reader["last_used"] >= FFMPEG_IDLE_SECONDS:
+                break
+            with reader["cond"]:
+                back = 1 - reader["front"]
+            view = memoryview(reader["buffers"][back])
+            filled = 0
+            while filled < frame_bytes:
+                count = process.stdout.readinto(view[filled:])
+                if not count:
+                    break
+                filled += count
+            view.release()
+            if filled < frame_bytes:
+                exited = not reader["stop"].is_set()
+                break
+            with reader["cond"]:
+                reader["front"] = back
+                reader["sequence"] += 1
+                reader["captured_at"] = time.time()
+                reader["cond"].notify_all()
+            now = reader["captured_at"]
+            if (
+                now - reader["feed_at"] <= EVIDENCE_FEED_HOLD_SECONDS
+                and now - reader["recorded_at"] >= 1.0 / EVIDENCE_FPS
+            ):
+                reader["recorded_at"] = now
+                _record_ffmpeg_frame(reader, back)
+    finally:
+        process.kill()
+        returncode = process.wait()
+        error = f"ffmpeg exited ({returncode})" if exited else ""
+        with FFMPEG_LOCK:
+            if FFMPEG_READERS.get(reader["url"]) is reader:
+                del FFMPEG_READERS[reader["url"]]
+        with reader["cond"]:
+            reader["error"] = error or "ffmpeg reader stopped"
+            reader["cond"].notify_all()
+        log_event(
+            logging.WARNING if error else logging.INFO,
+            "capture",
+            "ffmpeg reader stopped",
+            source=_redact_url(reader["url"]),
+            frames=reader["sequence"],
+            error=error,
+        )
+
+
+def _get_ffmpeg_reader(url):
+    with FFMPEG_LOCK:
+        reader = FFMPEG_READERS.get(url)
+        if reader is not None:
+            reader["last_used"] = time.time()
+            return reader
+    width, height = _probe_stream_size(url)
+    if FFMPEG_WIDTH and width > FFMPEG_WIDTH:
+        height = max(2, round(height * FFMPEG_WIDTH / width / 2) * 2)
+        width = FFMPEG_WIDTH
+    with FFMPEG_LOCK:
+        reader = FFMPEG_READERS.get(url)
+        if reader is not None:
+            return reader
+        process = subprocess.Popen(
+            _build_ffmpeg_command(url, width, height),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+        reader = {
+            "url": url,
+            "process": process,
+            "width": width,
+            "height": height,
+            "buffers": [bytearray(width * height * 3), bytearray(width * height * 3)],
+            "front": 0,
+            "sequence": 0,
+            "captured_at": 0.0,
+            "started_at": time.time(),
+            "last_used": time.time(),
+            "feed_at": 0.0,
+            "recorded_at": 0.0,
+            "error": "",
+            "stop": threading.Event(),
+            "cond": threading.Condition(),
+        }
+        FFMPEG_READERS[url] = reader
+    threading.Thread(target=_ffmpeg_reader_loop, args=(reader,), daemon=True).start()
+    log_event(
+        logging.INFO,
+        "capture",
+        "ffmpeg reader started",
+        source=_redact_url(url),
+        width=width,
+        height=height,
+        fps=FFMPEG_FPS,
+        keyframes_only=FFMPEG_KEYFRAMES_ONLY,
+    )
+    return reader
+
+
+def capture_rtsp_ffmpeg(rtsp_url, record=True):
+    data = run_capture_with_deadline(rtsp_url, _capture_rtsp_ffmpeg)
+    if record:
+        record_frame(rtsp_url, data)
+    return data
+
+
+def _capture_rtsp_ffmpeg(rtsp_url):
+    try:
+        import numpy  # type: ignore
+    except Exception:
+        raise RuntimeError("numpy is not installed")
+
+    with trace_span("capture_rtsp_ffmpeg"):
+        with trace_span("ffmpeg.connect"):
+            reader = _get_ffmpeg_reader(rtsp_url)
+        oldest = time.time() - FFMPEG_MAX_FRAME_AGE
+        with trace_span("ffmpeg.wait"):
+            with reader["cond"]:
+                reader["cond"].wait_for(
+                    lambda: reader["captured_at"] >= oldest or reader["error"],
+                    timeout=CAPTURE_DEADLINE_SECONDS,
+                )
+                if reader["captured_at"] < oldest:
+                    raise RuntimeError(reader["error"] or "No frame from ffmpeg")
+                frame = numpy.frombuffer(
+                    bytes(reader["buffers"][reader["front"]]), dtype=numpy.uint8
+                ).reshape(reader["height"], reader["width"], 3)
+        encode_started = time.time()
+        with trace_span("jpeg.encode"):
+            data = encode_frame_jpeg(frame)
+        metric_observe(
+            "falldetector_encode_seconds", time.time() - encode_started, stage="jpeg"
+        )
+        return data
+
+
+def _get_capture_source(streams, camera):
+    stream_url = streams["inference"]
+    if camera.get("previewMode") == "rtsp" and stream_url.startswith("rtsp://"):
+        return get_rtsp_capture(camera.get("captureBackend")), stream_url
+    return fetch_preview_image, str(camera.get("previewUrl", "") or "").strip()
+
+
+def get_rtsp_capture(backend):
+    if str(backend or "").strip().lower() == "ffmpeg":
+        return capture_rtsp_ffmpeg
+    return capture_rtsp_jpeg
+
+
+def get_ffmpeg_readers_snapshot():
+    now = time.time()
+    with FFMPEG_LOCK:
+        readers = list(FFMPEG_READERS.values())
+    return {
+        _redact_url(reader["url"]): {
+            "pid": reader["process"].pid,
+            "width": reader["width"],
+            "height": reader["height"],
+            "frames": reader["sequence"],
+            "frame_age": now - reader["captured_at"] if reader["captured_at"] else None,
+            "uptime": now - reader["started_at"],
+            "idle": now - reader["last_used"],
+        }
+        for reader in readers
+    }
+
+
+def stop_ffmpeg_readers():
+    with FFMPEG_LOCK:
+        readers = list(FFMPEG_READERS.values())
+    for reader in readers:
+        reader["stop"].set()
+        reader["process"].kill()
+
+
+atexit.register(stop_ffmpeg_readers)
+
+
+def _record_ffmpeg_frame(reader, index):
+    try:
+        import numpy  # type: ignore
+
+        frame = numpy.frombuffer(reader["buffers"][index], dtype=numpy.uint8)
+        data = encode_frame_jpeg(
+            frame.reshape(reader["height"], reader["width"], 3),
+            EVIDENCE_THUMB_WIDTH * 2,
+        )
+    except Exception as exc:  # pylint: disable=broad-except
+        log_event(
+            logging.WARNING,
+            "evidence",
+            "Failed to buffer ffmpeg frame",
+            rate_key="evidence-feed-ffmpeg",
+            source=_redact_url(reader["url"]),
+            error=str(exc),
+        )
+        return
+    record_frame(reader["url"], data)
+
+
+def _evidence_feed_targets():
+    with STATE_LOCK:
+        armed = SERVER_STATE["armed"]
+        config = copy.deepcopy(SERVER_STATE.get("config") or {})
+    if not armed or EVIDENCE_TOTAL_BYTES < EVIDENCE_RING_BYTES:
+        return []
+    return cluster_filter_cameras(_get_monitor_cameras(config))
+
+
+def _evidence_feed_loop():
+    held = {}
+    while not EVIDENCE_FEED_STOP.wait(1.0):
+        wanted = set()
+        for camera in _evidence_feed_targets():
+            url = resolve_camera_streams(camera)["inference"]
+            if (
+                camera.get("previewMode") == "rtsp"
+                and url.startswith("rtsp://")
+                and str(camera.get("captureBackend") or "").lower() == "ffmpeg"
+            ):
+                try:
+                    _get_ffmpeg_reader(url)["feed_at"] = time.time()
+                except Exception as exc:  # pylint: disable=broad-except
+                    log_event(
+                        logging.WARNING,
+                        "evidence",
+                        "Evidence feed could not start ffmpeg",
+                        rate_key=f"evidence-feed:{camera.get('id', '')}",
+                        camera=camera.get("id", ""),
+                        error=str(exc),
+                    )
+                continue
+            camera_id = camera.get("id")
+            if not camera_id:
+                continue
+            wanted.add(camera_id)
+            stream = held.get(camera_id)
+            if stream is not None and stream["stop"].is_set():
+                release_stream(held.pop(camera_id))
+                stream = None
+            if stream is None:
+                stream = acquire_stream(camera_id)
+                if stream is not None:
+                    held[camera_id] = stream
+        for camera_id in [camera_id for camera_id in held if camera_id not in wanted]:
+            release_stream(held.pop(camera_id))
+    for stream in held.values():
+        release_stream(stream)
+
+
+def start_evidence_feed():
+    global EVIDENCE_FEED_THREAD
+    if EVIDENCE_FEED_THREAD and EVIDENCE_FEED_THREAD.is_alive():
+        return
+    EVIDENCE_FEED_STOP.clear()
+    EVIDENCE_FEED_THREAD = threading.Thread(target=_evidence_feed_loop, daemon=True)
+    EVIDENCE_FEED_THREAD.start()
+
+
+def stop_evidence_feed():
+    EVIDENCE_FEED_STOP.set()
+    if EVIDENCE_FEED_THREAD:
+        EVIDENCE_FEED_THREAD.join(timeout=2)
+
+
+def _derive_substream_url(url):
+    if not url.startswith("rtsp://"):
+        return url
+    return TAPO_MAIN_STREAM.sub(r"/stream2\1", url, count=1)
+
+
+def get_substream_url(url):
+    substream = _derive_substream_url(url)
+    if substream == url:
+        return url
+    with SUBSTREAM_LOCK:
+        status = SUBSTREAM_STATUS.get(url)
+        if (
+            status is not None
+            and not status["ok"]
+            and time.time() - status["checked_at"] < SUBSTREAM_RETRY_SECONDS
+        ):
+            return url
+    return substream
+
+
+def capture_with_substream_fallback(capture, url, main_url):
+    if not main_url or url == main_url or _derive_substream_url(main_url) != url:
+        return capture(url)
+    try:
+        data = capture(url)
+        error = "" if data else "No frame from substream"
+    except Exception as exc:  # pylint: disable=broad-except
+        data = None
+        error = str(exc)
+    with SUBSTREAM_LOCK:
+        previous = SUBSTREAM_STATUS.get(main_url)
+        SUBSTREAM_STATUS[main_url] = {
+            "ok": not error,
+            "checked_at": time.time(),
+            "error": error,
+        }
+    if not error:
+        return data
+    if previous is None or previous["ok"]:
+        log_event(
+            logging.WARNING,
+            "capture",
+            "Substream capture failed, falling back to main stream",
+            source=_redact_url(url),
+            error=error,
+        )
+    return capture(main_url)
+
+
+def get_substream_snapshot():
+    now = time.time()
+    with SUBSTREAM_LOCK:
+        return {
+            _redact_url(main_url): {
+                "substream": _redact_url(_derive_substream_url(main_url)),
+                "using": (
+                    "substream"
+                    if status["ok"]
+                    or now - status["checked_at"] >= SUBSTREAM_RETRY_SECONDS
+                    else "main"
+                ),
+                "checked_at": status["checked_at"],
+                "error": status["error"],
+            }
+            for main_url, status in SUBSTREAM_STATUS.items()
+        }
+
+
+def resolve_camera_streams(camera):
+    main_url = str(camera.get("streamUrl", "") or "").strip()
+    auto = camera.get("autoSubstream", True) is not False
+    fallback = get_substream_url(main_url) if auto else main_url
+    return {
+        "main": main_url,
+        "inference": str(camera.get("inferenceStreamUrl", "") or "").strip()
+        or fallback,
+        "preview": str(camera.get("previewStreamUrl", "") or "").strip() or fallback,
+        "evidence": str(camera.get("evidenceStreamUrl", "") or "").strip()
+        or main_url,
+    }
+
+
+def _get_config_camera(camera_id):
+    with STATE_LOCK:
+        config = SERVER_STATE.get("config") or {}
+        cameras = config.get("cameras")
+        if not isinstance(cameras, list):
+            cameras = [config.get("camera")]
+        for camera in cameras:
+            if isinstance(camera, dict) and camera.get("id") == camera_id:
+                return copy.deepcopy(camera)
+    return None
+
+
+def _get_stream_source(camera):
+    if camera.get("previewMode") == "rtsp" or not camera.get("previewUrl"):
+        url = resolve_camera_streams(camera)["preview"]
+        if url.startswith("rtsp://"):
+            return "rtsp", url
+    preview_url = str(camera.get("previewUrl", "") or "").strip()
+    if preview_url:
+        return "http", preview_url
+    return "", ""
+
+
+def _publish_stream_frame(stream, frame):
+    with stream["cond"]:
+        stream["frame"] = frame
+        stream["sequence"] += 1
+        stream["captured_at"] = time.time()
+        stream["error"] = ""
+        stream["error_since"] = 0
+        stream["cond"].notify_all()
+    record_frame(stream["url"], frame)
+
+
+def _stream_idle(stream):
+    with stream["cond"]:
+        if stream["viewers"] > 0:
+            return False
+        return time.time() - stream["last_viewer_at"] >= STREAM_IDLE_SECONDS
+
+
+def _stream_rtsp_frames(stream):
+    try:
+        import cv2  # type: ignore
+    except Exception:
+        raise RuntimeError("opencv-python is not installed")
+
+    cap = _open_video_capture(cv2, stream["url"])
+    try:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        next_frame_at = 0.0
+        while not stream["stop"].is_set() and not _stream_idle(stream):
+            if not cap.grab():
+                raise RuntimeError("Failed to read RTSP frame")
+            now = time.time()
+            if now < next_frame_at:
+                continue
+            ok, frame = cap.retrieve()
+            if not ok or frame is None:
+                continue
+            _publish_stream_frame(stream, encode_frame_jpeg(frame))
+            next_frame_at = now + 1.0 / STREAM_MAX_FPS
+    finally:
+        cap.release()
+
+
+def _stream_http_frames(stream):
+    req = urllib.request.Request(stream["url"], method="GET")
+    with urllib.request.urlopen(req, timeout=5) as response:
+        content_type = (response.headers.get("Content-Type", "") or "").lower()
+        if "multipart" in content_type or "mjpeg" in content_type:
+            next_frame_at = 0.0
+            for frame in iter_mjpeg_frames(response):
+                if stream["stop"].is_set() or _stream_idle(stream):
+                    return
+                now = time.time()
+                if now >= next_frame_at:
+                    _publish_stream_frame(stream, frame)
+                    next_frame_at = now + 1.0 / STREAM_MAX_FPS
+            return
+        if not content_type.startswith("image/"):
+            raise RuntimeError(f"Unsupported content type: {content_type or 'unknown'}")
+        _publish_stream_frame(stream, response.read())
+    while not stream["stop"].is_set() and not _stream_idle(stream):
+        stream["stop"].wait(1.0 / STREAM_MAX_FPS)
+        _publish_stream_frame(stream, _fetch_preview_image(stream["url"]))
+
+
+def _stream_worker(stream):
+    while not stream["stop"].is_set() and not _stream_idle(stream):
+        try:
+            if stream["kind"] == "rtsp":
+                _stream_rtsp_frames(stream)
+            else:
+                _stream_http_frames(stream)
+        except Exception as exc:  # pylint: disable=broad-except
+            with stream["cond"]:
+                stream["error"] = str(exc)
+                stream["error_since"] = stream["error_since"] or time.time()
+                stream["cond"].notify_all()
+            log_event(
+                logging.WARNING,
+                "stream",
+                "Stream source error",
+                camera=stream["camera_id"],
+                error=str(exc),
+            )
+            stream["stop"].wait(2)
+    with STREAMS_LOCK:
+        if STREAMS.get(stream["camera_id"]) is stream:
+            del STREAMS[stream["camera_id"]]
+    stream["stop"].set()
+    with stream["cond"]:
+        stream["cond"].notify_all()
+
+
+def acquire_stream(camera_id):
+    camera = _get_config_camera(camera_id)
+    if camera is None:
+        return None
+    kind, url = _get_stream_source(camera)
+    if not kind:
+        return None
+    with STREAMS_LOCK:
+        stream = STREAMS.get(camera_id)
+        if stream is not None and (stream["url"] != url or stream["stop"].is_set()):
+            stream["stop"].set()
+            stream = None
+        if stream is None:
+            stream = {
+                "camera_id": camera_id,
+                "kind": kind,
+                "url": url,
+                "frame": b"",
+                "sequence": 0,
+                "captured_at": 0,
+                "viewers": 0,
+                "last_viewer_at": time.time(),
+                "error": "",
+                "error_since": 0,
+                "cond": threading.Condition(),
+                "stop": threading.Event(),
+            }
+            STREAMS[camera_id] = stream
+            threading.Thread(target=_stream_worker, args=(stream,), daemon=True).start()
+        with stream["cond"]:
+            stream["viewers"] += 1
+            stream["last_viewer_at"] = time.time()
+    return stream
+
+
+def release_stream(stream):
+    with stream["cond"]:
+        stream["viewers"] = max(0, stream["viewers"] - 1)
+        stream["last_viewer_at"] = time.time()
+
+
+def get_stream_frame(url, max_age=2.0):
+    with STREAMS_LOCK:
+        streams = list(STREAMS.values())
+    for stream in streams:
+        if stream["url"] != url:
+            continue
+        with stream["cond"]:
+            if stream["frame"] and time.time() - stream["captured_at"] <= max_age:
+                return stream["frame"]
+    return None
+
+
+def get_streams_snapshot():
+    with STREAMS_LOCK:
+        streams = list(STREAMS.values())
+    snapshot = {}
+    for stream in streams:
+        with stream["cond"]:
+            snapshot[stream["camera_id"]] = {
+                "kind": stream["kind"],
+                "viewers": stream["viewers"],
+                "frames": stream["sequence"],
+                "captured_at": stream["captured_at"],
+                "error": stream["error"],
+            }
+    return snapshot
+
+
+def _inference_backend_locked(backend):
+    stats = INFERENCE_QUEUE["backends"].get(backend)
+    if stats is None:
+        stats = {
+            "active": 0,
+            "completed": 0,
+            "rejected": 0,
+            "expired": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0,
+            "last_wait": 0.0,
+            "service_time": 0.0,
+        }
+        INFERENCE_QUEUE["backends"][backend] = stats
+    return stats
+
+
+def _inference_retry_after_locked(backend, stats):
+    depth = sum(1 for item in INFERENCE_QUEUE["waiting"] if item["backend"] == backend)
+    service_time = stats["service_time"] or 10.0
+    slots = max(1, INFERENCE_MAX_CONCURRENCY)
+    return max(1, int(round(service_time * (depth + stats["active"]) / slots)))
+
+
+def _inference_priority(payload, camera_id):
+    requested = str(payload.get("priority", "")).strip().lower()
+    if requested == "manual":
+        return INFERENCE_PRIORITIES["manual"]
+    with INFERENCE_COND:
+        triggered_at = RECENT_TRIGGERS.get(camera_id, 0) if camera_id else 0
+    if triggered_at and time.time() - triggered_at <= RECENT_TRIGGER_WINDOW:
+        return INFERENCE_PRIORITIES["triggered"]
+    return INFERENCE_PRIORITIES["routine"]
+
+
+def _note_recent_trigger(camera_id):
+    now = time.time()
+    with INFERENCE_COND:
+        RECENT_TRIGGERS.pop(camera_id, None)
+        RECENT_TRIGGERS[camera_id] = now
+        for key, triggered_at in list(RECENT_TRIGGERS.items()):
+            if (
+                now - triggered_at <= RECENT_TRIGGER_WINDOW
+                and len(RECENT_TRIGGERS) <= RECENT_TRIGGERS_MAX
+            ):
+                break
+            del RECENT_TRIGGERS[key]
+
+
+def _inference_acquire(backend, priority, deadline, reserved=False):
+    limit = INFERENCE_MAX_QUEUE
+    if not reserved:
+        limit -= INFERENCE_MONITOR_RESERVE
+    with INFERENCE_COND:
+        stats = _inference_backend_locked(backend)
+        manual = priority == INFERENCE_PRIORITIES["manual"]
+        if manual:
+            limit = INFERENCE_MANUAL_QUEUE
+        depth = sum(
+            1
+            for item in INFERENCE_QUEUE["waiting"]
+            if item["backend"] == backend
+            and (item["priority"] == INFERENCE_PRIORITIES["manual"]) == manual
+        )
+        if depth >= limit:
+            stats["rejected"] += 1
+            retry_after = _inference_retry_after_locked(backend, stats)
+            return None, "Inference queue is full.", 429, retry_after
+        INFERENCE_QUEUE["sequence"] += 1
+        ticket = {
+            "backend": backend,
+            "priority": priority,
+            "sequence": INFERENCE_QUEUE["sequence"],
+            "enqueued_at": time.time(),
+        }
+        INFERENCE_QUEUE["waiting"].append(ticket)
+        try:
+            while True:
+                now = time.time()
+                if now >= deadline:
+                    stats["expired"] += 1
+                    retry_after = _inference_retry_after_locked(backend, stats)
+                    return (
+                        None,
+                        "Frame expired while waiting for inference.",
+                        503,
+                        retry_after,
+                    )
+                head = min(
+                    (
+                        item
+                        for item in INFERENCE_QUEUE["waiting"]
+                        if item["backend"] == backend
+                    ),
+                    key=lambda item: (item["priority"], item["sequence"]),
+                )
+                if head is ticket and stats["active"] < INFERENCE_MAX_CONCURRENCY:
+                    waited = now - ticket["enqueued_at"]
+                    stats["active"] += 1
+                    stats["total_wait"] += waited
+                    stats["last_wait"] = waited
+                    stats["max_wait"] = max(stats["max_wait"], waited)
+                    ticket["waited"] = waited
+                    return ticket, "", 200, 0
+                INFERENCE_COND.wait(timeout=min(1.0, deadline - now))
+        finally:
+            INFERENCE_QUEUE["waiting"].remove(ticket)
+            INFERENCE_COND.notify_all()
+
+
+def _inference_release(ticket, duration):
+    with INFERENCE_COND:
+        stats = _inference_backend_locked(ticket["backend"])
+        stats["active"] = max(0, stats["active"] - 1)
+        stats["completed"] += 1
+        if duration is not None:
+            if stats["service_time"]:
+                stats["service_time"] = stats["service_time"] * 0.8 + duration * 0.2
+            else:
+                stats["service_time"] = duration
+        INFERENCE_COND.notify_all()
+
+
+def get_inference_queue_snapshot():
+    with INFERENCE_COND:
+        backends = {}
+        for backend, stats in INFERENCE_QUEUE["backends"].items():
+            waiting = [
+                item
+                for item in INFERENCE_QUEUE["waiting"]
+                if item["backend"] == backend
+            ]
+            completed = stats["completed"]
+            backends[backend] = {
+                "depth": len(waiting),
+                "active": stats["active"],
+                "limit": INFERENCE_MAX_CONCURRENCY,
+                "completed": completed,
+                "rejected": stats["rejected"],
+                "expired": stats["expired"],
+                "avg_wait": stats["total_wait"] / completed if completed else 0.0,
+                "max_wait": stats["max_wait"],
+                "last_wait": stats["last_wait"],
+                "service_time": stats["service_time"],
+                "oldest_wait": max(
+                    (time.time() - item["enqueued_at"] for item in waiting),
+                    default=0.0,
+                ),
+            }
+        return {
+            "max_concurrency": INFERENCE_MAX_CONCURRENCY,
+            "max_queue": INFERENCE_MAX_QUEUE,
+            "depth": len(INFERENCE_QUEUE["waiting"]),
+            "backends": backends,
+        }
+
+
+def _get_keep_alive_seconds(config):
+    settings = _get_adaptive_settings(config)
+    interval = settings["max"] if settings["enabled"] else settings["base"]
+    return int(max(MIN_KEEP_ALIVE_SECONDS, interval * 2 + 60))
+
+
+def _get_default_keep_alive():
+    with STATE_LOCK:
+        armed = SERVER_STATE["armed"]
+        config = SERVER_STATE.get("config") or {}
+        seconds = _get_keep_alive_seconds(config) if armed else MIN_KEEP_ALIVE_SECONDS
+    return f"{seconds}s"
+
+
+def _parse_keep_alive(keep_alive):
+    value = str(keep_alive).strip().lower()
+    try:
+        if value.endswith("m"):
+            return float(value[:-1]) * 60
+        if value.endswith("h"):
+            return float(value[:-1]) * 3600
+        return float(value.rstrip("s"))
+    except ValueError:
+        return float(MIN_KEEP_ALIVE_SECONDS)
+
+
+def _parse_ollama_timestamp(value, default):
+    text = str(value or "").strip().replace("Z", "+00:00")
+    text = re.sub(r"(\.\d{6})\d+", r"\1", text)
+    try:
+        return datetime.datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        return default
+
+
+def _model_residency_locked(backend):
+    state = MODEL_RESIDENCY.get(backend)
+    if state is None:
+        state = {
+            "loaded": {},
+            "checked_at": 0,
+            "preload": {},
+            "cold": {"count": 0, "total": 0.0, "last": 0.0},
+            "warm": {"count": 0, "total": 0.0, "last": 0.0},
+        }
+        MODEL_RESIDENCY[backend] = state
+    return state
+
+
+def _record_model_use(backend, model, keep_alive, duration, cold_load):
+    with MODEL_RESIDENCY_LOCK:
+        state = _model_residency_locked(backend)
+        state["loaded"][model] = time.time() + _parse_keep_alive(keep_alive)
+        stats = state["cold" if cold_load else "warm"]
+        stats["count"] += 1
+        stats["total"] += duration
+        stats["last"] = duration
+
+
+def _record_running_models(backend, running_payload):
+    now = time.time()
+    with MODEL_RESIDENCY_LOCK:
+        state = _model_residency_locked(backend)
+        loaded = {}
+        for item in running_payload.get("models", []) or []:
+            name = item.get("name") or item.get("model")
+            if not name:
+                continue
+            loaded[name] = _parse_ollama_timestamp(
+                item.get("expires_at"), now + MIN_KEEP_ALIVE_SECONDS
+            )
+        state["loaded"] = loaded
+        state["checked_at"] = now
+
+
+def _refresh_model_residency(host, port):
+    url = f"http://{host}:{port}/api/ps"
+    try:
+        req = urllib.request.Request(url, method="GET")
+        with urllib.request.urlopen(req, timeout=3) as response:
+            payload = json.loads(response.read().decode("utf-8"))
+    except Exception as exc:  # pylint: disable=broad-except
+        log_event(
+            logging.WARNING,
+            "ollama",
+            "Ollama running models fetch skipped",
+            backend=f"{host}:{port}",
+            error=str(exc),
+        )
+        return False
+    _record_running_models(f"{host}:{port}", payload)
+    return True
+
+
+def is_model_resident(host, port, model):
+    with MODEL_RESIDENCY_LOCK:
+        state = MODEL_RESIDENCY.get(f"{host}:{port}")
+        if state is None:
+            return False
+        return state["loaded"].get(model, 0) > time.time()
+
+
+def preload_model(host, port, model, keep_alive):
+    backend = f"{host}:{port}"
+    _refresh_model_residency(host, port)
+    if is_model_resident(host, port, model):
+        with MODEL_RESIDENCY_LOCK:
+            _model_residency_locked(backend)["preload"] = {
+                "model": model,
+                "status": "resident",
+                "at": time.time(),
+                "duration": 0.0,
+            }
+        return True
+    with MODEL_RESIDENCY_LOCK:
+        _model_residency_locked(backend)["preload"] = {
+            "model": model,
+            "status": "loading",
+            "at": time.time(),
+            "duration": 0.0,
+        }
+    log_event(
+        logging.INFO,
+        "ollama",
+        "Ollama preload start",
+        model=model,
+        backend=f"{host}:{port}",
+    )
+    started_at = time.time()
+    status = "loaded"
+    try:
+        request = urllib.request.Request(
+            f"http://{host}:{port}/api/generate",
+            data=json.dumps(
+                {"model": model, "keep_alive": keep_alive, "stream": False}
+            ).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=300) as response:
+            response.read()
+    except Exception as exc:  # pylint: disable=broad-except
+        status = f"failed: {exc}"
+    duration = time.time() - started_at
+    with MODEL_RESIDENCY_LOCK:
+        state = _model_residency_locked(backend)
+        state["preload"] = {
+            "model": model,
+            "status": status,
+            "at": time.time(),
+            "duration": duration,
+        }
+        if status == "loaded":
+            state["loaded"][model] = time.time() + _parse_keep_alive(keep_alive)
+    if status == "loaded":
+        metric_observe("falldetector_ollama_load_seconds", duration, model=model)
+    log_event(
+        logging.INFO if status == "loaded" else logging.WARNING,
+        "ollama",
+        f"Ollama preload {status}",
+        model=model,
+        backend=f"{host}:{port}",
+        duration=round(duration, 3),
+    )
+    return status == "loaded"
+
+
+def start_model_preload(config):
+    settings, _error = _get_ollama_settings(config)
+    if not settings:
+        return None
+    keep_alive = f"{_get_keep_alive_seconds(config)}s"
+    thread = threading.Thread(
+        target=preload_model,
+        args=(settings["host"], settings["port"], settings["model"], keep_alive),
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def _parse_pull_targets(payload):
+    targets = []
+    raw_hosts = payload.get("hosts")
+    if isinstance(raw_hosts, str):
+        raw_hosts = raw_hosts.split(",")
+    if not raw_hosts:
+        raw_hosts = [{"host": payload.get("host"), "port": payload.get("port")}]
+    for item in raw_hosts:
+        if isinstance(item, dict):
+            host = str(item.get("host", "") or "").strip()
+            port = item.get("port") or 11434
+        else:
+            host, _sep, port = str(item).strip().rpartition(":")
+            if not host:
+                host, port = str(item).strip(), 11434
+        if not host:
+            continue
+        try:
+            port = int(port)
+        except Exception:
+            raise ValueError(f"Invalid port for {host}")
+        if (host, port) not in targets:
+            targets.append((host, port))
+    return targets
+
+
+def _pull_entry_progress(entry):
+    completed = sum(layer[0] for layer in entry["layers"].values())
+    total = sum(layer[1] for layer in entry["layers"].values())
+    return completed, total
+
+
+def _pull_update_locked(entry, message):
+    if message.get("status"):
+        entry["status"] = message["status"]
+    digest = message.get("digest")
+    if digest and message.get("total"):
+        entry["layers"][digest] = (
+            int(message.get("completed") or 0),
+            int(message["total"]),
+        )
+        completed, _total = _pull_entry_progress(entry)
+        now = time.time()
+        last_at, last_bytes = entry["sample"]
+        if last_at and now > last_at and completed >= last_bytes:
+            rate = (completed - last_bytes) / (now - last_at)
+            entry["rate"] = (
+                rate if entry["rate"] is None else 0.2 * rate + 0.8 * entry["rate"]
+            )
+        entry["sample"] = (now, completed)
+
+
+def _pull_stream_once(entry, model):
+    request = urllib.request.Request(
+        f"http://{entry['host']}:{entry['port']}/api/pull",
+        data=json.dumps({"name": model, "stream": True}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=120) as response:
+        with PULL_LOCK:
+            entry["response"] = response
+        try:
+            for line in response:
+                if entry["cancel"].is_set():
+                    return "cancelled", ""
+                try:
+                    message = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    continue
+                if message.get("error"):
+                    return "failed", str(message["error"])
+                with PULL_LOCK:
+                    _pull_update_locked(entry, message)
+                if message.get("status") == "success":
+                    return "done", ""
+        finally:
+            with PULL_LOCK:
+                entry["response"] = None
+    if entry["cancel"].is_set():
+        return "cancelled", ""
+    raise ConnectionError("Pull stream ended before success")
+
+
+def _run_host_pull(entry, model):
+    backend = f"{entry['host']}:{entry['port']}"
+    while True:
+        with PULL_LOCK:
+            entry["attempts"] += 1
+            entry["state"] = "pulling"
+            entry["sample"] = (0.0, 0)
+        try:
+            state, error = _pull_stream_once(entry, model)
+        except urllib.error.HTTPError as exc:
+            state, error = "failed", f"HTTP {exc.code}: {exc.reason}"
+        except Exception as exc:  # pylint: disable=broad-except
+            state, error = "retrying", str(exc)
+            if entry["cancel"].is_set():
+                state, error = "cancelled", ""
+            elif entry["attempts"] >= PULL_MAX_ATTEMPTS:
+                state = "failed"
+        with PULL_LOCK:
+            entry["state"] = state
+            entry["error"] = error
+            entry["rate"] = None
+            if state == "done":
+                entry["status"] = "Pull complete."
+            elif state == "cancelled":
+                entry["status"] = "Pull cancelled."
+            elif state == "retrying":
+                entry["status"] = f"Retrying after: {error}"
+            else:
+                entry["status"] = error
+            if state != "retrying":
+                entry["finished_at"] = time.time()
+        log_event(
+            logging.WARNING if error else logging.INFO,
+            "pull",
+            f"Ollama pull {state}",
+            model=model,
+            backend=backend,
+            attempt=entry["attempts"],
+            error=error,
+        )
+        if state != "retrying":
+            return state
+        if entry["cancel"].wait(PULL_RETRY_SECONDS * entry["attempts"]):
+            with PULL_LOCK:
+                entry["state"] = "cancelled"
+                entry["status"] = "Pull cancelled."
+                entry["finished_at"] = time.time()
+            return "cancelled"
+
+
+def start_model_pull(model, targets):
+    started = []
+    with PULL_LOCK:
+        hosts = PULL_STATE["hosts"]
+        busy = [
+            f"{host}:{port}"
+            for host, port in targets
+            if hosts.get(f"{host}:{port}", {}).get("state") in PULL_ACTIVE_STATES
+        ]
+        if len(busy) == len(targets):
+            return started, busy
+        for backend in [
+            backend
+            for backend, entry in hosts.items()
+            if entry["state"] not in PULL_ACTIVE_STATES
+        ]:
+            del hosts[backend]
+        for host, port in targets:
+            backend = f"{host}:{port}"
+            if backend in busy:
+                continue
+            entry = {
+                "host": host,
+                "port": port,
+                "model": model,
+                "state": "queued",
+                "status": f"Pulling {model}…",
+                "layers": {},
+                "attempts": 0,
+                "error": "",
+                "rate": None,
+                "sample": (0.0, 0),
+                "started_at": time.time(),
+                "finished_at": 0,
+                "cancel": threading.Event(),
+                "response": None,
+            }
+            hosts[backend] = entry
+            started.append(backend)
+            PULL_EXECUTOR.submit(_run_host_pull, entry, model)
+        if started:
+            PULL_STATE["model"] = model
+            PULL_STATE["started_at"] = time.time()
+    return started, busy
+
+
+def cancel_model_pull(backend=None):
+    responses = []
+    with PULL_LOCK:
+        for name, entry in PULL_STATE["hosts"].items():
+            if backend and name != backend:
+                continue
+            if entry["state"] in PULL_ACTIVE_STATES:
+                entry["cancel"].set()
+                responses.append(entry["response"])
+    for response in responses:
+        try:
+            if response:
+                response.close()
+        except Exception:  # pylint: disable=broad-except
+            pass
+    return len(responses)
+
+
+def get_pull_snapshot():
+    now = time.time()
+    with PULL_LOCK:
+        hosts = []
+        completed_sum = 0
+        total_sum = 0
+        rate_sum = 0.0
+        for backend, entry in PULL_STATE["hosts"].items():
+            completed, total = _pull_entry_progress(entry)
+            active = entry["state"] in PULL_ACTIVE_STATES
+            rate = entry["rate"] or 0.0
+            if active:
+                completed_sum += completed
+                total_sum += total
+                rate_sum += rate
+            hosts.append(
+                {
+                    "backend": backend,
+                    "host": entry["host"],
+                    "port": entry["port"],
+                    "model": entry["model"],
+                    "state": entry["state"],
+                    "status": entry["status"],
+                    "completed": completed,
+                    "total": total,
+                    "attempts": entry["attempts"],
+                    "bytes_per_second": rate,
+                    "eta_seconds": (
+                        (total - completed) / rate if active and rate > 0 else None
+                    ),
+                    "error": entry["error"],
+                    "elapsed": (entry["finished_at"] or now) - entry["started_at"],
+                }
+            )
+        active_hosts = [item for item in hosts if item["state"] in PULL_ACTIVE_STATES]
+        first = (active_hosts or hosts or [{}])[0]
+        if active_hosts:
+            status = (
+                first["status"]
+                if len(hosts) == 1
+                else f"Pulling {PULL_STATE['model']} to {len(active_hosts)} of "
+                f"{len(hosts)} hosts…"
+            )
+        else:
+            status = first.get("status") or "Idle."
+        if not active_hosts:
+            completed_sum = sum(item["completed"] for item in hosts)
+            total_sum = sum(item["total"] for item in hosts)
+        failed = [item for item in hosts if item["state"] == "failed"]
+        return {
+            "in_progress": bool(active_hosts),
+            "status": status,
+            "model": PULL_STATE["model"],
+            "host": first.get("host", ""),
+            "port": first.get("port", 0),
+            "completed": completed_sum,
+            "total": total_sum,
+            "bytes_per_second": rate_sum,
+            "eta_seconds": (
+                (total_sum - completed_sum) / rate_sum
+                if active_hosts and rate_sum > 0
+                else None
+            ),
+            "error": "; ".join(
+                f"{item['backend']}: {item['error']}" for item in failed
+            ),
+            "started_at": PULL_STATE["started_at"],
+            "hosts": hosts,
+        }
+
+
+def get_model_residency_snapshot():
+    now = time.time()
+    with MODEL_RESIDENCY_LOCK:
+        snapshot = {}
+        for backend, state in MODEL_RESIDENCY.items():
+            latency = {}
+            for kind in ("cold", "warm"):
+                stats = state[kind]
+                latency[kind] = {
+                    "count": stats["count"],
+                    "avg": stats["total"] / stats["count"] if stats["count"] else 0.0,
+                    "last": stats["last"],
+                }
+            snapshot[backend] = {
+                "loaded": sorted(
+                    name for name, expires in state["loaded"].items() if expires > now
+                ),
+                "checked_at": state["checked_at"],
+                "preload": dict(state["preload"]),
+                "latency": latency,
+            }
+        return snapshot
+
+
+def check_url_status(url):
+    req = urllib.request.Request(url, method="GET")
+    with urllib.request.urlopen(req, timeout=3) as response:
+        return (
+            {
+                "ok": True,
+                "status": response.status,
+                "content_type": response.headers.get("Content-Type", ""),
+            },
+            200,
+        )
+
+
+def check_ollama_status(host, port_num):
+    return check_url_status(f"http://{host}:{port_num}/api/tags")
+
+
+def _fetch_json(url, timeout, result):
+    try:
+        req = urllib.request.Request(url, method="GET")
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            result["payload"] = json.loads(response.read().decode("utf-8"))
+    except Exception as exc:  # pylint: disable=broad-except
+        result["error"] = exc
+
+
+def fetch_ollama_catalog(host, port_num):
+    tags_url = f"http://{host}:{port_num}/api/tags"
+    ps_url = f"http://{host}:{port_num}/api/ps"
+    log_event(logging.DEBUG, "ollama", "Ollama tags request", url=tags_url)
+    tags, running = {}, {}
+    ps_thread = threading.Thread(
+        target=_fetch_json, args=(ps_url, 3, running), daemon=True
+    )
+    ps_thread.start()
+    _fetch_json(tags_url, 4, tags)
+    ps_thread.join()
+
+    exc = tags.get("error")
+    if isinstance(exc, urllib.error.HTTPError):
+        detail = ""
+        try:
+            detail = exc.read().decode("utf-8")
+        except Exception:  # pylint: disable=broad-except
+            detail = ""
+        message = f"HTTP {exc.code}: {exc.reason}"
+        if detail:
+            message = f"{message} ({detail})"
+        log_event(
+            logging.WARNING,
+            "ollama",
+            "Ollama tags fetch failed",
+            backend=f"{host}:{port_num}",
+            error=message,
+        )
+        return {"ok": False, "error": message}, 502
+    if exc is not None:
+        message = str(exc)
+        log_event(
+            logging.WARNING,
+            "ollama",
+            "Ollama tags fetch failed",
+            backend=f"{host}:{port_num}",
+            error=message,
+        )
+        return {"ok": False, "error": message}, 502
+    tags_payload = tags.get("payload") or {}
+
+    running_payload = running.get("payload") or {}
+    if "error" in running:
+        log_event(
+            logging.WARNING,
+            "ollama",
+            "Ollama running models fetch skipped",
+            backend=f"{host}:{port_num}",
+            error=str(running["error"]),
+        )
+    else:
+        _record_running_models(f"{host}:{port_num}", running_payload)
+
+    models = []
+    seen = set()
+    for item in tags_payload.get("models", []) or []:
+        name = item.get("name")
+        if name and name not in seen:
+            seen.add(name)
+            models.append(name)
+    running_names = []
+    for item in running_payload.get("models", []) or []:
+        name = item.get("name") or item.get("model")
+        if name and name not in seen:
+            seen.add(name)
+            models.append(name)
+        if name and name not in running_names:
+            running_names.append(name)
+    return (
+        {
+            "ok": True,
+            "models": models,
+            "installed_models": len(tags_payload.get("models", []) or []),
+            "running_models": len(running_payload.get("models", []) or []),
+            "running_names": running_names,
+        },
+        200,
+    )
+
+
+HEALTH_FETCHERS = {
+    "preview": check_url_status,
+    "ollama": check_ollama_status,
+    "catalog": fetch_ollama_catalog,
+}
+
+
+def _health_refresh(cache_key):
+    kind, args = cache_key
+    try:
+        result = HEALTH_FETCHERS[kind](*args)
+    except Exception as exc:  # pylint: disable=broad-except
+        result = ({"ok": False, "error": str(exc)}, 502)
+    with HEALTH_LOCK:
+        entry = HEALTH_CACHE.get(cache_key)
+        if entry is not None:
+            entry["result"] = result
+            entry["fetched_at"] = time.time()
+            entry["future"] = None
+    return result
+
+
+def _health_entry_locked(cache_key):
+    entry = HEALTH_CACHE.get(cache_key)
+    if entry is None:
+        entry = {"result": None, "fetched_at": 0, "future": None, "requested_at": 0}
+        HEALTH_CACHE[cache_key] = entry
+    return entry
+
+
+def _health_schedule_locked(cache_key, entry):
+    if entry["future"] is None:
+        entry["future"] = HEALTH_EXECUTOR.submit(_health_refresh, cache_key)
+    return entry["future"]
+
+
+def get_health_check(kind, *args, force=False):
+    cache_key = (kind, args)
+    now = time.time()
+    with HEALTH_LOCK:
+        entry = _health_entry_locked(cache_key)
+        entry["requested_at"] = now
+        age = now - entry["fetched_at"]
+        result = entry["result"]
+        if result is not None and not force and age < HEALTH_STALE_SECONDS:
+            stale = age >= HEALTH_TTL_SECONDS
+            if stale:
+                _health_schedule_locked(cache_key, entry)
+            payload, status = result
+            return {**payload, "cached": True, "stale": stale, "age": age}, status
+        future = _health_schedule_locked(cache_key, entry)
+    payload, status = future.result()
+    return {**payload, "cached": False, "stale": False, "age": 0}, status
+
+
+def _get_configured_health_keys(config):
+    keys = []
+    for camera in _get_monitor_cameras(config) or []:
+        preview_url = str(camera.get("previewUrl", "") or "").strip()
+        if preview_url.startswith(("http://", "https://")):
+            keys.append(("preview", (preview_url,)))
+    settings, _error = _get_ollama_settings(config)
+    if settings:
+        keys.append(("ollama", (settings["host"], settings["port"])))
+        keys.append(("catalog", (settings["host"], settings["port"])))
+    return keys
+
+
+def _health_sweep():
+    with STATE_LOCK:
+        config = copy.deepcopy(SERVER_STATE.get("config") or {})
+    configured = set(_get_configured_health_keys(config))
+    now = time.time()
+    with HEALTH_LOCK:
+        for cache_key in configured:
+            _health_entry_locked(cache_key)
+        for cache_key in list(HEALTH_CACHE):
+            entry = HEALTH_CACHE[cache_key]
+            if cache_key not in configured:
+                last_used = max(entry["fetched_at"], entry["requested_at"])
+                idle = now - last_used >= HEALTH_STALE_SECONDS
+                if idle and entry["future"] is None:
+                    del HEALTH_CACHE[cache_key]
+                continue
+            if now - entry["fetched_at"] >= HEALTH_TTL_SECONDS:
+                _health_schedule_locked(cache_key, entry)
+
+
+def _health_loop():
+    while not HEALTH_STOP.is_set():
+        _health_sweep()
+        HEALTH_STOP.wait(HEALTH_REFRESH_SECONDS)
+
+
+def start_health_thread():
+    global HEALTH_THREAD
+    if HEALTH_THREAD and HEALTH_THREAD.is_alive():
+        return
+    HEALTH_STOP.clear()
+    HEALTH_THREAD = threading.Thread(target=_health_loop, daemon=True)
+    HEALTH_THREAD.start()
+
+
+def stop_health_thread():
+    HEALTH_STOP.set()
+    if HEALTH_THREAD:
+        HEALTH_THREAD.join(timeout=2)
+
+
+def get_health_snapshot():
+    now = time.time()
+    snapshot = []
+    with HEALTH_LOCK:
+        for (kind, args), entry in HEALTH_CACHE.items():
+            if kind == "preview":
+                target = _redact_url(args[0])
+            else:
+                target = f"{args[0]}:{args[1]}"
+            snapshot.append(
+                {
+                    "kind": kind,
+                    "target": target,
+                    "ok": bool(entry["result"] and entry["result"][0].get("ok")),
+                    "age": now - entry["fetched_at"] if entry["fetched_at"] else None,
+                    "refreshing": entry["future"] is not None,
+                }
+            )
+    return snapshot
+
+
+def frame_dhash(image_bytes):
+    try:
+        import cv2  # type: ignore
+        import numpy  # type: ignore
+    except Exception:
+        return None
+    image = cv2.imdecode(
+        numpy.frombuffer(image_bytes, dtype=numpy.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_4
+    )
+    if image is None:
+        return None
+    small = cv2.resize(image, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = numpy.packbits(small[:, 1:] > small[:, :-1])
+    return int.from_bytes(bits.tobytes(), "big")
+
+
+def _get_verdict_cache_seconds(payload):
+    value = payload.get("verdictCacheSeconds")
+    if value is None or value == "":
+        return VERDICT_CACHE_SECONDS
+    try:
+        return max(0.0, float(value))
+    except Exception:
+        return VERDICT_CACHE_SECONDS
+
+
+def lookup_verdict(scope, frame_hash):
+    now = time.time()
+    best = None
+    with VERDICT_LOCK:
+        for key, entry in VERDICT_CACHE.items():
+            if key[0] != scope or entry["expires_at"] <= now:
+                continue
+            distance = (key[1] ^ frame_hash).bit_count()
+            if distance <= VERDICT_CACHE_DISTANCE and (
+                best is None or distance < best[0]
+            ):
+                best = (distance, key, entry)
+                if distance == 0:
+                    break
+        if best is None:
+            VERDICT_STATS["misses"] += 1
+            metric_inc("falldetector_verdict_cache_total", result="miss")
+            return None
+        distance, key, entry = best
+        VERDICT_CACHE.move_to_end(key)
+        entry["hits"] += 1
+        VERDICT_STATS["hits"] += 1
+        VERDICT_STATS["saved_seconds"] += entry["duration"]
+    metric_inc("falldetector_verdict_cache_total", result="hit")
+    metric_inc("falldetector_verdict_cache_saved_seconds_total", entry["duration"])
+    return {**entry, "distance": distance}
+
+
+def store_verdict(scope, frame_hash, ttl, response_id, text, duration):
+    now = time.time()
+    with VERDICT_LOCK:
+        expired = [
+            key for key, entry in VERDICT_CACHE.items() if entry["expires_at"] <= now
+        ]
+        for key in expired:
+            del VERDICT_CACHE[key]
+        VERDICT_CACHE[(scope, frame_hash)] = {
+            "id": response_id,
+            "text": text,
+            "duration": duration,
+            "stored_at": now,
+            "expires_at": now + ttl,
+            "hits": 0,
+        }
+        VERDICT_CACHE.move_to_end((scope, frame_hash))
+        while len(VERDICT_CACHE) > VERDICT_CACHE_MAX_ENTRIES:
+            VERDICT_CACHE.popitem(last=False)
+
+
+def get_verdict_cache_snapshot():
+    now = time.time()
+    with VERDICT_LOCK:
+        lookups = VERDICT_STATS["hits"] + VERDICT_STATS["misses"]
+        cameras = {}
+        for key, entry in VERDICT_CACHE.items():
+            if entry["expires_at"] <= now:
+                continue
+            camera = cameras.setdefault(key[0][0], {"entries": 0, "hits": 0})
+            camera["entries"] += 1
+            camera["hits"] += entry["hits"]
+        return {
+            "entries": len(VERDICT_CACHE),
+            "max_entries": VERDICT_CACHE_MAX_ENTRIES,
+            "default_ttl": VERDICT_CACHE_SECONDS,
+            "max_distance": VERDICT_CACHE_DISTANCE,
+            "hits": VERDICT_STATS["hits"],
+            "misses": VERDICT_STATS["misses"],
+            "hit_rate": VERDICT_STATS["hits"] / lookups if lookups else 0.0,
+            "saved_seconds": VERDICT_STATS["saved_seconds"],
+            "cameras": cameras,
+        }
+
+
+def _memory_add(usage, cameras, camera, category, size):
+    usage[category] = usage.get(category, 0) + size
+    if cameras is not None and camera:
+        bucket = cameras.setdefault(camera, {})
+        bucket[category] = bucket.get(category, 0) + size
+
+
+def _memory_collect(cameras=None, sources=None):
+    usage = {category: 0 for category in MEMORY_CATEGORIES}
+    with RESPONSE_LOCK:
+        usage["responses"] = RESPONSE_STATE["bytes"]
+        if cameras is not None:
+            for item in OLLAMA_RESPONSES:
+                _memory_add({}, cameras, item.camera_id, "responses", item.nbytes)
+    with EVIDENCE_LOCK:
+        for clip in EVIDENCE_CLIPS.values():
+            size = len(clip["data"]) + len(clip["strip"] or b"")
+            _memory_add(usage, cameras, clip["camera_id"], "evidence", size)
+    with VERDICT_LOCK:
+        for key, entry in VERDICT_CACHE.items():
+            size = MEMORY_VERDICT_ENTRY_BYTES + len(entry["text"])
+            _memory_add(usage, cameras, key[0][0], "verdict_cache", size)
+    with STREAMS_LOCK:
+        for camera_id, stream in STREAMS.items():
+            _memory_add(
+                usage, cameras, camera_id, "stream_frames", len(stream["frame"] or b"")
+            )
+    with FRAME_RINGS_LOCK:
+        for url, ring in FRAME_RINGS.items():
+            size = len(ring.arena)
+            _memory_add(usage, sources, _redact_url(url), "frame_rings", size)
+    with FFMPEG_LOCK:
+        for url, reader in FFMPEG_READERS.items():
+            size = sum(len(buffer) for buffer in reader["buffers"])
+            _memory_add(usage, sources, _redact_url(url), "ffmpeg_buffers", size)
+    with TRACE_LOCK:
+        usage["traces"] = sum(
+            MEMORY_TRACE_BYTES + MEMORY_SPAN_BYTES * len(trace["spans"])
+            for trace in TRACES
+        )
+    with SESSION_LOCK:
+        usage["sessions"] = MEMORY_SESSION_BYTES * len(SESSIONS)
+    return usage
+
+
+def _evict_verdict_cache(needed):
+    freed = count = 0
+    with VERDICT_LOCK:
+        while VERDICT_CACHE and freed < needed:
+            _, entry = VERDICT_CACHE.popitem(last=False)
+            freed += MEMORY_VERDICT_ENTRY_BYTES + len(entry["text"])
+            count += 1
+    return freed, count
+
+
+def _evict_traces(needed):
+    freed = count = 0
+    with TRACE_LOCK:
+        while TRACES and freed < needed:
+            trace = TRACES.pop()
+            freed += MEMORY_TRACE_BYTES + MEMORY_SPAN_BYTES * len(trace["spans"])
+            count += 1
+    return freed, count
+
+
+def _evict_responses(needed, triggered):
+    freed = 0
+    dropped = set()
+    with RESPONSE_LOCK:
+        for item in reversed(OLLAMA_RESPONSES):
+            if freed >= needed:
+                break
+            if item.triggered == triggered:
+                dropped.add(item.id)
+                freed += item.nbytes
+        if dropped:
+            OLLAMA_RESPONSES[:] = [
+                item for item in OLLAMA_RESPONSES if item.id not in dropped
+            ]
+            RESPONSE_STATE["bytes"] -= freed
+    if dropped:
+        with EVIDENCE_LOCK:
+            for response_id in dropped:
+                clip = EVIDENCE_CLIPS.pop(response_id, None)
+                if clip is not None:
+                    freed += len(clip["data"]) + len(clip["strip"] or b"")
+    return freed, len(dropped)
+
+
+def _evict_evidence(needed):
+    freed = 0
+    dropped = []
+    with EVIDENCE_LOCK:
+        while EVIDENCE_CLIPS and freed < needed:
+            response_id, clip = EVIDENCE_CLIPS.popitem(last=False)
+            freed += len(clip["data"]) + len(clip["strip"] or b"")
+            dropped.append(response_id)
+    for response_id in dropped:
+        update_response(response_id, evidence=None)
+    return freed, len(dropped)
+
+
+MEMORY_EVICTION_ORDER = (
+    ("verdict_cache", _evict_verdict_cache),
+    ("traces", _evict_traces),
+    ("responses", lambda needed: _evict_responses(needed, False)),
+    ("evidence", _evict_evidence),
+    ("triggered_responses", lambda needed: _evict_responses(needed, True)),
+)
+
+
+def enforce_memory_budget():
+    if MEMORY_BUDGET_BYTES <= 0:
+        return
+    with MEMORY_LOCK:
+        usage = _memory_collect()
+        live = sum(usage[category] for category in MEMORY_LIVE_CATEGORIES)
+        allowance = MEMORY_BUDGET_BYTES - live
+        excess = sum(usage.values()) - live - max(0, allowance)
+        for category, evict in MEMORY_EVICTION_ORDER:
+            if excess <= 0:
+                break
+            if category == "triggered_responses" and allowance <= 0:
+                break
+            freed, count = evict(excess)
+            if not count:
+                continue
+            excess -= freed
+            evicted = MEMORY_STATE["evicted"].setdefault(
+                category, {"entries": 0, "bytes": 0}
+            )
+            evicted["entries"] += count
+            evicted["bytes"] += freed
+            metric_inc("falldetector_memory_evicted_total", count, category=category)
+            log_event(
+                logging.INFO,
+                "memory",
+                "Evicted data to stay within memory budget",
+                rate_key=f"memory-evict:{category}",
+                evicted=category,
+                entries=count,
+                bytes=freed,
+            )
+        if allowance < 0:
+            log_event(
+                logging.WARNING,
+                "memory",
+                "Memory budget exceeded by live buffers",
+                rate_key="memory-over-budget",
+                live_bytes=live,
+                budget_bytes=MEMORY_BUDGET_BYTES,
+            )
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def get_memory_snapshot():
+    cameras = {}
+    sources = {}
+    usage = _memory_collect(cameras, sources)
+    with MEMORY_LOCK:
+        evicted = copy.deepcopy(MEMORY_STATE["evicted"])
+    return {
+        "budget_bytes": MEMORY_BUDGET_BYTES,
+        "used_bytes": sum(usage.values()),
+        "rss_bytes": _rss_bytes(),
+        "categories": usage,
+        "cameras": cameras,
+        "sources": sources,
+        "evicted": evicted,
+    }
+
+
+def ollama_analyze_payload(payload, image_bytes=None, reserved=False):
+    with trace_span("ollama_analyze_payload") as span:
+        result, status = _ollama_analyze_payload(payload, image_bytes, reserved)
+        span.set("camera", payload.get("cameraId", ""))
+        span.set("status", status)
+        if status != 200:
+            span.set("error", result.get("error", ""))
+        return result, status
+
+
+def _ollama_analyze_payload(payload, image_bytes=None, reserved=False):
+    host = str(payload.get("host", "")).strip()
+    port = payload.get("port")
+    model = str(payload.get("model", "")).strip()
+    prompt = str(payload.get("prompt", "")).strip()
+    trigger = str(payload.get("trigger", "")).strip()
+    preview_mode = str(payload.get("previewMode", "")).strip()
+    timeout_seconds = payload.get("timeoutSeconds")
+    streams = resolve_camera_streams(payload)
+    stream_url = streams["inference"]
+    evidence_url = streams["evidence"]
+    preview_url = str(payload.get("previewUrl", "")).strip()
+    camera_id = str(payload.get("cameraId", "")).strip()
+    camera_name = str(payload.get("cameraName", "")).strip()
+    camera_model = str(payload.get("cameraModel", "")).strip()
+
+    if not host or not model or not prompt:
+        return {"ok": False, "error": "Missing host, model, or prompt"}, 400
+    try:
+        port_num = int(port)
+    except Exception:
+        return {"ok": False, "error": "Invalid port"}, 400
+
+    priority = _inference_priority(payload, camera_id)
+    try:
+        max_frame_age = float(
+            payload.get("maxFrameAgeSeconds") or INFERENCE_FRAME_MAX_AGE
+        )
+    except Exception:
+        max_frame_age = float(INFERENCE_FRAME_MAX_AGE)
+
+    camera_label = camera_id or camera_name or "unknown"
+    metric_camera, metric_model, metric_backend = _metric_labels(
+        camera_id, model, f"{host}:{port_num}"
+    )
+    capture, capture_url = _get_capture_source(streams, payload)
+    supplied_image = image_bytes is not None
+    capture_started = time.time()
+    try:
+        if not supplied_image:
+            with trace_span("capture", camera=camera_label):
+                if capture_url:
+                    image_bytes = capture_with_substream_fallback(
+                        capture, capture_url, streams["main"]
+                    )
+    except Exception as exc:  # pylint: disable=broad-except
+        metric_inc(
+            "falldetector_errors_total",
+            camera=metric_camera,
+            model=metric_model,
+            stage="capture",
+        )
+        return {"ok": False, "error": str(exc)}, 502
+
+    if not image_bytes:
+        metric_inc(
+            "falldetector_errors_total",
+            camera=metric_camera,
+            model=metric_model,
+            stage="capture",
+        )
+        return {"ok": False, "error": "No preview image available"}, 400
+    captured_at = time.time()
+    if not supplied_image:
+        metric_observe(
+            "falldetector_capture_seconds",
+            captured_at - capture_started,
+            camera=metric_camera,
+        )
+    metric_observe(
+        "falldetector_payload_bytes", len(image_bytes), camera=metric_camera
+    )
+
+    cache_scope = None
+    cached = None
+    cache_seconds = _get_verdict_cache_seconds(payload)
+    if (
+        cache_seconds > 0
+        and not supplied_image
+        and priority == INFERENCE_PRIORITIES["routine"]
+    ):
+        with trace_span("verdict_cache.lookup", camera=camera_label):
+            frame_hash = frame_dhash(image_bytes)
+            if frame_hash is not None:
+                backend = f"{host}:{port_num}"
+                cache_scope = (camera_label, backend, model, prompt, trigger)
+                cached = lookup_verdict(cache_scope, frame_hash)
+        if cached:
+            log_event(
+                logging.INFO,
+                "analyze",
+                "Ollama analyze served from cache",
+                camera=camera_label,
+                model=model,
+                cached_from=cached["id"],
+                distance=cached["distance"],
+                saved_seconds=round(cached["duration"], 3),
+            )
+            response_id = uuid.uuid4().hex[:16]
+            store_response(
+                {
+                    "id": response_id,
+                    "timestamp": time.time(),
+                    "text": cached["text"],
+                    "model": model,
+                    "triggered": False,
+                    "camera_id": camera_id,
+                    "camera_name": camera_name,
+                    "camera_model": camera_model,
+                    "duration": 0.0,
+                    "cold_load": False,
+                    "cached": True,
+                    "cached_from": cached["id"],
+                }
+            )
+            return (
+                {
+                    "ok": True,
+                    "id": response_id,
+                    "response": cached["text"],
+                    "triggered": False,
+                    "image": base64.b64encode(image_bytes).decode("utf-8"),
+                    "image_type": "image/jpeg",
+                    "inference_image": "",
+                    "evidence_captured": False,
+                    "camera_id": camera_id,
+                    "camera_name": camera_name,
+                    "camera_model": camera_model,
+                    "queue_wait": 0.0,
+                    "duration": 0.0,
+                    "cold_load": False,
+                    "load_duration": 0.0,
+                    "cached": True,
+                    "cached_from": cached["id"],
+                    "hash_distance": cached["distance"],
+                    "saved_seconds": cached["duration"],
+                },
+                200,
+            )
 
     try:
         timeout_seconds = float(timeout_seconds)
@@ -180,34 +3874,87 @@ def ollama_analyze_payload(payload):
     if timeout_seconds <= 0:
         timeout_seconds = 60
 
-    image_b64 = base64.b64encode(image_bytes).decode("utf-8")
+    encode_started = time.time()
+    with trace_span("base64.encode", bytes=len(image_bytes)):
+        image_b64 = base64.b64encode(image_bytes).decode("utf-8")
+    metric_observe(
+        "falldetector_encode_seconds", time.time() - encode_started, stage="base64"
+    )
+    keep_alive = payload.get("keepAlive") or _get_default_keep_alive()
     ollama_payload = {
         "model": model,
         "prompt": prompt,
         "images": [image_b64],
         "stream": False,
+        "keep_alive": keep_alive,
     }
 
     url = f"http://{host}:{port_num}/api/generate"
+    backend = f"{host}:{port_num}"
+    with trace_span("inference.queue", backend=backend, priority=priority):
+        ticket, queue_error, queue_status, retry_after = _inference_acquire(
+            backend, priority, captured_at + max_frame_age, reserved
+        )
+    if ticket is None:
+        metric_inc(
+            "falldetector_inference_rejected_total",
+            backend=metric_backend,
+            reason="full" if queue_status == 429 else "expired",
+        )
+        log_event(
+            logging.WARNING,
+            "analyze",
+            "Ollama analyze rejected",
+            camera=camera_label,
+            model=model,
+            backend=backend,
+            status=queue_status,
+            error=queue_error,
+        )
+        return (
+            {
+                "ok": False,
+                "error": f"{queue_error} Retry in {retry_after}s.",
+                "retry_after": retry_after,
+            },
+            queue_status,
+        )
+    metric_observe(
+        "falldetector_inference_queue_wait_seconds",
+        ticket["waited"],
+        backend=metric_backend,
+    )
+    duration = None
     try:
-        print(
-            (
-                "Ollama analyze start: "
-                f"model={model} host={host} port={port_num} "
-                f"timeout={timeout_seconds}s images=1 bytes={len(image_bytes)}"
-            ),
-            file=sys.stderr,
+        log_event(
+            logging.DEBUG,
+            "analyze",
+            "Ollama analyze start",
+            camera=camera_label,
+            model=model,
+            backend=backend,
+            timeout=timeout_seconds,
+            image_bytes=len(image_bytes),
+            queue_wait=round(ticket["waited"], 3),
+        )
+        encode_started = time.time()
+        with trace_span("json.serialize"):
+            request_body = json.dumps(ollama_payload).encode("utf-8")
+        metric_observe(
+            "falldetector_encode_seconds", time.time() - encode_started, stage="json"
         )
         started_at = time.time()
         request = urllib.request.Request(
             url,
-            data=json.dumps(ollama_payload).encode("utf-8"),
+            data=request_body,
             headers={"Content-Type": "application/json"},
             method="POST",
         )
-        with urllib.request.urlopen(request, timeout=timeout_seconds) as response:
-            raw = response.read().decode("utf-8")
-            response_payload = json.loads(raw)
+        with trace_span("ollama.generate", model=model):
+            with urllib.request.urlopen(request, timeout=timeout_seconds) as response:
+                raw = response.read().decode("utf-8")
+                response_payload = json.loads(raw)
+        duration = time.time() - started_at
     except urllib.error.HTTPError as exc:
         detail = ""
         try:
@@ -217,28 +3964,131 @@ def ollama_analyze_payload(payload):
         message = f"HTTP {exc.code}: {exc.reason}"
         if detail:
             message = f"{message} ({detail})"
-        print(f"Ollama analyze failed: {message}", file=sys.stderr)
+        log_event(
+            logging.ERROR,
+            "analyze",
+            "Ollama analyze failed",
+            camera=camera_label,
+            model=model,
+            backend=backend,
+            status=exc.code,
+            error=message,
+            rate_key=f"http-{exc.code}",
+        )
+        metric_inc(
+            "falldetector_errors_total",
+            camera=metric_camera,
+            model=metric_model,
+            stage="ollama",
+        )
         return {"ok": False, "error": message}, 502
     except Exception as exc:  # pylint: disable=broad-except
         message = str(exc)
-        print(f"Ollama analyze failed: {message}", file=sys.stderr)
+        log_event(
+            logging.ERROR,
+            "analyze",
+            "Ollama analyze failed",
+            camera=camera_label,
+            model=model,
+            backend=backend,
+            error=message,
+            rate_key=type(exc).__name__,
+        )
+        metric_inc(
+            "falldetector_errors_total",
+            camera=metric_camera,
+            model=metric_model,
+            stage="ollama",
+        )
+        if "timed out" in message.lower() or "timeout" in message.lower():
+            metric_inc(
+                "falldetector_timeouts_total", camera=metric_camera, model=metric_model
+            )
         return {"ok": False, "error": message}, 502
+    finally:
+        _inference_release(ticket, duration)
+
+    load_seconds = float(response_payload.get("load_duration") or 0) / 1e9
+    cold_load = load_seconds >= COLD_LOAD_THRESHOLD
+    _record_model_use(backend, model, keep_alive, duration, cold_load)
+    metric_observe(
+        "falldetector_ollama_seconds",
+        duration,
+        model=metric_model,
+        load="cold" if cold_load else "warm",
+    )
+    metric_observe(
+        "falldetector_ollama_load_seconds", load_seconds, model=metric_model
+    )
+    metric_inc(
+        "falldetector_inferences_total", camera=metric_camera, model=metric_model
+    )
 
-    duration = time.time() - started_at
     text = str(response_payload.get("response", "")).strip()
     triggered = False
     if trigger:
         triggered = trigger.lower() in text.lower()
-    print(
-        (
-            "Ollama analyze complete: "
-            f"model={model} triggered={triggered} chars={len(text)} "
-            f"duration={duration:.1f}s"
-        ),
-        file=sys.stderr,
+    if triggered:
+        metric_inc(
+            "falldetector_triggers_total", camera=metric_camera, model=metric_model
+        )
+    if triggered and camera_id:
+        _note_recent_trigger(camera_id)
+    evidence_b64 = ""
+    if (
+        triggered
+        and not supplied_image
+        and preview_mode == "rtsp"
+        and evidence_url.startswith("rtsp://")
+        and evidence_url != stream_url
+    ):
+        try:
+            with trace_span("capture.evidence", camera=camera_label):
+                evidence_bytes = capture_rtsp_jpeg(evidence_url, record=False)
+            if evidence_bytes:
+                evidence_b64 = base64.b64encode(evidence_bytes).decode("utf-8")
+        except Exception as exc:  # pylint: disable=broad-except
+            log_event(
+                logging.WARNING,
+                "evidence",
+                "Evidence capture failed",
+                camera=camera_label,
+                error=str(exc),
+            )
+    log_event(
+        logging.INFO,
+        "analyze",
+        "Ollama analyze complete",
+        camera=camera_label,
+        model=model,
+        backend=backend,
+        triggered=triggered,
+        response_chars=len(text),
+        image_bytes=len(image_bytes),
+        request_bytes=len(request_body),
+        capture_seconds=round(captured_at - capture_started, 3),
+        supplied_image=supplied_image,
+        queue_wait=round(ticket["waited"], 3),
+        duration=round(duration, 3),
+        load_seconds=round(load_seconds, 3),
+        cold_load=cold_load,
     )
 
+    response_id = uuid.uuid4().hex[:16]
+    if cache_scope is not None and not triggered:
+        store_verdict(
+            cache_scope, frame_hash, cache_seconds, response_id, text, duration
+        )
+    if triggered and not supplied_image:
+        start_evidence_capture(
+            response_id,
+            camera_id,
+            [capture_url, streams["preview"]],
+            capture,
+            captured_at,
+        )
     entry = {
+        "id": response_id,
         "timestamp": time.time(),
         "text": text,
         "model": model,
@@ -246,24 +4096,40 @@ def ollama_analyze_payload(payload):
         "camera_id": camera_id,
         "camera_name": camera_name,
         "camera_model": camera_model,
+        "duration": duration,
+        "cold_load": cold_load,
     }
     store_response(entry)
     return (
         {
             "ok": True,
+            "id": response_id,
             "response": text,
             "triggered": triggered,
-            "image": image_b64,
+            "image": evidence_b64 or image_b64,
             "image_type": "image/jpeg",
+            "inference_image": image_b64 if evidence_b64 else "",
+            "evidence_captured": bool(evidence_b64),
             "camera_id": camera_id,
             "camera_name": camera_name,
             "camera_model": camera_model,
+            "queue_wait": ticket["waited"],
+            "duration": duration,
+            "cold_load": cold_load,
+            "load_duration": load_seconds,
         },
         200,
     )
 
 
 def send_email_alert_payload(payload):
+    with trace_span("send_email_alert_payload") as span:
+        result, status = _send_email_alert_payload(payload)
+        span.set("status", status)
+        return result, status
+
+
+def _send_email_alert_payload(payload):
     smtp_user = str(payload.get("smtp_user", "")).strip()
     smtp_password = str(payload.get("smtp_password", "")).strip()
     sender_email = str(payload.get("sender_email", "")).strip() or smtp_user
@@ -273,6 +4139,12 @@ def send_email_alert_payload(payload):
     body = str(payload.get("body", "")).strip()
     image_b64 = payload.get("image_b64")
     image_type = str(payload.get("image_type", "")).strip() or "image/jpeg"
+    smtp_host = str(payload.get("smtp_host", "")).strip() or DEFAULT_SMTP_HOST
+    try:
+        smtp_port = int(payload.get("smtp_port") or DEFAULT_SMTP_PORT)
+    except Exception:
+        return {"ok": False, "error": "Invalid SMTP port"}, 400
+    smtp_ssl = payload.get("smtp_ssl", True) is not False
 
     if not smtp_user or not smtp_password:
         return {"ok": False, "error": "Missing Gmail credentials"}, 400
@@ -317,18 +4189,46 @@ def send_email_alert_payload(payload):
             filename="alert-image.jpg",
         )
 
+    started_at = time.time()
     try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465, timeout=10) as server:
-            server.login(smtp_user, smtp_password)
-            server.send_message(message)
+        with trace_span("smtp.send", recipients=len(recipients)):
+            smtp_class = smtplib.SMTP_SSL if smtp_ssl else smtplib.SMTP
+            with smtp_class(smtp_host, smtp_port, timeout=10) as server:
+                server.login(smtp_user, smtp_password)
+                server.send_message(message)
+        metric_observe(
+            "falldetector_email_send_seconds", time.time() - started_at, result="sent"
+        )
         return {"ok": True, "message": "Email sent."}, 200
     except smtplib.SMTPException as exc:
         message = str(exc)
-        print(f"Gmail send failed: {message}", file=sys.stderr)
+        log_event(
+            logging.ERROR,
+            "email",
+            "Gmail send failed",
+            host=smtp_host,
+            recipients=len(recipients),
+            error=message,
+            rate_key=type(exc).__name__,
+        )
+        metric_observe(
+            "falldetector_email_send_seconds", time.time() - started_at, result="failed"
+        )
         return {"ok": False, "error": message}, 502
     except Exception as exc:  # pylint: disable=broad-except
         message = str(exc)
-        print(f"Gmail send failed: {message}", file=sys.stderr)
+        log_event(
+            logging.ERROR,
+            "email",
+            "Gmail send failed",
+            host=smtp_host,
+            recipients=len(recipients),
+            error=message,
+            rate_key=type(exc).__name__,
+        )
+        metric_observe(
+            "falldetector_email_send_seconds", time.time() - started_at, result="failed"
+        )
         return {"ok": False, "error": message}, 502
 
 
@@ -380,11 +4280,8 @@ def _get_ollama_settings(config):
 
 
 def _get_monitor_interval_seconds(config):
-    interval = None
     ollama = config.get("ollama") if isinstance(config.get("ollama"), dict) else {}
     interval = ollama.get("intervalSeconds")
-    if interval is None:
-        interval = ollama.get("timeoutSeconds")
     try:
         interval_value = float(interval)
     except Exception:
@@ -394,6 +4291,133 @@ def _get_monitor_interval_seconds(config):
     return interval_value
 
 
+def _get_adaptive_settings(config):
+    ollama = config.get("ollama") if isinstance(config.get("ollama"), dict) else {}
+    base = _get_monitor_interval_seconds(config)
+    try:
+        min_interval = float(ollama.get("minIntervalSeconds"))
+    except Exception:
+        min_interval = float(MIN_MONITOR_INTERVAL)
+    try:
+        max_interval = float(ollama.get("maxIntervalSeconds"))
+    except Exception:
+        max_interval = base * 2
+    min_interval = max(float(MIN_MONITOR_INTERVAL), min(min_interval, base))
+    max_interval = max(base, max_interval)
+    words = ollama.get("nearTriggerWords") or []
+    if isinstance(words, str):
+        words = words.split(",")
+    return {
+        "enabled": bool(ollama.get("adaptiveInterval")),
+        "base": base,
+        "min": min_interval,
+        "max": max_interval,
+        "near_trigger_words": [
+            str(word).strip().lower() for word in words if str(word).strip()
+        ],
+    }
+
+
+def _get_camera_key(camera):
+    return str(
+        camera.get("id") or camera.get("streamUrl") or camera.get("previewUrl") or ""
+    )
+
+
+def _adaptive_observe(config, camera, result):
+    settings = _get_adaptive_settings(config)
+    key = _get_camera_key(camera)
+    now = time.time()
+    frame_hash = None
+    image_b64 = result.get("inference_image") or result.get("image")
+    if result.get("ok") and image_b64:
+        try:
+            frame_hash = frame_dhash(base64.b64decode(image_b64))
+        except ValueError:
+            frame_hash = None
+    with ADAPTIVE_LOCK:
+        state = ADAPTIVE_STATE.get(key)
+        if state is None:
+            state = {
+                "interval": settings["base"],
+                "latencies": collections.deque(maxlen=ADAPTIVE_LATENCY_WINDOW),
+                "frame_hash": None,
+                "last_activity": 0,
+                "reason": "base",
+            }
+            ADAPTIVE_STATE[key] = state
+        if not result.get("ok"):
+            return
+        duration = result.get("duration")
+        if duration:
+            state["latencies"].append(float(duration))
+        previous_hash = state["frame_hash"]
+        state["frame_hash"] = frame_hash
+        text = str(result.get("response", "")).lower()
+        reason = ""
+        if result.get("triggered"):
+            reason = "trigger"
+        elif any(word in text for word in settings["near_trigger_words"]):
+            reason = "near_trigger"
+        elif previous_hash is not None and frame_hash is not None:
+            if (previous_hash ^ frame_hash).bit_count() >= ADAPTIVE_MOTION_DISTANCE:
+                reason = "motion"
+        if reason:
+            state["last_activity"] = now
+            state["interval"] = settings["min"]
+            state["reason"] = reason
+            return
+        latencies = state["latencies"]
+        if len(latencies) >= 4:
+            recent = sum(list(latencies)[-3:]) / 3
+            overall = sum(latencies) / len(latencies)
+            if recent > overall * 1.5:
+                state["interval"] = state["interval"] * ADAPTIVE_BACKOFF * 1.2
+                state["reason"] = "latency"
+                return
+        if now - state["last_activity"] >= settings["base"]:
+            state["interval"] = state["interval"] * ADAPTIVE_BACKOFF
+            state["reason"] = "static"
+        else:
+            state["interval"] = min(state["interval"], settings["base"])
+            state["reason"] = "recent_activity"
+
+
+def _get_camera_interval_seconds(config, camera):
+    settings = _get_adaptive_settings(config)
+    if not settings["enabled"]:
+        return settings["base"]
+    with ADAPTIVE_LOCK:
+        state = ADAPTIVE_STATE.get(_get_camera_key(camera))
+        if state is None:
+            return settings["base"]
+        interval = state["interval"]
+        latencies = state["latencies"]
+        if latencies:
+            floor = sum(latencies) / len(latencies) * ADAPTIVE_LATENCY_HEADROOM
+            interval = max(interval, floor)
+        interval = max(settings["min"], min(settings["max"], interval))
+        state["interval"] = interval
+        return interval
+
+
+def get_adaptive_snapshot():
+    with ADAPTIVE_LOCK:
+        return {
+            key: {
+                "interval": state["interval"],
+                "reason": state["reason"],
+                "last_activity": state["last_activity"],
+                "avg_latency": (
+                    sum(state["latencies"]) / len(state["latencies"])
+                    if state["latencies"]
+                    else 0.0
+                ),
+            }
+            for key, state in ADAPTIVE_STATE.items()
+        }
+
+
 def _get_email_recipients(config):
     recipients = []
     for responder in config.get("responders") or []:
@@ -431,6 +4455,9 @@ def _build_email_payload(config, context):
     sender_email = str(alerts.get("senderEmail", "")).strip() or smtp_user
     sender_name = str(alerts.get("gmailSenderName", "")).strip()
     recipients = _get_email_recipients(config)
+    smtp_host = str(alerts.get("smtpHost", "")).strip()
+    smtp_port = alerts.get("smtpPort")
+    smtp_ssl = alerts.get("smtpSsl", True) is not False
     if not smtp_user or not smtp_password:
         return None, "Missing Gmail credentials."
     if not sender_email:
@@ -450,6 +4477,9 @@ def _build_email_payload(config, context):
             "body": body,
             "image_b64": context.get("image_b64") or "",
             "image_type": context.get("image_type") or "",
+            "smtp_host": smtp_host,
+            "smtp_port": smtp_port,
+            "smtp_ssl": smtp_ssl,
         },
         "",
     )
@@ -460,63 +4490,117 @@ def _update_monitor_state(**updates):
         MONITOR_STATE.update(updates)
 
 
-def _run_monitor_cycle(config):
+def _monitor_camera(config, settings, keep_alive, camera, parent_span):
+    TRACE_LOCAL.span = parent_span
+    payload = {
+        "host": settings["host"],
+        "port": settings["port"],
+        "model": settings["model"],
+        "prompt": settings["prompt"],
+        "trigger": settings["trigger"],
+        "timeoutSeconds": settings["timeoutSeconds"],
+        "keepAlive": keep_alive,
+        "streamUrl": camera.get("streamUrl", ""),
+        "inferenceStreamUrl": camera.get("inferenceStreamUrl", ""),
+        "evidenceStreamUrl": camera.get("evidenceStreamUrl", ""),
+        "autoSubstream": camera.get("autoSubstream", True),
+        "verdictCacheSeconds": camera.get("verdictCacheSeconds"),
+        "captureBackend": camera.get("captureBackend", "opencv"),
+        "previewUrl": camera.get("previewUrl", ""),
+        "previewMode": camera.get("previewMode", "mjpeg"),
+        "cameraId": camera.get("id", ""),
+        "cameraName": camera.get("name", ""),
+        "cameraModel": camera.get("model", ""),
+        "priority": "routine",
+    }
+    result, _status = ollama_analyze_payload(payload, reserved=True)
+    _adaptive_observe(config, camera, result)
+    if result.get("ok") and result.get("triggered"):
+        email_payload, email_error = _build_email_payload(
+            config,
+            {
+                "event": "fall_detected",
+                "subject": "Fall Detector Alert",
+                "response_text": result.get("response", ""),
+                "image_b64": result.get("image", ""),
+                "image_type": result.get("image_type", ""),
+                "camera_name": camera.get("name", ""),
+                "camera_model": camera.get("model", ""),
+            },
+        )
+        if email_payload:
+            send_email_alert_payload(email_payload)
+        elif email_error and email_error != "Email alerts disabled.":
+            log_event(
+                logging.WARNING,
+                "email",
+                "Email alert skipped",
+                camera=camera.get("id", ""),
+                error=email_error,
+            )
+    return result
+
+
+def _run_monitor_cycle(config, cameras=None):
+    with trace_span("_run_monitor_cycle") as span:
+        span.set("cameras", len(cameras) if cameras is not None else "all")
+        _run_monitor_cycle_traced(config, cameras)
+
+
+def _run_monitor_cycle_traced(config, cameras):
     settings, error = _get_ollama_settings(config)
     if not settings:
         _update_monitor_state(last_error=error, last_error_at=time.time())
-        print(f"Monitoring skipped: {error}", file=sys.stderr)
+        log_event(
+            logging.WARNING, "monitor", "Monitoring skipped", error=error
+        )
         return
-    cameras = _get_monitor_cameras(config)
+    if cameras is None:
+        cameras = _get_monitor_cameras(config)
     if not cameras:
         error = "No cameras configured."
         _update_monitor_state(last_error=error, last_error_at=time.time())
-        print(f"Monitoring skipped: {error}", file=sys.stderr)
+        log_event(
+            logging.WARNING, "monitor", "Monitoring skipped", error=error
+        )
         return
 
+    keep_alive = f"{_get_keep_alive_seconds(config)}s"
+    parent_span = getattr(TRACE_LOCAL, "span", None)
+    futures = [
+        MONITOR_EXECUTOR.submit(
+            _monitor_camera, config, settings, keep_alive, camera, parent_span
+        )
+        for camera in cameras
+    ]
     had_success = False
     had_timeout = False
-    for camera in cameras:
-        payload = {
-            "host": settings["host"],
-            "port": settings["port"],
-            "model": settings["model"],
-            "prompt": settings["prompt"],
-            "trigger": settings["trigger"],
-            "timeoutSeconds": settings["timeoutSeconds"],
-            "streamUrl": camera.get("streamUrl", ""),
-            "previewUrl": camera.get("previewUrl", ""),
-            "previewMode": camera.get("previewMode", "mjpeg"),
-            "cameraId": camera.get("id", ""),
-            "cameraName": camera.get("name", ""),
-            "cameraModel": camera.get("model", ""),
-        }
-        result, _status = ollama_analyze_payload(payload)
+    for future in futures:
+        result = future.result()
         if result.get("ok"):
             had_success = True
-            if result.get("triggered"):
-                email_payload, email_error = _build_email_payload(
-                    config,
-                    {
-                        "event": "fall_detected",
-                        "subject": "Fall Detector Alert",
-                        "response_text": result.get("response", ""),
-                        "image_b64": result.get("image", ""),
-                        "image_type": result.get("image_type", ""),
-                        "camera_name": camera.get("name", ""),
-                        "camera_model": camera.get("model", ""),
-                    },
-                )
-                if email_payload:
-                    send_email_alert_payload(email_payload)
-                elif email_error and email_error != "Email alerts disabled.":
-                    print(f"Email alert skipped: {email_error}", file=sys.stderr)
         else:
             message = str(result.get("error", "")).lower()
             if "timed out" in message or "timeout" in message:
                 had_timeout = True
 
     now = time.time()
+    disarmed = False
     _update_monitor_state(last_run=now)
+    if had_success:
+        with READINESS_LOCK:
+            first_cycle = READINESS["first_cycle_seconds"] is None
+            if first_cycle:
+                READINESS["first_cycle_seconds"] = now - PROCESS_STARTED_AT
+        if first_cycle:
+            metric_set("falldetector_first_cycle_seconds", now - PROCESS_STARTED_AT)
+            log_event(
+                logging.INFO,
+                "monitor",
+                "First monitor cycle completed",
+                since_start=round(now - PROCESS_STARTED_AT, 3),
+                cameras=len(cameras),
+            )
     with MONITOR_LOCK:
         if had_timeout:
             MONITOR_STATE["consecutive_timeouts"] += 1
@@ -533,32 +4617,844 @@ def _run_monitor_cycle(config):
                 SERVER_STATE["armed"] = False
                 SERVER_STATE["armed_at"] = 0
                 SERVER_STATE["armed_by"] = ""
-            print(error, file=sys.stderr)
+            log_event(logging.ERROR, "monitor", error)
+            disarmed = True
+    if disarmed:
+        save_server_state()
+        cluster_publish("state", {"armed": False, "armed_at": 0, "armed_by": ""})
 
 
 def _monitor_loop():
-    next_run = 0
+    next_runs = {}
+    last_runs = {}
     while not MONITOR_STOP.is_set():
         with STATE_LOCK:
             armed = SERVER_STATE["armed"]
             config = copy.deepcopy(SERVER_STATE.get("config") or {})
         if not armed:
             _update_monitor_state(running=False)
+            next_runs.clear()
+            last_runs.clear()
             time.sleep(0.5)
             continue
+        if not WARMUP_DONE.wait(0.5):
+            continue
         _update_monitor_state(running=True)
-        interval_seconds = _get_monitor_interval_seconds(config)
+        cameras = _get_monitor_cameras(config)
+        if _cluster_store() is not None:
+            cameras = cluster_filter_cameras(cameras)
+            if not cameras:
+                time.sleep(0.5)
+                continue
+        keys = [_get_camera_key(camera) for camera in cameras] or [""]
+        with MONITOR_LOCK:
+            reschedule = set(MONITOR_RESCHEDULE)
+            MONITOR_RESCHEDULE.clear()
+        for key in [key for key in last_runs if key not in keys]:
+            del last_runs[key]
+            next_runs.pop(key, None)
+        if "*" in reschedule:
+            for camera in cameras:
+                key = _get_camera_key(camera)
+                if key in last_runs:
+                    next_runs[key] = last_runs[key] + _get_camera_interval_seconds(
+                        config, camera
+                    )
+            if not cameras and "" in last_runs:
+                next_runs[""] = last_runs[""] + _get_monitor_interval_seconds(config)
+        for key in reschedule:
+            next_runs.pop(key, None)
         now = time.time()
-        if now < next_run:
-            time.sleep(min(0.5, next_run - now))
+        due_keys = {key for key in keys if next_runs.get(key, 0) <= now}
+        if not due_keys:
+            next_run = min(next_runs.get(key, 0) for key in keys)
+            time.sleep(max(0.0, min(0.5, next_run - now)))
             continue
+        due = [camera for camera in cameras if _get_camera_key(camera) in due_keys]
         try:
-            _run_monitor_cycle(config)
+            _run_monitor_cycle(config, due if cameras else None)
         except Exception as exc:  # pylint: disable=broad-except
             message = str(exc)
             _update_monitor_state(last_error=message, last_error_at=time.time())
-            print(f"Monitoring error: {message}", file=sys.stderr)
-        next_run = time.time() + interval_seconds
+            log_event(logging.ERROR, "monitor", "Monitoring error", error=message)
+        finished = time.time()
+        if not cameras:
+            last_runs[""] = finished
+            next_runs[""] = finished + _get_monitor_interval_seconds(config)
+        for camera in due:
+            last_runs[_get_camera_key(camera)] = finished
+            next_runs[_get_camera_key(camera)] = (
+                finished + _get_camera_interval_seconds(config, camera)
+            )
+
+
+def _get_configured_cameras(config):
+    cameras = config.get("cameras")
+    if not isinstance(cameras, list) or not cameras:
+        cameras = [config.get("camera")]
+    return {
+        _get_camera_key(camera): camera
+        for camera in cameras
+        if isinstance(camera, dict) and _get_camera_key(camera)
+    }
+
+
+def _get_camera_urls(camera):
+    urls = set(resolve_camera_streams(camera).values())
+    urls.add(str(camera.get("previewUrl", "") or "").strip())
+    urls.discard("")
+    return urls
+
+
+def diff_config(old, new):
+    old_cameras = _get_configured_cameras(old)
+    new_cameras = _get_configured_cameras(new)
+    cameras = {"added": [], "removed": [], "capture": [], "settings": []}
+    for key, camera in new_cameras.items():
+        previous = old_cameras.get(key)
+        if previous is None:
+            cameras["added"].append(key)
+        elif any(
+            previous.get(field) != camera.get(field) for field in CONFIG_CAPTURE_KEYS
+        ):
+            cameras["capture"].append(key)
+        elif previous != camera:
+            cameras["settings"].append(key)
+    cameras["removed"] = [key for key in old_cameras if key not in new_cameras]
+    old_monitored = {_get_camera_key(camera) for camera in _get_monitor_cameras(old)}
+    new_monitored = {_get_camera_key(camera) for camera in _get_monitor_cameras(new)}
+    old_ollama = old.get("ollama") if isinstance(old.get("ollama"), dict) else {}
+    new_ollama = new.get("ollama") if isinstance(new.get("ollama"), dict) else {}
+    changed = {
+        key
+        for key in set(old_ollama) | set(new_ollama)
+        if old_ollama.get(key) != new_ollama.get(key)
+    }
+    ollama = {
+        "connection": bool(changed & set(CONFIG_OLLAMA_CONNECTION_KEYS)),
+        "model": "model" in changed,
+        "schedule": bool(changed & set(CONFIG_OLLAMA_SCHEDULE_KEYS)),
+        "inference": bool(
+            changed
+            - set(CONFIG_OLLAMA_CONNECTION_KEYS)
+            - set(CONFIG_OLLAMA_SCHEDULE_KEYS)
+            - {"model"}
+        ),
+    }
+    sections = sorted(
+        key
+        for key in set(old) | set(new)
+        if key not in CONFIG_CAMERA_KEYS
+        and key not in ("ollama", "savedAt")
+        and old.get(key) != new.get(key)
+    )
+    monitoring = {
+        "started": sorted(new_monitored - old_monitored),
+        "stopped": sorted(old_monitored - new_monitored),
+    }
+    alerts = any(key in CONFIG_ALERT_KEYS for key in sections)
+    if any(cameras.values()) or any(monitoring.values()):
+        impact = "cameras"
+    elif any(ollama.values()):
+        impact = "ollama"
+    elif alerts:
+        impact = "alerts"
+    elif sections:
+        impact = "other"
+    else:
+        impact = "none"
+    return {
+        "impact": impact,
+        "cameras": cameras,
+        "monitoring": monitoring,
+        "ollama": ollama,
+        "alerts": alerts,
+        "sections": sections,
+    }
+
+
+def apply_config_changes(old, new, changes):
+    old_cameras = _get_configured_cameras(old)
+    new_cameras = _get_configured_cameras(new)
+    cameras = changes["cameras"]
+    rebuilt = cameras["removed"] + cameras["capture"]
+    applied = {
+        "streams_stopped": [],
+        "readers_stopped": 0,
+        "rescheduled": [],
+        "health_dropped": 0,
+        "preload": False,
+    }
+    live_urls = set()
+    for camera in new_cameras.values():
+        live_urls |= _get_camera_urls(camera)
+    stale_urls = set()
+    for key in rebuilt:
+        stale_urls |= _get_camera_urls(old_cameras[key]) - live_urls
+
+    stopped = []
+    with STREAMS_LOCK:
+        for key in rebuilt:
+            stream = STREAMS.get(key)
+            camera = new_cameras.get(key)
+            if stream is None:
+                continue
+            if camera is not None and _get_stream_source(camera) == (
+                stream["kind"],
+                stream["url"],
+            ):
+                continue
+            del STREAMS[key]
+            stopped.append(stream)
+            applied["streams_stopped"].append(key)
+    for stream in stopped:
+        stream["stop"].set()
+        with stream["cond"]:
+            stream["cond"].notify_all()
+
+    with FFMPEG_LOCK:
+        readers = [
+            FFMPEG_READERS.pop(url) for url in stale_urls if url in FFMPEG_READERS
+        ]
+    for reader in readers:
+        reader["stop"].set()
+        reader["process"].kill()
+    applied["readers_stopped"] = len(readers)
+    with FRAME_RINGS_LOCK:
+        for url in stale_urls:
+            FRAME_RINGS.pop(url, None)
+    with ADAPTIVE_LOCK:
+        for key in rebuilt:
+            ADAPTIVE_STATE.pop(key, None)
+    with VERDICT_LOCK:
+        for cache_key in [key for key in VERDICT_CACHE if key[0][0] in rebuilt]:
+            del VERDICT_CACHE[cache_key]
+
+    reschedule = set(cameras["added"] + cameras["capture"])
+    reschedule |= set(changes["monitoring"]["started"])
+    if changes["ollama"]["schedule"]:
+        reschedule.add("*")
+    if reschedule:
+        with MONITOR_LOCK:
+            MONITOR_RESCHEDULE.update(reschedule)
+        applied["rescheduled"] = sorted(reschedule)
+
+    old_keys = set(_get_configured_health_keys(old))
+    dropped = old_keys - set(_get_configured_health_keys(new))
+    with HEALTH_LOCK:
+        for cache_key in dropped:
+            if HEALTH_CACHE.pop(cache_key, None) is not None:
+                applied["health_dropped"] += 1
+
+    with STATE_LOCK:
+        armed = SERVER_STATE["armed"]
+    if armed and (changes["ollama"]["connection"] or changes["ollama"]["model"]):
+        start_model_preload(new)
+        applied["preload"] = True
+    return applied
+
+
+def save_server_state():
+    if not STATE_FILE or not STATE_PERSIST["enabled"]:
+        return False
+    temp_path = f"{STATE_FILE}.tmp"
+    try:
+        with STATE_FILE_LOCK:
+            with STATE_LOCK:
+                snapshot = {
+                    "version": 1,
+                    "saved_at": time.time(),
+                    "armed": SERVER_STATE["armed"],
+                    "armed_at": SERVER_STATE["armed_at"],
+                    "armed_by": SERVER_STATE["armed_by"],
+                    "config": copy.deepcopy(SERVER_STATE.get("config") or {}),
+                }
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(snapshot, handle)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, STATE_FILE)
+    except OSError as exc:
+        log_event(
+            logging.ERROR,
+            "state",
+            "Failed to save state file",
+            path=STATE_FILE,
+            error=str(exc),
+        )
+        return False
+    return True
+
+
+def load_server_state():
+    if not STATE_FILE or not os.path.exists(STATE_FILE):
+        return False
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as handle:
+            snapshot = json.load(handle)
+    except (OSError, ValueError) as exc:
+        log_event(
+            logging.ERROR,
+            "state",
+            "Failed to load state file",
+            path=STATE_FILE,
+            error=str(exc),
+        )
+        return False
+    config = snapshot.get("config")
+    if not isinstance(config, dict):
+        return False
+    armed = bool(snapshot.get("armed"))
+    with STATE_LOCK:
+        SERVER_STATE["config"] = config
+        SERVER_STATE["armed"] = armed
+        SERVER_STATE["armed_at"] = time.time() if armed else 0
+        SERVER_STATE["armed_by"] = str(snapshot.get("armed_by", "")) if armed else ""
+    log_event(
+        logging.INFO,
+        "state",
+        "Restored state file",
+        path=STATE_FILE,
+        armed=armed,
+        cameras=len(_get_monitor_cameras(config)),
+        saved_at=snapshot.get("saved_at"),
+    )
+    return True
+
+
+def _set_readiness(component, status, started_at=None, error=""):
+    with READINESS_LOCK:
+        entry = READINESS["components"].setdefault(component, {})
+        entry["status"] = status
+        entry["error"] = error
+        if started_at is not None:
+            entry["seconds"] = time.time() - started_at
+
+
+def _warm_camera(camera):
+    streams = resolve_camera_streams(camera)
+    capture, capture_url = _get_capture_source(streams, camera)
+    if not capture_url:
+        raise RuntimeError("No capture URL configured")
+    return bool(
+        capture_with_substream_fallback(capture, capture_url, streams["main"])
+    )
+
+
+def _warm_component(name, func, *args):
+    started_at = time.time()
+    try:
+        if func(*args):
+            _set_readiness(name, "ready", started_at)
+        else:
+            _set_readiness(name, "failed", started_at, "Warm-up returned no result")
+    except Exception as exc:  # pylint: disable=broad-except
+        _set_readiness(name, "failed", started_at, str(exc))
+
+
+def warm_start():
+    started_at = time.time()
+    with STATE_LOCK:
+        config = copy.deepcopy(SERVER_STATE.get("config") or {})
+        armed = SERVER_STATE["armed"]
+    jobs = {}
+    executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="warmup")
+    settings, _error = _get_ollama_settings(config)
+    if armed and settings:
+        keep_alive = f"{_get_keep_alive_seconds(config)}s"
+        name = f"model:{settings['model']}@{settings['host']}:{settings['port']}"
+        _set_readiness(name, "pending")
+        jobs[name] = executor.submit(
+            _warm_component,
+            name,
+            preload_model,
+            settings["host"],
+            settings["port"],
+            settings["model"],
+            keep_alive,
+        )
+    cameras = cluster_filter_cameras(_get_monitor_cameras(config)) if armed else []
+    for camera in cameras:
+        name = f"camera:{_get_camera_key(camera)}"
+        _set_readiness(name, "pending")
+        jobs[name] = executor.submit(_warm_component, name, _warm_camera, camera)
+    for name, future in jobs.items():
+        remaining = max(0.0, started_at + WARMUP_TIMEOUT_SECONDS - time.time())
+        try:
+            future.result(timeout=remaining)
+        except FutureTimeoutError:
+            _set_readiness(name, "timeout", started_at, "Warm-up deadline exceeded")
+    executor.shutdown(wait=False)
+    with READINESS_LOCK:
+        READINESS["warmup_seconds"] = time.time() - started_at
+        components = dict(READINESS["components"])
+    WARMUP_DONE.set()
+    log_event(
+        logging.INFO,
+        "state",
+        "Warm-up finished",
+        seconds=round(time.time() - started_at, 3),
+        since_start=round(time.time() - PROCESS_STARTED_AT, 3),
+        components={name: item["status"] for name, item in components.items()},
+    )
+
+
+def start_warm_start():
+    STATE_PERSIST["enabled"] = True
+    load_server_state()
+    start_cluster()
+    WARMUP_DONE.clear()
+    threading.Thread(target=warm_start, daemon=True).start()
+
+
+def get_readiness_snapshot():
+    with READINESS_LOCK:
+        components = {
+            name: dict(item) for name, item in READINESS["components"].items()
+        }
+        snapshot = {
+            "ready": WARMUP_DONE.is_set(),
+            "degraded": any(
+                item["status"] != "ready" for item in components.values()
+            ),
+            "uptime": time.time() - PROCESS_STARTED_AT,
+            "warmup_seconds": READINESS["warmup_seconds"],
+            "first_cycle_seconds": READINESS["first_cycle_seconds"],
+            "components": components,
+        }
+    with STATE_LOCK:
+        snapshot["armed"] = SERVER_STATE["armed"]
+    return snapshot
+
+
+class ClusterStore:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(
+            path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(CLUSTER_SCHEMA)
+
+    def _transaction(self, func, *args):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(*args)
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            return result
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def heartbeat(self, instance_id, url, active, status):
+        self._transaction(
+            self.conn.execute,
+            "INSERT INTO instances (id, url, started_at, heartbeat_at, active, status)"
+            " VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET"
+            " url = excluded.url, heartbeat_at = excluded.heartbeat_at,"
+            " active = excluded.active, status = excluded.status",
+            (
+                instance_id,
+                url,
+                PROCESS_STARTED_AT,
+                time.time(),
+                int(active),
+                json.dumps(status),
+            ),
+        )
+
+    def sync_leases(self, instance_id, camera_keys, lease_seconds, active):
+        return self._transaction(
+            self._sync_leases, instance_id, camera_keys, lease_seconds, active
+        )
+
+    def _sync_leases(self, instance_id, camera_keys, lease_seconds, active):
+        now = time.time()
+        execute = self.conn.execute
+        if camera_keys:
+            marks = ",".join("?" * len(camera_keys))
+            execute(
+                f"DELETE FROM leases WHERE camera_key NOT IN ({marks})",
+                tuple(camera_keys),
+            )
+        else:
+            execute("DELETE FROM leases")
+        execute(
+            "DELETE FROM instances WHERE heartbeat_at < ?",
+            (now - lease_seconds * CLUSTER_FORGET_LEASES,),
+        )
+        if not active:
+            execute("DELETE FROM leases WHERE instance_id = ?", (instance_id,))
+            return set()
+        execute(
+            "UPDATE leases SET expires_at = ? WHERE instance_id = ?",
+            (now + lease_seconds, instance_id),
+        )
+        live = {
+            row[0]
+            for row in execute(
+                "SELECT id FROM instances WHERE active = 1 AND heartbeat_at >= ?",
+                (now - lease_seconds,),
+            )
+        }
+        live.add(instance_id)
+        owners = {
+            row[0]: row[1]
+            for row in execute(
+                "SELECT camera_key, instance_id FROM leases WHERE expires_at >= ?",
+                (now,),
+            )
+            if row[1] in live
+        }
+        counts = collections.Counter(owners.values())
+        target = math.ceil(len(camera_keys) / len(live))
+        claimed = []
+        for key in sorted(camera_keys):
+            if counts[instance_id] >= target:
+                break
+            if key not in owners:
+                claimed.append(key)
+                counts[instance_id] += 1
+        for key in sorted(camera_keys):
+            if counts[instance_id] >= target:
+                break
+            owner = owners.get(key)
+            if owner and owner != instance_id and counts[owner] > target:
+                claimed.append(key)
+                counts[owner] -= 1
+                counts[instance_id] += 1
+        for key in claimed:
+            execute(
+                "INSERT INTO leases (camera_key, instance_id, expires_at, acquired_at)"
+                " VALUES (?, ?, ?, ?) ON CONFLICT(camera_key) DO UPDATE SET"
+                " instance_id = excluded.instance_id,"
+                " expires_at = excluded.expires_at,"
+                " acquired_at = excluded.acquired_at",
+                (key, instance_id, now + lease_seconds, now),
+            )
+        return {
+            row[0]
+            for row in execute(
+                "SELECT camera_key FROM leases WHERE instance_id = ?", (instance_id,)
+            )
+        }
+
+    def leave(self, instance_id):
+        def leave():
+            execute = self.conn.execute
+            execute("DELETE FROM leases WHERE instance_id = ?", (instance_id,))
+            execute("DELETE FROM instances WHERE id = ?", (instance_id,))
+
+        self._transaction(leave)
+
+    def publish(self, key, value, instance_id):
+        def publish():
+            self.conn.execute(
+                "INSERT INTO shared (key, value, version, updated_by, updated_at)"
+                " VALUES (?, ?, 1, ?, ?) ON CONFLICT(key) DO UPDATE SET"
+                " value = excluded.value, version = shared.version + 1,"
+                " updated_by = excluded.updated_by,"
+                " updated_at = excluded.updated_at",
+                (key, json.dumps(value), instance_id, time.time()),
+            )
+            return self.conn.execute(
+                "SELECT version FROM shared WHERE key = ?", (key,)
+            ).fetchone()[0]
+
+        return self._transaction(publish)
+
+    def read_shared(self):
+        return {
+            row[0]: (json.loads(row[1]), row[2])
+            for row in self._query("SELECT key, value, version FROM shared")
+        }
+
+    def append_response(self, instance_id, entry):
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO responses (instance_id, timestamp, data) VALUES (?, ?, ?)",
+                (instance_id, entry["timestamp"], json.dumps(entry)),
+            )
+
+    def read_responses(self, after, instance_id, limit):
+        return [
+            (row[0], row[1], json.loads(row[2]))
+            for row in self._query(
+                "SELECT rowid, instance_id, data FROM responses"
+                " WHERE rowid > ? AND instance_id != ? ORDER BY rowid LIMIT ?",
+                (after, instance_id, limit),
+            )
+        ]
+
+    def prune_responses(self, cutoff):
+        with self.lock:
+            self.conn.execute("DELETE FROM responses WHERE timestamp < ?", (cutoff,))
+
+    def snapshot(self):
+        leases = collections.defaultdict(list)
+        for key, owner, expires_at in self._query(
+            "SELECT camera_key, instance_id, expires_at FROM leases ORDER BY camera_key"
+        ):
+            leases[owner].append({"camera": key, "expires_at": expires_at})
+        return [
+            {
+                "id": row[0],
+                "url": row[1],
+                "started_at": row[2],
+                "heartbeat_at": row[3],
+                "active": bool(row[4]),
+                "status": json.loads(row[5] or "{}"),
+                "cameras": leases.get(row[0], []),
+            }
+            for row in self._query(
+                "SELECT id, url, started_at, heartbeat_at, active, status"
+                " FROM instances ORDER BY id"
+            )
+        ]
+
+
+def _cluster_store():
+    return CLUSTER_STATE["store"]
+
+
+def cluster_publish(key, value):
+    store = _cluster_store()
+    if store is None:
+        return
+    try:
+        version = store.publish(key, value, CLUSTER_INSTANCE_ID)
+    except sqlite3.Error as exc:
+        log_event(
+            logging.ERROR,
+            "cluster",
+            "Failed to publish shared state",
+            rate_key=f"cluster-publish:{key}",
+            key=key,
+            error=str(exc),
+        )
+        return
+    with CLUSTER_LOCK:
+        CLUSTER_STATE["versions"][key] = version
+
+
+def cluster_publish_response(entry):
+    store = _cluster_store()
+    if store is None or entry.get("instance"):
+        return
+    try:
+        store.append_response(CLUSTER_INSTANCE_ID, entry)
+    except sqlite3.Error as exc:
+        log_event(
+            logging.ERROR,
+            "cluster",
+            "Failed to publish response",
+            rate_key="cluster-response",
+            error=str(exc),
+        )
+
+
+def cluster_filter_cameras(cameras):
+    if _cluster_store() is None:
+        return cameras
+    with CLUSTER_LOCK:
+        if time.time() - CLUSTER_STATE["last_sync"] > CLUSTER_LEASE_SECONDS:
+            return []
+        owned = set(CLUSTER_STATE["owned"])
+    return [camera for camera in cameras if _get_camera_key(camera) in owned]
+
+
+def _cluster_apply_shared(store):
+    shared = store.read_shared()
+    with CLUSTER_LOCK:
+        versions = dict(CLUSTER_STATE["versions"])
+        CLUSTER_STATE["versions"].update(
+            {key: version for key, (_value, version) in shared.items()}
+        )
+    if "config" not in shared:
+        with STATE_LOCK:
+            config = copy.deepcopy(SERVER_STATE.get("config") or {})
+            state = {
+                "armed": SERVER_STATE["armed"],
+                "armed_at": SERVER_STATE["armed_at"],
+                "armed_by": SERVER_STATE["armed_by"],
+            }
+        if config:
+            cluster_publish("config", config)
+            cluster_publish("state", state)
+    elif shared["config"][1] > versions.get("config", 0):
+        config = shared["config"][0]
+        with STATE_LOCK:
+            previous = SERVER_STATE.get("config") or {}
+            SERVER_STATE["config"] = config
+        changes = diff_config(previous, config)
+        apply_config_changes(previous, config, changes)
+        save_server_state()
+        log_event(
+            logging.INFO,
+            "cluster",
+            "Applied shared config",
+            version=shared["config"][1],
+            impact=changes["impact"],
+        )
+    if "state" in shared and shared["state"][1] > versions.get("state", 0):
+        state = shared["state"][0]
+        armed = bool(state.get("armed"))
+        with STATE_LOCK:
+            was_armed = SERVER_STATE["armed"]
+            SERVER_STATE["armed"] = armed
+            SERVER_STATE["armed_at"] = state.get("armed_at", 0) if armed else 0
+            SERVER_STATE["armed_by"] = state.get("armed_by", "") if armed else ""
+            config = copy.deepcopy(SERVER_STATE.get("config") or {})
+        if armed and not was_armed:
+            start_model_preload(config)
+        save_server_state()
+
+
+def _cluster_import_responses(store):
+    while True:
+        with CLUSTER_LOCK:
+            cursor = CLUSTER_STATE["response_cursor"]
+        rows = store.read_responses(cursor, CLUSTER_INSTANCE_ID, CLUSTER_IMPORT_BATCH)
+        for _rowid, instance_id, entry in rows:
+            store_response({**entry, "instance": instance_id})
+        if rows:
+            with CLUSTER_LOCK:
+                CLUSTER_STATE["response_cursor"] = rows[-1][0]
+        if len(rows) < CLUSTER_IMPORT_BATCH:
+            return
+
+
+def _cluster_tick(store):
+    _cluster_apply_shared(store)
+    with STATE_LOCK:
+        armed = SERVER_STATE["armed"]
+        config = copy.deepcopy(SERVER_STATE.get("config") or {})
+    with MONITOR_LOCK:
+        status = {
+            "running": MONITOR_STATE["running"],
+            "last_run": MONITOR_STATE["last_run"],
+            "last_success": MONITOR_STATE["last_success"],
+            "last_error": MONITOR_STATE["last_error"],
+        }
+    store.heartbeat(CLUSTER_INSTANCE_ID, CLUSTER_INSTANCE_URL, armed, status)
+    keys = sorted({_get_camera_key(camera) for camera in _get_monitor_cameras(config)})
+    owned = store.sync_leases(CLUSTER_INSTANCE_ID, keys, CLUSTER_LEASE_SECONDS, armed)
+    now = time.time()
+    with CLUSTER_LOCK:
+        previous = CLUSTER_STATE["owned"]
+        if now - CLUSTER_STATE["last_sync"] > CLUSTER_LEASE_SECONDS:
+            previous = set()
+        CLUSTER_STATE["owned"] = owned
+        CLUSTER_STATE["last_sync"] = now
+        CLUSTER_STATE["error"] = ""
+        prune = now - CLUSTER_STATE["pruned_at"] >= 60
+        if prune:
+            CLUSTER_STATE["pruned_at"] = now
+    gained = owned - previous
+    lost = previous - owned
+    if gained:
+        with MONITOR_LOCK:
+            MONITOR_RESCHEDULE.update(gained)
+    if gained or lost:
+        log_event(
+            logging.INFO,
+            "cluster",
+            "Camera leases changed",
+            gained=sorted(gained),
+            lost=sorted(lost),
+            owned=len(owned),
+        )
+    metric_set("falldetector_cluster_cameras_owned", len(owned))
+    _cluster_import_responses(store)
+    if prune:
+        store.prune_responses(now - RETENTION_SECONDS)
+
+
+def _cluster_loop():
+    store = _cluster_store()
+    while not CLUSTER_STOP.wait(CLUSTER_LEASE_SECONDS / 3):
+        try:
+            _cluster_tick(store)
+        except Exception as exc:
+            with CLUSTER_LOCK:
+                CLUSTER_STATE["error"] = str(exc)
+            log_event(
+                logging.ERROR,
+                "cluster",
+                "Cluster sync failed",
+                rate_key="cluster-sync",
+                error=str(exc),
+                error_type=type(exc).__name__,
+            )
+
+
+def start_cluster():
+    global CLUSTER_THREAD
+    if not CLUSTER_DB or _cluster_store() is not None:
+        return
+    store = ClusterStore(CLUSTER_DB)
+    CLUSTER_STATE["store"] = store
+    _cluster_tick(store)
+    log_event(
+        logging.INFO,
+        "cluster",
+        "Joined cluster",
+        instance=CLUSTER_INSTANCE_ID,
+        path=CLUSTER_DB,
+        owned=len(CLUSTER_STATE["owned"]),
+    )
+    CLUSTER_STOP.clear()
+    CLUSTER_THREAD = threading.Thread(target=_cluster_loop, daemon=True)
+    CLUSTER_THREAD.start()
+    atexit.register(stop_cluster)
+
+
+def stop_cluster():
+    store = _cluster_store()
+    if store is None:
+        return
+    CLUSTER_STOP.set()
+    if CLUSTER_THREAD:
+        CLUSTER_THREAD.join(timeout=2)
+    try:
+        store.leave(CLUSTER_INSTANCE_ID)
+    except sqlite3.Error:
+        pass
+    with CLUSTER_LOCK:
+        CLUSTER_STATE["owned"] = set()
+
+
+def get_cluster_snapshot():
+    store = _cluster_store()
+    if store is None:
+        return {"enabled": False}
+    now = time.time()
+    try:
+        instances = store.snapshot()
+    except sqlite3.Error as exc:
+        instances = []
+        with CLUSTER_LOCK:
+            CLUSTER_STATE["error"] = str(exc)
+    for instance in instances:
+        instance["alive"] = now - instance["heartbeat_at"] <= CLUSTER_LEASE_SECONDS
+    with CLUSTER_LOCK:
+        return {
+            "enabled": True,
+            "instance": CLUSTER_INSTANCE_ID,
+            "lease_seconds": CLUSTER_LEASE_SECONDS,
+            "owned": sorted(CLUSTER_STATE["owned"]),
+            "last_sync": CLUSTER_STATE["last_sync"],
+            "error": CLUSTER_STATE["error"],
+            "instances": instances,
+        }
 
 
 def start_monitor_thread():
@@ -580,14 +5476,91 @@ def stop_monitor_thread():
         thread.join(timeout=2)
 
 
+def _admission_bucket_locked(client, route, limits, now):
+    key = (client, route)
+    bucket = ADMISSION_STATE["buckets"].get(key)
+    if bucket is None:
+        bucket = [float(limits["burst"]), now]
+        ADMISSION_STATE["buckets"][key] = bucket
+    ADMISSION_STATE["buckets"].move_to_end(key)
+    while len(ADMISSION_STATE["buckets"]) > ADMISSION_MAX_CLIENTS:
+        ADMISSION_STATE["buckets"].popitem(last=False)
+    bucket[0] = min(limits["burst"], bucket[0] + (now - bucket[1]) * limits["rate"])
+    bucket[1] = now
+    return bucket
+
+
+def admission_acquire(route, client):
+    limits = ADMISSION_ROUTES.get(route)
+    if limits is None:
+        return True, "", 0
+    now = time.time()
+    with ADMISSION_LOCK:
+        stats = ADMISSION_STATE["routes"].setdefault(
+            route, {"active": 0, "admitted": 0, "rejected": 0}
+        )
+        bucket = _admission_bucket_locked(client, route, limits, now)
+        if bucket[0] < 1:
+            reason = "rate"
+            retry_after = max(1, math.ceil((1 - bucket[0]) / limits["rate"]))
+        elif stats["active"] >= limits["concurrency"]:
+            reason = "concurrency"
+            retry_after = 1
+        else:
+            bucket[0] -= 1
+            stats["active"] += 1
+            stats["admitted"] += 1
+            return True, "", 0
+        stats["rejected"] += 1
+    metric_inc("falldetector_http_rejected_total", route=route, reason=reason)
+    log_event(
+        logging.WARNING,
+        "http",
+        "Request rejected by admission control",
+        route=route,
+        client=client,
+        reason=reason,
+        retry_after=retry_after,
+        rate_key=f"{route}-{client}-{reason}",
+    )
+    return False, reason, retry_after
+
+
+def admission_release(route):
+    with ADMISSION_LOCK:
+        stats = ADMISSION_STATE["routes"].get(route)
+        if stats is not None:
+            stats["active"] = max(0, stats["active"] - 1)
+
+
+def get_admission_snapshot():
+    with ADMISSION_LOCK:
+        return {
+            "routes": {
+                route: {
+                    **limits,
+                    **ADMISSION_STATE["routes"].get(
+                        route, {"active": 0, "admitted": 0, "rejected": 0}
+                    ),
+                }
+                for route, limits in ADMISSION_ROUTES.items()
+            },
+            "clients": len(ADMISSION_STATE["buckets"]),
+            "monitor_queue_reserve": INFERENCE_MONITOR_RESERVE,
+        }
+
+
 class RequestHandler(SimpleHTTPRequestHandler):
     def _get_client_ip(self):
+        peer = self.client_address[0] if hasattr(self, "client_address") else ""
+        if peer not in TRUSTED_PROXIES:
+            return peer
         forwarded = self.headers.get("X-Forwarded-For", "")
-        if forwarded:
-            return forwarded.split(",")[0].strip()
-        if hasattr(self, "client_address"):
-            return self.client_address[0]
-        return ""
+        for address in reversed(forwarded.split(",")):
+            address = address.strip()
+            if address and address not in TRUSTED_PROXIES:
+                return address
+        return peer
 
     def _log_browser_details(self, name, action):
         ip_addr = self._get_client_ip()
@@ -597,22 +5570,18 @@ class RequestHandler(SimpleHTTPRequestHandler):
         sec_platform = self.headers.get("Sec-CH-UA-Platform", "")
         origin = self.headers.get("Origin", "")
         referer = self.headers.get("Referer", "")
-        details = [
-            f"{action}: name={name}",
-            f"ip={ip_addr}",
-            f"ua={user_agent}",
-        ]
+        details = {"name": name, "ip": ip_addr, "ua": user_agent}
         if languages:
-            details.append(f"lang={languages}")
+            details["lang"] = languages
         if sec_ch:
-            details.append(f"ch_ua={sec_ch}")
+            details["ch_ua"] = sec_ch
         if sec_platform:
-            details.append(f"platform={sec_platform}")
+            details["platform"] = sec_platform
         if origin:
-            details.append(f"origin={origin}")
+            details["origin"] = origin
         if referer:
-            details.append(f"referer={referer}")
-        print(" ".join(details), file=sys.stderr)
+            details["referer"] = referer
+        log_event(logging.INFO, "session", action, **details)
 
     def _get_session_token(self):
         token = (self.headers.get("X-Session-Token") or "").strip()
@@ -628,9 +5597,18 @@ class RequestHandler(SimpleHTTPRequestHandler):
             return _json_response(
                 self, {"ok": False, "error": "Missing session token."}, 401
             )
+        now = time.time()
+        if token == ACTIVE_SESSION["token"]:
+            session = SESSIONS.get(token)
+            idle = now - session["last_seen"] if session is not None else None
+            if idle is not None and idle < SESSION_IDLE_SECONDS:
+                session["last_seen"] = now
+                return None
         with SESSION_LOCK:
+            _prune_sessions_locked(now)
             active_token = ACTIVE_SESSION["token"]
             if token == active_token:
+                SESSIONS[token]["last_seen"] = now
                 return None
             session = SESSIONS.get(token)
             if session and session.get("status") == "kicked":
@@ -644,6 +5622,12 @@ class RequestHandler(SimpleHTTPRequestHandler):
                     },
                     403,
                 )
+            if session and session.get("status") == "expired":
+                return _json_response(
+                    self,
+                    {"ok": False, "error": "Session expired after inactivity."},
+                    401,
+                )
             if active_token:
                 active_name = SESSIONS.get(active_token, {}).get("name", "")
                 return _json_response(
@@ -666,6 +5650,8 @@ class RequestHandler(SimpleHTTPRequestHandler):
             )
         self._log_browser_details(name, "Session request")
         with SESSION_LOCK:
+            now = time.time()
+            _prune_sessions_locked(now)
             active_token = ACTIVE_SESSION["token"]
             if active_token and active_token != token:
                 active_name = SESSIONS.get(active_token, {}).get("name", "")
@@ -686,14 +5672,25 @@ class RequestHandler(SimpleHTTPRequestHandler):
                     "ip": self._get_client_ip(),
                     "user_agent": self.headers.get("User-Agent", ""),
                     "status": "active",
-                    "started_at": time.time(),
+                    "started_at": now,
+                    "last_seen": now,
+                    "ended_at": 0,
                     "kicked_by": "",
                     "kicked_at": 0,
                 }
             )
             SESSIONS[token] = session
+            SESSIONS.move_to_end(token)
             ACTIVE_SESSION["token"] = token
-        return _json_response(self, {"ok": True, "status": "accepted", "name": name})
+        return _json_response(
+            self,
+            {
+                "ok": True,
+                "status": "accepted",
+                "name": name,
+                "heartbeat_seconds": SESSION_HEARTBEAT_SECONDS,
+            },
+        )
 
     def _session_takeover(self, payload):
         name = str(payload.get("name", "")).strip()
@@ -710,6 +5707,8 @@ class RequestHandler(SimpleHTTPRequestHandler):
         self._log_browser_details(name, "Session takeover")
         previous_name = ""
         with SESSION_LOCK:
+            now = time.time()
+            _prune_sessions_locked(now)
             active_token = ACTIVE_SESSION["token"]
             if active_token and active_token != token:
                 previous = SESSIONS.get(active_token, {})
@@ -718,7 +5717,8 @@ class RequestHandler(SimpleHTTPRequestHandler):
                     {
                         "status": "kicked",
                         "kicked_by": name,
-                        "kicked_at": time.time(),
+                        "kicked_at": now,
+                        "ended_at": now,
                     }
                 )
                 SESSIONS[active_token] = previous
@@ -730,17 +5730,23 @@ class RequestHandler(SimpleHTTPRequestHandler):
                     "ip": self._get_client_ip(),
                     "user_agent": self.headers.get("User-Agent", ""),
                     "status": "active",
-                    "started_at": time.time(),
+                    "started_at": now,
+                    "last_seen": now,
+                    "ended_at": 0,
                     "kicked_by": "",
                     "kicked_at": 0,
                 }
             )
             SESSIONS[token] = session
+            SESSIONS.move_to_end(token)
             ACTIVE_SESSION["token"] = token
         if previous_name:
-            print(
-                f"Session takeover: {name} logged off {previous_name}.",
-                file=sys.stderr,
+            log_event(
+                logging.INFO,
+                "session",
+                "Session takeover",
+                name=name,
+                previous_user=previous_name,
             )
         return _json_response(
             self,
@@ -748,6 +5754,7 @@ class RequestHandler(SimpleHTTPRequestHandler):
                 "ok": True,
                 "status": "took_over",
                 "previous_user": previous_name,
+                "heartbeat_seconds": SESSION_HEARTBEAT_SECONDS,
             },
         )
 
@@ -763,7 +5770,8 @@ class RequestHandler(SimpleHTTPRequestHandler):
             session = SESSIONS.get(token)
             if session:
                 session.update({"status": "closed", "ended_at": time.time()})
-                SESSIONS[token] = session
+                SESSIONS.move_to_end(token)
+            _prune_sessions_locked(time.time())
         return _json_response(self, {"ok": True, "status": "closed"})
 
     def _state_get(self):
@@ -771,6 +5779,9 @@ class RequestHandler(SimpleHTTPRequestHandler):
             armed = SERVER_STATE["armed"]
             armed_at = SERVER_STATE["armed_at"]
             armed_by = SERVER_STATE["armed_by"]
+        with MONITOR_LOCK:
+            monitor = dict(MONITOR_STATE)
+        monitor["cameras"] = get_adaptive_snapshot()
         return _json_response(
             self,
             {
@@ -778,6 +5789,9 @@ class RequestHandler(SimpleHTTPRequestHandler):
                 "armed": armed,
                 "armed_at": armed_at,
                 "armed_by": armed_by,
+                "monitor": monitor,
+                "sessions": get_session_stats(),
+                "cluster": get_cluster_snapshot(),
             },
         )
 
@@ -785,9 +5799,20 @@ class RequestHandler(SimpleHTTPRequestHandler):
         armed = bool(payload.get("armed"))
         armed_by = str(payload.get("armed_by", "")).strip()
         with STATE_LOCK:
+            was_armed = SERVER_STATE["armed"]
             SERVER_STATE["armed"] = armed
             SERVER_STATE["armed_at"] = time.time() if armed else 0
             SERVER_STATE["armed_by"] = armed_by if armed else ""
+            config = copy.deepcopy(SERVER_STATE.get("config") or {})
+            state = {
+                "armed": armed,
+                "armed_at": SERVER_STATE["armed_at"],
+                "armed_by": SERVER_STATE["armed_by"],
+            }
+        if armed and not was_armed:
+            start_model_preload(config)
+        save_server_state()
+        cluster_publish("state", state)
         return self._state_get()
 
     def _config_get(self):
@@ -805,8 +5830,25 @@ class RequestHandler(SimpleHTTPRequestHandler):
         if not isinstance(payload, dict):
             return _json_response(self, {"ok": False, "error": "Invalid config"}, 400)
         with STATE_LOCK:
+            previous = SERVER_STATE.get("config") or {}
             SERVER_STATE["config"] = payload
-        return self._config_get()
+        save_server_state()
+        cluster_publish("config", payload)
+        changes = diff_config(previous, payload)
+        changes["applied"] = apply_config_changes(previous, payload, changes)
+        log_event(
+            logging.INFO,
+            "config",
+            "Config applied",
+            impact=changes["impact"],
+            added=len(changes["cameras"]["added"]),
+            removed=len(changes["cameras"]["removed"]),
+            capture_changed=len(changes["cameras"]["capture"]),
+            streams_stopped=len(changes["applied"]["streams_stopped"]),
+        )
+        with STATE_LOCK:
+            config = copy.deepcopy(SERVER_STATE.get("config") or {})
+        return _json_response(self, {"ok": True, "config": config, "changes": changes})
 
     def translate_path(self, path):
         path = urllib.parse.urlparse(path).path
@@ -819,29 +5861,120 @@ class RequestHandler(SimpleHTTPRequestHandler):
         client = ""
         if hasattr(self, "client_address"):
             client = f"{self.client_address[0]}:{self.client_address[1]}"
-        path = getattr(self, "path", "")
-        detail = " ".join(part for part in [client, path] if part)
-        suffix = f" ({detail})" if detail else ""
-        print(
-            f"Client disconnected before response completed.{suffix}",
-            file=sys.stderr,
+        log_event(
+            logging.INFO,
+            "http",
+            "Client disconnected before response completed",
+            client=client,
+            path=urllib.parse.urlparse(getattr(self, "path", "")).path,
         )
 
-    def do_GET(self):
-        parsed = urllib.parse.urlparse(self.path)
-        if parsed.path.startswith("/api/"):
-            return self.handle_api(parsed)
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        log_event(
+            logging.INFO,
+            "http",
+            re.sub(r"\?\S*", "", format % args),
+            client=self.address_string(),
+            status=getattr(self, "_response_status", 0),
+        )
+
+    def send_response(self, code, message=None):
+        self._response_status = code
+        super().send_response(code, message)
+
+    def _observe_request(self, parsed, started_at):
+        route = "static"
+        if parsed.path.startswith("/api/") or parsed.path == "/metrics":
+            route = parsed.path
+            if route.startswith("/api/stream/"):
+                route = "/api/stream"
+            if route.startswith("/api/evidence/"):
+                route = "/api/evidence"
+            if (
+                route not in HTTP_METRIC_ROUTES
+                or getattr(self, "_response_status", 0) == 404
+            ):
+                route = "unknown"
+        metric_observe(
+            "falldetector_http_request_seconds",
+            time.time() - started_at,
+            route=route,
+            method=self.command,
+        )
+
+    def _send_metrics(self):
+        data = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
         try:
-            return super().do_GET()
+            self.wfile.write(data)
         except BrokenPipeError:
             self._log_broken_pipe()
-            return None
+        return None
+
+    def _handle_admitted(self, parsed, handler):
+        if parsed.path in ADMISSION_ROUTES:
+            denied = self._require_active_session()
+            if denied is not None:
+                return denied
+        admitted, reason, retry_after = admission_acquire(
+            parsed.path, self._get_client_ip()
+        )
+        if not admitted:
+            message = (
+                "Too many requests from this client."
+                if reason == "rate"
+                else "Server is busy with this request type."
+            )
+            return _json_response(
+                self,
+                {
+                    "ok": False,
+                    "error": f"{message} Retry in {retry_after}s.",
+                    "retry_after": retry_after,
+                },
+                429,
+                {"Retry-After": retry_after},
+            )
+        try:
+            return handler(parsed)
+        finally:
+            admission_release(parsed.path)
+
+    def do_GET(self):
+        started_at = time.time()
+        parsed = urllib.parse.urlparse(self.path)
+        try:
+            if parsed.path == "/metrics":
+                return self._send_metrics()
+            if parsed.path == "/api/health/ready":
+                readiness = get_readiness_snapshot()
+                return _json_response(
+                    self,
+                    {"ok": readiness["ready"], **readiness},
+                    200 if readiness["ready"] else 503,
+                )
+            if parsed.path.startswith("/api/"):
+                return self._handle_admitted(parsed, self.handle_api)
+            try:
+                return super().do_GET()
+            except BrokenPipeError:
+                self._log_broken_pipe()
+                return None
+        finally:
+            self._observe_request(parsed, started_at)
 
     def do_POST(self):
+        started_at = time.time()
         parsed = urllib.parse.urlparse(self.path)
-        if parsed.path.startswith("/api/"):
-            return self.handle_api_post(parsed)
-        self.send_error(405)
+        try:
+            if parsed.path.startswith("/api/"):
+                return self._handle_admitted(parsed, self.handle_api_post)
+            self.send_error(405)
+        finally:
+            self._observe_request(parsed, started_at)
 
     def handle_api(self, parsed):
         if not parsed.path.startswith("/api/session/"):
@@ -857,7 +5990,7 @@ class RequestHandler(SimpleHTTPRequestHandler):
             url = (query.get("url") or [""])[0]
             if not url:
                 return _json_response(self, {"ok": False, "error": "Missing url"}, 400)
-            return self._check_url(url)
+            return self._send_health_check(query, "preview", url)
         if parsed.path == "/api/check-ollama":
             host = (query.get("host") or [""])[0]
             port = (query.get("port") or [""])[0]
@@ -869,16 +6002,35 @@ class RequestHandler(SimpleHTTPRequestHandler):
                 port_num = int(port)
             except ValueError:
                 return _json_response(self, {"ok": False, "error": "Invalid port"}, 400)
-            url = f"http://{host}:{port_num}/api/tags"
-            return self._check_url(url)
+            return self._send_health_check(query, "ollama", host, port_num)
         if parsed.path == "/api/rtsp-snapshot":
             rtsp = (query.get("rtsp") or [""])[0]
             if not rtsp:
                 return _json_response(self, {"ok": False, "error": "Missing rtsp"}, 400)
+            if (query.get("auto") or ["1"])[0] != "0":
+                rtsp = get_substream_url(rtsp)
             return self._snapshot_rtsp(rtsp)
+        if parsed.path == "/api/ollama-responses/export":
+            return self._export_responses(query)
         if parsed.path == "/api/ollama-responses":
-            responses = get_responses_snapshot()
-            return _json_response(self, {"ok": True, "responses": responses})
+            if not {"since", "before", "limit"} & set(query):
+                responses = get_responses_snapshot()
+                return _json_response(self, {"ok": True, "responses": responses})
+            try:
+                since = int(query["since"][0]) if "since" in query else None
+                before = int(query["before"][0]) if "before" in query else None
+                limit = int((query.get("limit") or [RESPONSE_PAGE_LIMIT])[0])
+            except ValueError:
+                return _json_response(
+                    self, {"ok": False, "error": "Invalid cursor or limit"}, 400
+                )
+            page = get_responses_page(
+                since=since,
+                before=before,
+                limit=max(1, min(limit, RESPONSE_PAGE_LIMIT)),
+                triggered_only=(query.get("triggered") or ["0"])[0] == "1",
+            )
+            return _json_response(self, {"ok": True, **page})
         if parsed.path == "/api/ollama-tags":
             host = (query.get("host") or [""])[0]
             port = (query.get("port") or [""])[0]
@@ -890,24 +6042,76 @@ class RequestHandler(SimpleHTTPRequestHandler):
                 port_num = int(port)
             except ValueError:
                 return _json_response(self, {"ok": False, "error": "Invalid port"}, 400)
-            return self._fetch_ollama_tags(host, port_num)
+            return self._send_health_check(query, "catalog", host, port_num)
+        if parsed.path == "/api/traces":
+            try:
+                limit = int((query.get("limit") or [TRACE_BUFFER_SIZE])[0])
+            except ValueError:
+                limit = TRACE_BUFFER_SIZE
+            return _json_response(
+                self,
+                {
+                    "ok": True,
+                    "sample_rate": TRACE_SETTINGS["sample_rate"],
+                    "export_path": TRACE_SETTINGS["export_path"],
+                    "traces": get_traces_snapshot(limit),
+                },
+            )
+        if parsed.path.startswith("/api/stream/") and parsed.path.endswith(".mjpeg"):
+            camera_id = urllib.parse.unquote(parsed.path[len("/api/stream/") : -6])
+            try:
+                fps = float((query.get("fps") or [STREAM_MAX_FPS])[0])
+            except ValueError:
+                fps = STREAM_MAX_FPS
+            return self._stream_mjpeg(camera_id, fps)
+        if parsed.path == "/api/evidence":
+            with EVIDENCE_LOCK:
+                clips = {
+                    response_id: {
+                        "camera_id": clip["camera_id"],
+                        "triggered_at": clip["triggered_at"],
+                        "frames": len(clip["times"]),
+                        "bytes": len(clip["data"]),
+                    }
+                    for response_id, clip in EVIDENCE_CLIPS.items()
+                }
+            return _json_response(
+                self, {"ok": True, "rings": get_frame_rings_snapshot(), "clips": clips}
+            )
+        if parsed.path.startswith("/api/evidence/"):
+            return self._send_evidence(parsed.path[len("/api/evidence/") :])
+        if parsed.path == "/api/health-cache":
+            return _json_response(self, {"ok": True, "entries": get_health_snapshot()})
+        if parsed.path == "/api/memory":
+            return _json_response(self, {"ok": True, **get_memory_snapshot()})
+        if parsed.path == "/api/streams":
+            return _json_response(self, {"ok": True, "streams": get_streams_snapshot()})
+        if parsed.path == "/api/capture-health":
+            return _json_response(
+                self,
+                {
+                    "ok": True,
+                    "cameras": get_capture_health_snapshot(),
+                    "substreams": get_substream_snapshot(),
+                    "ffmpeg": get_ffmpeg_readers_snapshot(),
+                },
+            )
+        if parsed.path == "/api/model-residency":
+            return _json_response(
+                self, {"ok": True, "backends": get_model_residency_snapshot()}
+            )
+        if parsed.path == "/api/verdict-cache":
+            return _json_response(
+                self, {"ok": True, "cache": get_verdict_cache_snapshot()}
+            )
+        if parsed.path == "/api/admission":
+            return _json_response(self, {"ok": True, **get_admission_snapshot()})
+        if parsed.path == "/api/inference-queue":
+            return _json_response(
+                self, {"ok": True, "queue": get_inference_queue_snapshot()}
+            )
         if parsed.path == "/api/ollama-pull-status":
-            with PULL_LOCK:
-                return _json_response(
-                    self,
-                    {
-                        "ok": True,
-                        "in_progress": PULL_STATE["in_progress"],
-                        "status": PULL_STATE["status"],
-                        "completed": PULL_STATE["completed"],
-                        "total": PULL_STATE["total"],
-                        "model": PULL_STATE["model"],
-                        "host": PULL_STATE["host"],
-                        "port": PULL_STATE["port"],
-                        "error": PULL_STATE["error"],
-                        "started_at": PULL_STATE["started_at"],
-                    },
-                )
+            return _json_response(self, {"ok": True, **get_pull_snapshot()})
         return _json_response(self, {"ok": False, "error": "Unknown endpoint"}, 404)
 
     def handle_api_post(self, parsed):
@@ -924,6 +6128,18 @@ class RequestHandler(SimpleHTTPRequestHandler):
         if parsed.path == "/api/session/close":
             payload = self._read_json() or {}
             return self._session_close(payload)
+        if parsed.path == "/api/session/heartbeat":
+            denied = self._require_active_session()
+            if denied is not None:
+                return denied
+            return _json_response(
+                self,
+                {
+                    "ok": True,
+                    "idle_timeout": SESSION_IDLE_SECONDS,
+                    "heartbeat_seconds": SESSION_HEARTBEAT_SECONDS,
+                },
+            )
         denied = self._require_active_session()
         if denied is not None:
             return denied
@@ -953,7 +6169,13 @@ class RequestHandler(SimpleHTTPRequestHandler):
                 return _json_response(self, {"ok": False, "error": "Invalid JSON"}, 400)
             return self._ollama_pull(payload)
         if parsed.path == "/api/ollama-pull-cancel":
-            return self._ollama_pull_cancel()
+            payload = self._read_json() or {}
+            return self._ollama_pull_cancel(payload)
+        if parsed.path == "/api/traces":
+            payload = self._read_json()
+            if payload is None:
+                return _json_response(self, {"ok": False, "error": "Invalid JSON"}, 400)
+            return self._traces_set(payload)
         return _json_response(self, {"ok": False, "error": "Unknown endpoint"}, 404)
 
     def _read_json(self):
@@ -972,27 +6194,193 @@ class RequestHandler(SimpleHTTPRequestHandler):
     def _store_response(self, entry):
         store_response(entry)
 
-    def _check_url(self, url):
+    def _send_health_check(self, query, kind, *args):
+        force = (query.get("force") or ["0"])[0] == "1"
+        payload, status = get_health_check(kind, *args, force=force)
         try:
-            req = urllib.request.Request(url, method="GET")
-            with urllib.request.urlopen(req, timeout=3) as response:
-                content_type = response.headers.get("Content-Type", "")
-                return _json_response(
-                    self,
-                    {
-                        "ok": True,
-                        "status": response.status,
-                        "content_type": content_type,
-                    },
+            return _json_response(self, payload, status)
+        except BrokenPipeError:
+            self._log_broken_pipe()
+            return None
+
+    def _stream_mjpeg(self, camera_id, fps):
+        stream = acquire_stream(camera_id)
+        if stream is None:
+            return _json_response(
+                self, {"ok": False, "error": "Unknown camera or no stream source"}, 404
+            )
+        min_gap = 1.0 / max(0.1, min(fps, STREAM_MAX_FPS))
+        last_sequence = 0
+        try:
+            self.send_response(200)
+            self.send_header(
+                "Content-Type", "multipart/x-mixed-replace; boundary=frame"
+            )
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            while True:
+                with stream["cond"]:
+                    stream["cond"].wait_for(
+                        lambda: stream["sequence"] != last_sequence
+                        or stream["stop"].is_set(),
+                        timeout=STREAM_KEEPALIVE_SECONDS,
+                    )
+                    if stream["stop"].is_set():
+                        break
+                    failing = stream["error_since"] and (
+                        time.time() - stream["error_since"]
+                        >= STREAM_ERROR_GIVEUP_SECONDS
+                    )
+                    frame = stream["frame"]
+                    last_sequence = stream["sequence"]
+                if failing:
+                    break
+                if not frame:
+                    self.wfile.write(b"\r\n")
+                    self.wfile.flush()
+                    continue
+                sent_at = time.time()
+                self.wfile.write(
+                    b"--frame\r\nContent-Type: image/jpeg\r\n"
+                    + f"Content-Length: {len(frame)}\r\n\r\n".encode("ascii")
+                    + frame
+                    + b"\r\n"
                 )
-        except Exception as exc:  # pylint: disable=broad-except
+                self.wfile.flush()
+                remaining = min_gap - (time.time() - sent_at)
+                if remaining > 0:
+                    time.sleep(remaining)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            release_stream(stream)
+            self.close_connection = True
+        return None
+
+    def _send_evidence(self, name):
+        response_id, _, kind = name.partition(".")
+        clip = get_evidence_clip(response_id)
+        if clip is None:
+            return _json_response(
+                self, {"ok": False, "error": "Unknown evidence id"}, 404
+            )
+        if kind == "jpg":
             try:
-                return _json_response(self, {"ok": False, "error": str(exc)}, 502)
-            except BrokenPipeError:
-                self._log_broken_pipe()
-                return None
+                return self._send_jpeg(build_evidence_strip(clip))
+            except Exception as exc:  # pylint: disable=broad-except
+                return _json_response(self, {"ok": False, "error": str(exc)}, 503)
+        if kind == "mjpeg":
+            return self._replay_evidence(clip)
+        return _json_response(
+            self,
+            {
+                "ok": True,
+                "id": response_id,
+                "camera_id": clip["camera_id"],
+                "triggered_at": clip["triggered_at"],
+                "frames": [
+                    {
+                        "captured_at": captured_at,
+                        "offset": captured_at - clip["triggered_at"],
+                        "bytes": len(data),
+                    }
+                    for captured_at, data in iter_evidence_frames(clip)
+                ],
+            },
+        )
+
+    def _export_responses(self, query):
+        export_format = (query.get("format") or ["ndjson"])[0]
+        if export_format not in EXPORT_FORMATS:
+            return _json_response(
+                self, {"ok": False, "error": "Format must be ndjson, csv or zip"}, 400
+            )
+        try:
+            since = _parse_export_time((query.get("since") or [""])[0])
+            until = _parse_export_time((query.get("until") or [""])[0])
+        except ValueError:
+            return _json_response(
+                self, {"ok": False, "error": "Invalid since or until"}, 400
+            )
+        cameras = {
+            camera
+            for value in query.get("camera", [])
+            for camera in value.split(",")
+            if camera
+        }
+        filters = {
+            "since": since,
+            "until": until,
+            "cameras": cameras or None,
+            "triggered_only": (query.get("triggered") or ["0"])[0] == "1",
+        }
+        content_type, extension = EXPORT_FORMATS[export_format]
+        filename = f"falldetector-responses-{time.strftime('%Y%m%d-%H%M%S')}"
+        started_at = time.time()
+        writer = _ChunkedWriter(self.wfile)
+        self.protocol_version = "HTTP/1.1"
+        self.close_connection = True
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header(
+                "Content-Disposition", f'attachment; filename="{filename}.{extension}"'
+            )
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            if export_format == "zip":
+                count = write_responses_zip(writer, filters)
+            else:
+                count = write_responses_export(writer, export_format, filters)
+            writer.close()
+        except (BrokenPipeError, ConnectionResetError):
+            self._log_broken_pipe()
+            return None
+        log_event(
+            logging.INFO,
+            "export",
+            "Responses exported",
+            format=export_format,
+            responses=count,
+            bytes=writer.written,
+            seconds=round(time.time() - started_at, 3),
+        )
+        return None
+
+    def _replay_evidence(self, clip):
+        previous_at = None
+        try:
+            self.send_response(200)
+            self.send_header(
+                "Content-Type", "multipart/x-mixed-replace; boundary=frame"
+            )
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for captured_at, frame in iter_evidence_frames(clip):
+                if previous_at is not None:
+                    time.sleep(min(2.0, max(0.0, captured_at - previous_at)))
+                previous_at = captured_at
+                self.wfile.write(
+                    b"--frame\r\nContent-Type: image/jpeg\r\n"
+                    + f"Content-Length: {len(frame)}\r\n\r\n".encode("ascii")
+                    + frame
+                    + b"\r\n"
+                )
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.close_connection = True
+        return None
 
     def _snapshot_rtsp(self, rtsp_url):
+        cached = get_stream_frame(rtsp_url)
+        if cached is not None:
+            return self._send_jpeg(cached)
         try:
             data = capture_rtsp_jpeg(rtsp_url)
         except Exception as exc:  # pylint: disable=broad-except
@@ -1002,6 +6390,9 @@ class RequestHandler(SimpleHTTPRequestHandler):
             return _json_response(
                 self, {"ok": False, "error": "Failed to read RTSP frame"}, 502
             )
+        return self._send_jpeg(data)
+
+    def _send_jpeg(self, data):
         self.send_response(200)
         self.send_header("Content-Type", "image/jpeg")
         self.send_header("Content-Length", str(len(data)))
@@ -1016,241 +6407,66 @@ class RequestHandler(SimpleHTTPRequestHandler):
 
     def _ollama_analyze(self, payload):
         result, status = ollama_analyze_payload(payload)
-        return _json_response(self, result, status)
-
-    def _fetch_ollama_tags(self, host, port_num):
-        tags_url = f"http://{host}:{port_num}/api/tags"
-        ps_url = f"http://{host}:{port_num}/api/ps"
-        print(f"Ollama tags request: {tags_url}", file=sys.stderr)
-        try:
-            req = urllib.request.Request(tags_url, method="GET")
-            with urllib.request.urlopen(req, timeout=4) as response:
-                raw = response.read().decode("utf-8")
-                tags_payload = json.loads(raw)
-        except urllib.error.HTTPError as exc:
-            detail = ""
-            try:
-                detail = exc.read().decode("utf-8")
-            except Exception:  # pylint: disable=broad-except
-                detail = ""
-            message = f"HTTP {exc.code}: {exc.reason}"
-            if detail:
-                message = f"{message} ({detail})"
-            print(f"Ollama tags fetch failed: {message}", file=sys.stderr)
-            return _json_response(self, {"ok": False, "error": message}, 502)
-        except Exception as exc:  # pylint: disable=broad-except
-            message = str(exc)
-            print(f"Ollama tags fetch failed: {message}", file=sys.stderr)
-            return _json_response(self, {"ok": False, "error": message}, 502)
-
-        running_payload = {}
-        try:
-            req = urllib.request.Request(ps_url, method="GET")
-            with urllib.request.urlopen(req, timeout=3) as response:
-                raw = response.read().decode("utf-8")
-                running_payload = json.loads(raw)
-        except Exception as exc:  # pylint: disable=broad-except
-            print(f"Ollama running models fetch skipped: {exc}", file=sys.stderr)
-
-        models = []
-        seen = set()
-        for item in tags_payload.get("models", []) or []:
-            name = item.get("name")
-            if name and name not in seen:
-                seen.add(name)
-                models.append(name)
-        running_names = []
-        for item in running_payload.get("models", []) or []:
-            name = item.get("name") or item.get("model")
-            if name and name not in seen:
-                seen.add(name)
-                models.append(name)
-            if name and name not in running_names:
-                running_names.append(name)
-        return _json_response(
-            self,
-            {
-                "ok": True,
-                "models": models,
-                "installed_models": len(tags_payload.get("models", []) or []),
-                "running_models": len(running_payload.get("models", []) or []),
-                "running_names": running_names,
-            },
-        )
+        headers = None
+        if result.get("retry_after"):
+            headers = {"Retry-After": result["retry_after"]}
+        return _json_response(self, result, status, headers)
 
     def _ollama_pull(self, payload):
-        host = str(payload.get("host", "")).strip()
-        port = payload.get("port")
         model = str(payload.get("model", "")).strip()
-        stream = bool(payload.get("stream"))
-        if not host or not model:
+        try:
+            targets = _parse_pull_targets(payload)
+        except ValueError as exc:
+            return _json_response(self, {"ok": False, "error": str(exc)}, 400)
+        if not targets or not model:
             return _json_response(
                 self, {"ok": False, "error": "Missing host or model"}, 400
             )
-        try:
-            port_num = int(port)
-        except Exception:
-            return _json_response(self, {"ok": False, "error": "Invalid port"}, 400)
-
-        with PULL_LOCK:
-            if PULL_STATE["in_progress"]:
-                return _json_response(
-                    self,
-                    {
-                        "ok": False,
-                        "error": "A model pull is already in progress.",
-                        "in_progress": True,
-                        "status": PULL_STATE["status"],
-                        "completed": PULL_STATE["completed"],
-                        "total": PULL_STATE["total"],
-                        "model": PULL_STATE["model"],
-                    },
-                    409,
-                )
-
-        if stream:
-            return self._ollama_pull_stream(host, port_num, model)
-
-        url = f"http://{host}:{port_num}/api/pull"
-        payload = {"name": model, "stream": False}
-        try:
-            req = urllib.request.Request(
-                url,
-                data=json.dumps(payload).encode("utf-8"),
-                headers={"Content-Type": "application/json"},
-                method="POST",
-            )
-            with urllib.request.urlopen(req, timeout=120) as response:
-                raw = response.read().decode("utf-8")
-                data = json.loads(raw) if raw else {}
-        except urllib.error.HTTPError as exc:
-            detail = ""
-            try:
-                detail = exc.read().decode("utf-8")
-            except Exception:  # pylint: disable=broad-except
-                detail = ""
-            message = f"HTTP {exc.code}: {exc.reason}"
-            if detail:
-                message = f"{message} ({detail})"
-            print(f"Ollama pull failed: {message}", file=sys.stderr)
-            return _json_response(self, {"ok": False, "error": message}, 502)
-        except Exception as exc:  # pylint: disable=broad-except
-            message = str(exc)
-            print(f"Ollama pull failed: {message}", file=sys.stderr)
-            return _json_response(self, {"ok": False, "error": message}, 502)
-
-        status = data.get("status") or "Pull complete."
-        return _json_response(self, {"ok": True, "message": status})
-
-    def _ollama_pull_stream(self, host, port_num, model):
-        global PULL_CANCEL, PULL_RESPONSE
-        url = f"http://{host}:{port_num}/api/pull"
-        payload = {"name": model, "stream": True}
-        try:
-            req = urllib.request.Request(
-                url,
-                data=json.dumps(payload).encode("utf-8"),
-                headers={"Content-Type": "application/json"},
-                method="POST",
-            )
-            response = urllib.request.urlopen(req, timeout=120)
-        except urllib.error.HTTPError as exc:
-            detail = ""
-            try:
-                detail = exc.read().decode("utf-8")
-            except Exception:  # pylint: disable=broad-except
-                detail = ""
-            message = f"HTTP {exc.code}: {exc.reason}"
-            if detail:
-                message = f"{message} ({detail})"
-            print(f"Ollama pull failed: {message}", file=sys.stderr)
-            return _json_response(self, {"ok": False, "error": message}, 502)
-        except Exception as exc:  # pylint: disable=broad-except
-            message = str(exc)
-            print(f"Ollama pull failed: {message}", file=sys.stderr)
-            return _json_response(self, {"ok": False, "error": message}, 502)
-
-        with PULL_LOCK:
-            PULL_STATE.update(
+        started, busy = start_model_pull(model, targets)
+        if not started:
+            return _json_response(
+                self,
                 {
-                    "in_progress": True,
-                    "status": f"Pulling {model}…",
-                    "completed": 0,
-                    "total": 0,
-                    "model": model,
-                    "host": host,
-                    "port": port_num,
-                    "error": "",
-                    "started_at": time.time(),
-                }
+                    **get_pull_snapshot(),
+                    "ok": False,
+                    "error": "A model pull is already in progress on "
+                    f"{', '.join(busy)}.",
+                },
+                409,
             )
-            PULL_CANCEL = False
-            PULL_RESPONSE = response
-
-        self.send_response(200)
-        self.send_header("Content-Type", "application/x-ndjson")
-        self.send_header("Cache-Control", "no-store")
-        self.end_headers()
+        return _json_response(
+            self,
+            {"ok": True, "started": started, "busy": busy, **get_pull_snapshot()},
+            202,
+        )
 
-        try:
-            while True:
-                if PULL_CANCEL:
-                    with PULL_LOCK:
-                        PULL_STATE.update(
-                            {
-                                "in_progress": False,
-                                "status": "Pull cancelled.",
-                                "error": "Cancelled by user.",
-                            }
-                        )
-                    break
-                line = response.readline()
-                if not line:
-                    break
-                try:
-                    payload = json.loads(line.decode("utf-8"))
-                    with PULL_LOCK:
-                        PULL_STATE["status"] = payload.get("status") or PULL_STATE["status"]
-                        if payload.get("completed") is not None:
-                            PULL_STATE["completed"] = payload.get("completed", 0)
-                        if payload.get("total") is not None:
-                            PULL_STATE["total"] = payload.get("total", 0)
-                        if payload.get("error"):
-                            PULL_STATE["error"] = payload.get("error")
-                except Exception:
-                    pass
-                try:
-                    self.wfile.write(line)
-                    self.wfile.flush()
-                except BrokenPipeError:
-                    self._log_broken_pipe()
-                    break
-        finally:
-            with PULL_LOCK:
-                if PULL_STATE["error"]:
-                    PULL_STATE["status"] = PULL_STATE["error"]
-                elif PULL_STATE["in_progress"]:
-                    PULL_STATE["status"] = "Pull complete."
-                PULL_STATE["in_progress"] = False
-                PULL_RESPONSE = None
-            response.close()
-        return None
+    def _ollama_pull_cancel(self, payload):
+        backend = str(payload.get("host", "") or "").strip()
+        if not cancel_model_pull(backend or None):
+            return _json_response(
+                self, {"ok": False, "error": "No pull in progress."}, 409
+            )
+        return _json_response(self, {"ok": True, "message": "Pull cancelled."})
 
-    def _ollama_pull_cancel(self):
-        global PULL_CANCEL, PULL_RESPONSE
-        with PULL_LOCK:
-            if not PULL_STATE["in_progress"]:
-                return _json_response(
-                    self, {"ok": False, "error": "No pull in progress."}, 409
-                )
-            PULL_CANCEL = True
-            response = PULL_RESPONSE
+    def _traces_set(self, payload):
         try:
-            if response:
-                response.close()
+            sample_rate = float(payload.get("sampleRate"))
         except Exception:
-            pass
-        return _json_response(self, {"ok": True, "message": "Pull cancelled."})
+            return _json_response(
+                self, {"ok": False, "error": "Invalid sampleRate"}, 400
+            )
+        with TRACE_LOCK:
+            TRACE_SETTINGS["sample_rate"] = max(0.0, min(1.0, sample_rate))
+            if payload.get("clear"):
+                TRACES.clear()
+        return _json_response(
+            self,
+            {
+                "ok": True,
+                "sample_rate": TRACE_SETTINGS["sample_rate"],
+                "export_path": TRACE_SETTINGS["export_path"],
+            },
+        )
 
     def _send_email_alert(self, payload):
         result, status = send_email_alert_payload(payload)
@@ -1267,7 +6483,10 @@ if __name__ == "__main__":
     mimetypes.add_type("application/javascript", ".js")
 
     server = ThreadingHTTPServer(("", port), RequestHandler)
+    start_warm_start()
     start_monitor_thread()
+    start_health_thread()
+    start_evidence_feed()
     print(f"Serving on http://localhost:{port}")
     try:
         server.serve_forever()
@@ -1276,3 +6495,7 @@ if __name__ == "__main__":
     finally:
         server.server_close()
         stop_monitor_thread()
+        stop_health_thread()
+        stop_evidence_feed()
+        stop_cluster()
+        shutdown_image_pool()
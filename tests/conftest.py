@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def clean_state():
+    with server.RESPONSE_LOCK:
+        server.OLLAMA_RESPONSES.clear()
+        server.RESPONSE_CHANGES.clear()
+        server.RESPONSE_STATE["bytes"] = 0
+    with server.EVIDENCE_LOCK:
+        server.EVIDENCE_CLIPS.clear()
+    with server.FRAME_RINGS_LOCK:
+        server.FRAME_RINGS.clear()
+    with server.VERDICT_LOCK:
+        server.VERDICT_CACHE.clear()
+    with server.TRACE_LOCK:
+        server.TRACES.clear()
+    server.MEMORY_STATE["evicted"].clear()
+    yield server
+    with server.FRAME_RINGS_LOCK:
+        server.FRAME_RINGS.clear()
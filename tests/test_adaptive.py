@@ -0,0 +1,73 @@
+import base64
+
+import cv2
+import numpy
+import pytest
+
+import server
+
+
+CAMERA = {"id": "front"}
+
+
+def _scene(person):
+    generator = numpy.random.default_rng(3)
+    texture = generator.integers(0, 255, (480, 640), dtype=numpy.uint8)
+    texture = cv2.GaussianBlur(texture, (0, 0), 6)
+    image = cv2.normalize(texture, None, 0, 255, cv2.NORM_MINMAX)
+    cv2.rectangle(image, *person, 20, -1)
+    return image
+
+
+def _result(image):
+    data = cv2.imencode(".jpg", image)[1].tobytes()
+    return {"ok": True, "response": "no", "image": base64.b64encode(data).decode()}
+
+
+STANDING = _scene(((300, 100), (360, 400)))
+FALLEN = _scene(((180, 340), (480, 400)))
+
+
+@pytest.fixture
+def adaptive(monkeypatch):
+    monkeypatch.setattr(server, "MIN_MONITOR_INTERVAL", 1)
+    monkeypatch.setattr(server, "ADAPTIVE_STATE", {})
+    config = {
+        "ollama": {
+            "intervalSeconds": 10,
+            "adaptiveInterval": True,
+            "minIntervalSeconds": 2,
+            "maxIntervalSeconds": 60,
+        }
+    }
+    yield config
+    server.ADAPTIVE_STATE.clear()
+
+
+def _state():
+    return server.ADAPTIVE_STATE[server._get_camera_key(CAMERA)]
+
+
+def test_fall_in_textured_room_counts_as_motion(adaptive):
+    server._adaptive_observe(adaptive, CAMERA, _result(STANDING))
+    server._adaptive_observe(adaptive, CAMERA, _result(FALLEN))
+    assert _state()["reason"] == "motion"
+    assert _state()["interval"] == 2
+
+
+def test_static_scene_backs_off(adaptive, monkeypatch):
+    noise = numpy.random.default_rng(4).integers(-6, 7, STANDING.shape)
+    noisy = numpy.clip(STANDING.astype(int) + noise, 0, 255).astype(numpy.uint8)
+    server._adaptive_observe(adaptive, CAMERA, _result(STANDING))
+    first = _state()["interval"]
+    server._adaptive_observe(adaptive, CAMERA, _result(noisy))
+    assert _state()["reason"] == "static"
+    assert _state()["interval"] == first * server.ADAPTIVE_BACKOFF > 10
+
+
+def test_motion_compares_inference_frames_not_evidence(adaptive):
+    server._adaptive_observe(adaptive, CAMERA, _result(STANDING))
+    result = _result(FALLEN)
+    result["inference_image"] = _result(STANDING)["image"]
+    server._adaptive_observe(adaptive, CAMERA, result)
+    assert _state()["reason"] == "static"
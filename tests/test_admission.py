@@ -0,0 +1,75 @@
+import pytest
+
+import server
+
+
+ROUTE = "/api/test"
+
+
+@pytest.fixture
+def admission(monkeypatch):
+    monkeypatch.setitem(
+        server.ADMISSION_ROUTES, ROUTE, {"concurrency": 1, "rate": 0.01, "burst": 2}
+    )
+    with server.ADMISSION_LOCK:
+        server.ADMISSION_STATE["routes"].clear()
+        server.ADMISSION_STATE["buckets"].clear()
+    yield server
+    with server.ADMISSION_LOCK:
+        server.ADMISSION_STATE["routes"].clear()
+        server.ADMISSION_STATE["buckets"].clear()
+
+
+def test_unlisted_routes_are_always_admitted(admission):
+    assert admission.admission_acquire("/api/state", "1.2.3.4") == (True, "", 0)
+
+
+def test_concurrency_cap(admission):
+    assert admission.admission_acquire(ROUTE, "1.2.3.4")[0]
+    admitted, reason, retry_after = admission.admission_acquire(ROUTE, "5.6.7.8")
+    assert (admitted, reason, retry_after) == (False, "concurrency", 1)
+    admission.admission_release(ROUTE)
+    assert admission.admission_acquire(ROUTE, "5.6.7.8")[0]
+
+
+def test_token_bucket_per_client(admission):
+    for _attempt in range(2):
+        assert admission.admission_acquire(ROUTE, "1.2.3.4")[0]
+        admission.admission_release(ROUTE)
+    admitted, reason, retry_after = admission.admission_acquire(ROUTE, "1.2.3.4")
+    assert not admitted
+    assert reason == "rate"
+    assert retry_after >= 1
+    assert admission.admission_acquire(ROUTE, "5.6.7.8")[0]
+    stats = admission.get_admission_snapshot()["routes"][ROUTE]
+    assert stats["admitted"] == 3
+    assert stats["rejected"] == 1
+
+
+def test_client_buckets_are_bounded(admission, monkeypatch):
+    monkeypatch.setattr(admission, "ADMISSION_MAX_CLIENTS", 3)
+    for index in range(5):
+        admission.admission_acquire(ROUTE, f"10.0.0.{index}")
+        admission.admission_release(ROUTE)
+    assert list(admission.ADMISSION_STATE["buckets"]) == [
+        (f"10.0.0.{index}", ROUTE) for index in range(2, 5)
+    ]
+
+
+def _handler(peer, forwarded=""):
+    handler = server.RequestHandler.__new__(server.RequestHandler)
+    handler.client_address = (peer, 50000)
+    handler.headers = {"X-Forwarded-For": forwarded} if forwarded else {}
+    return handler
+
+
+def test_forwarded_for_ignored_from_untrusted_peers(monkeypatch):
+    monkeypatch.setattr(server, "TRUSTED_PROXIES", frozenset())
+    assert _handler("1.2.3.4", "9.9.9.9")._get_client_ip() == "1.2.3.4"
+
+
+def test_forwarded_for_honoured_from_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(server, "TRUSTED_PROXIES", frozenset({"10.0.0.1"}))
+    handler = _handler("10.0.0.1", "6.6.6.6, 5.6.7.8, 10.0.0.1")
+    assert handler._get_client_ip() == "5.6.7.8"
+    assert _handler("10.0.0.1")._get_client_ip() == "10.0.0.1"
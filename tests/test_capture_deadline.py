@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+import server
+
+
+HUNG = "rtsp://10.0.0.2/stream1"
+HEALTHY = "rtsp://10.0.0.3/stream1"
+
+
+@pytest.fixture
+def capture(monkeypatch):
+    monkeypatch.setattr(server, "CAPTURE_HEALTH", {})
+    gate = threading.Event()
+    calls = []
+
+    def grab(url):
+        calls.append(url)
+        if url == HUNG:
+            gate.wait(5)
+        return b"frame"
+
+    yield grab, gate, calls
+    gate.set()
+
+
+def test_stuck_source_holds_a_single_worker(capture):
+    grab, gate, calls = capture
+    with pytest.raises(RuntimeError, match="deadline exceeded"):
+        server.run_capture_with_deadline(HUNG, grab, deadline=0.1)
+    server.CAPTURE_HEALTH[HUNG]["stuck_workers"][0]["started_at"] -= (
+        server.CAPTURE_ABANDON_SECONDS
+    )
+    for _attempt in range(3):
+        with pytest.raises(RuntimeError, match="still blocked"):
+            server.run_capture_with_deadline(HUNG, grab, deadline=0.1)
+    assert calls == [HUNG]
+    assert server.CAPTURE_HEALTH[HUNG]["abandoned"] == 1
+    gate.set()
+    while server.CAPTURE_HEALTH[HUNG]["stuck_workers"]:
+        time.sleep(0.01)
+    assert server.run_capture_with_deadline(HUNG, grab) == b"frame"
+
+
+def test_hung_camera_does_not_delay_others(capture, monkeypatch):
+    grab, gate, _calls = capture
+    finished = {}
+
+    def analyze(payload, reserved=False):
+        url = payload["streamUrl"]
+        try:
+            server.run_capture_with_deadline(url, grab, deadline=5)
+        except RuntimeError as exc:
+            return {"ok": False, "error": str(exc)}, 502
+        finished[url] = time.time()
+        return {"ok": True, "triggered": False}, 200
+
+    monkeypatch.setattr(server, "ollama_analyze_payload", analyze)
+    monkeypatch.setattr(server, "_adaptive_observe", lambda *args: None)
+    monkeypatch.setattr(server, "MONITOR_STATE", dict(server.MONITOR_STATE))
+    monkeypatch.setitem(server.READINESS, "first_cycle_seconds", 0.0)
+    config = {
+        "ollama": {"host": "127.0.0.1", "port": 9, "model": "m", "prompt": "p"},
+    }
+    cameras = [
+        {"id": "hung", "streamUrl": HUNG},
+        {"id": "healthy", "streamUrl": HEALTHY},
+    ]
+    started = time.time()
+    cycle = threading.Thread(
+        target=server._run_monitor_cycle, args=(config, cameras)
+    )
+    cycle.start()
+    while HEALTHY not in finished and time.time() - started < 2:
+        time.sleep(0.01)
+    assert HEALTHY in finished and HUNG not in finished
+    gate.set()
+    cycle.join(5)
+    assert not cycle.is_alive()
@@ -0,0 +1,50 @@
+import server
+
+
+CAMERAS = [f"cam{index}" for index in range(6)]
+
+
+def _sync(store, instance_id, active=True, cameras=CAMERAS):
+    store.heartbeat(instance_id, "", active, {})
+    return store.sync_leases(instance_id, cameras, 15, active)
+
+
+def test_single_instance_owns_every_camera(tmp_path):
+    store = server.ClusterStore(str(tmp_path / "cluster.db"))
+    assert _sync(store, "a") == set(CAMERAS)
+
+
+def test_new_instance_takes_a_fair_share(tmp_path):
+    store = server.ClusterStore(str(tmp_path / "cluster.db"))
+    _sync(store, "a")
+    owned_b = _sync(store, "b")
+    owned_a = _sync(store, "a")
+    assert len(owned_b) == 3
+    assert owned_a == set(CAMERAS) - owned_b
+    owned_c = _sync(store, "c")
+    owned_a = _sync(store, "a")
+    owned_b = _sync(store, "b")
+    assert sorted(map(len, (owned_a, owned_b, owned_c))) == [2, 2, 2]
+    assert owned_a | owned_b | owned_c == set(CAMERAS)
+
+
+def test_leaving_instance_hands_cameras_back(tmp_path):
+    store = server.ClusterStore(str(tmp_path / "cluster.db"))
+    _sync(store, "a")
+    _sync(store, "b")
+    store.leave("b")
+    assert _sync(store, "a") == set(CAMERAS)
+
+
+def test_inactive_instance_releases_leases(tmp_path):
+    store = server.ClusterStore(str(tmp_path / "cluster.db"))
+    _sync(store, "a")
+    _sync(store, "b")
+    assert _sync(store, "b", active=False) == set()
+    assert _sync(store, "a") == set(CAMERAS)
+
+
+def test_removed_cameras_drop_their_leases(tmp_path):
+    store = server.ClusterStore(str(tmp_path / "cluster.db"))
+    _sync(store, "a")
+    assert _sync(store, "a", cameras=CAMERAS[:2]) == set(CAMERAS[:2])
@@ -0,0 +1,70 @@
+import copy
+
+import server
+
+
+BASE = {
+    "cameras": [
+        {"id": "front", "streamUrl": "rtsp://10.0.0.2/stream1", "name": "Front"},
+        {"id": "back", "streamUrl": "rtsp://10.0.0.3/stream1", "name": "Back"},
+    ],
+    "activeCameraId": "front",
+    "ollama": {"host": "127.0.0.1", "port": 11434, "model": "m", "prompt": "p"},
+    "alerts": {"enabled": False},
+}
+
+
+def _changed(**updates):
+    config = copy.deepcopy(BASE)
+    config.update(updates)
+    return config
+
+
+def test_identical_configs_have_no_impact():
+    changes = server.diff_config(BASE, copy.deepcopy(BASE))
+    assert changes["impact"] == "none"
+    assert not any(changes["cameras"].values())
+
+
+def test_camera_changes_are_classified():
+    config = copy.deepcopy(BASE)
+    config["cameras"][0]["streamUrl"] = "rtsp://10.0.0.9/stream1"
+    config["cameras"][1]["name"] = "Garden"
+    config["cameras"].append({"id": "side", "streamUrl": "rtsp://10.0.0.4/stream1"})
+    changes = server.diff_config(BASE, config)
+    assert changes["impact"] == "cameras"
+    assert changes["cameras"] == {
+        "added": ["side"],
+        "removed": [],
+        "capture": ["front"],
+        "settings": ["back"],
+    }
+
+
+def test_removed_camera_and_monitoring_switch():
+    config = _changed(cameras=[BASE["cameras"][1]], activeCameraId="back")
+    changes = server.diff_config(BASE, config)
+    assert changes["cameras"]["removed"] == ["front"]
+    assert changes["monitoring"] == {"started": ["back"], "stopped": ["front"]}
+
+
+def test_ollama_changes_are_split_by_kind():
+    ollama = dict(BASE["ollama"], port=11435, intervalSeconds=30, prompt="q")
+    changes = server.diff_config(BASE, _changed(ollama=ollama))
+    assert changes["impact"] == "ollama"
+    assert changes["ollama"] == {
+        "connection": True,
+        "model": False,
+        "schedule": True,
+        "inference": True,
+    }
+
+
+def test_alert_and_other_sections():
+    changes = server.diff_config(BASE, _changed(alerts={"enabled": True}))
+    assert changes["impact"] == "alerts"
+    assert changes["alerts"]
+    assert changes["sections"] == ["alerts"]
+    changes = server.diff_config(BASE, _changed(theme="dark", savedAt=1))
+    assert changes["impact"] == "other"
+    assert changes["sections"] == ["theme"]
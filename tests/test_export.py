@@ -0,0 +1,56 @@
+import time
+
+
+def _store(server, response_id, triggered=False, camera_id="cam", timestamp=None):
+    server.store_response(
+        {
+            "id": response_id,
+            "timestamp": timestamp or time.time(),
+            "text": "no fall",
+            "model": "m",
+            "triggered": triggered,
+            "camera_id": camera_id,
+        }
+    )
+
+
+def test_iter_responses_spans_batches_oldest_first(clean_state, monkeypatch):
+    server = clean_state
+    monkeypatch.setattr(server, "EXPORT_BATCH_SIZE", 2)
+    for index in range(5):
+        _store(server, f"r{index}")
+    assert [item.id for item in server.iter_responses()] == [
+        f"r{index}" for index in range(5)
+    ]
+
+
+def test_iter_responses_stops_at_snapshot(clean_state, monkeypatch):
+    server = clean_state
+    monkeypatch.setattr(server, "EXPORT_BATCH_SIZE", 2)
+    for index in range(3):
+        _store(server, f"r{index}")
+    seen = []
+    for item in server.iter_responses():
+        seen.append(item.id)
+        if len(seen) == 1:
+            _store(server, "late")
+    assert seen == ["r0", "r1", "r2"]
+
+
+def test_iter_responses_filters(clean_state):
+    server = clean_state
+    now = time.time()
+    _store(server, "a", camera_id="front", timestamp=now - 30)
+    _store(server, "b", camera_id="back", timestamp=now - 20, triggered=True)
+    _store(server, "c", camera_id="front", timestamp=now - 10, triggered=True)
+    assert [item.id for item in server.iter_responses(cameras={"front"})] == [
+        "a",
+        "c",
+    ]
+    assert [item.id for item in server.iter_responses(triggered_only=True)] == [
+        "b",
+        "c",
+    ]
+    assert [
+        item.id for item in server.iter_responses(since=now - 25, until=now - 15)
+    ] == ["b"]
@@ -0,0 +1,55 @@
+import random
+
+import server
+
+
+def _frame(index, size):
+    return bytes([index % 256]) * size
+
+
+def test_frames_come_back_in_order():
+    ring = server.FrameRing(100, 8)
+    for index in range(3):
+        assert ring.push(_frame(index, 20), float(index))
+    expected = [(float(index), _frame(index, 20)) for index in range(3)]
+    assert ring.frames(0, 10) == expected
+    assert ring.frames(1, 1) == [(1.0, _frame(1, 20))]
+    assert ring.used_bytes() == 60
+
+
+def test_wraparound_drops_overwritten_frames():
+    ring = server.FrameRing(100, 8)
+    for index, size in enumerate((40, 40, 30, 30)):
+        ring.push(_frame(index, size), float(index))
+    assert ring.frames(0, 10) == [(2.0, _frame(2, 30)), (3.0, _frame(3, 30))]
+
+
+def test_wrap_with_stale_tail_keeps_data_intact():
+    ring = server.FrameRing(100, 2)
+    for index, size in enumerate((40, 35, 20, 40, 65)):
+        ring.push(_frame(index, size), float(index))
+    assert ring.frames(0, 10) == [(4.0, _frame(4, 65))]
+
+
+def test_slot_limit_and_oversized_frames():
+    ring = server.FrameRing(100, 2)
+    for index in range(4):
+        ring.push(_frame(index, 10), float(index))
+    assert [captured_at for captured_at, _data in ring.frames(0, 10)] == [2.0, 3.0]
+    assert not ring.push(_frame(9, 101), 9.0)
+    assert ring.dropped == 1
+
+
+def test_random_pushes_never_return_overwritten_bytes():
+    generator = random.Random(7)
+    for _trial in range(200):
+        ring = server.FrameRing(100, generator.randint(2, 6))
+        pushed = {}
+        for index in range(30):
+            data = _frame(index, generator.randint(5, 70))
+            ring.push(data, float(index))
+            pushed[float(index)] = data
+            frames = ring.frames(0, 100)
+            assert frames[-1][0] == float(index)
+            for captured_at, stored in frames:
+                assert stored == pushed[captured_at]
@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+import server
+
+
+CONFIGURED = "http://10.0.0.2/snapshot.jpg"
+ADHOC = "http://10.0.0.99/snapshot.jpg"
+
+
+@pytest.fixture
+def health(monkeypatch):
+    calls = []
+
+    def check(url):
+        calls.append(url)
+        return {"ok": True, "status": 200}, 200
+
+    monkeypatch.setitem(server.HEALTH_FETCHERS, "preview", check)
+    monkeypatch.setattr(server, "HEALTH_CACHE", {})
+    monkeypatch.setitem(
+        server.SERVER_STATE,
+        "config",
+        {"cameras": [{"id": "front", "previewUrl": CONFIGURED}]},
+    )
+    yield calls
+
+
+def _wait_for_refresh(cache_key):
+    with server.HEALTH_LOCK:
+        future = server.HEALTH_CACHE[cache_key]["future"]
+    if future is not None:
+        future.result(timeout=2)
+
+
+def _age(cache_key, seconds):
+    with server.HEALTH_LOCK:
+        entry = server.HEALTH_CACHE[cache_key]
+        entry["fetched_at"] -= seconds
+        entry["requested_at"] -= seconds
+
+
+def test_fresh_results_are_served_from_cache(health):
+    payload, status = server.get_health_check("preview", ADHOC)
+    assert (status, payload["cached"]) == (200, False)
+    payload, _status = server.get_health_check("preview", ADHOC)
+    assert payload["cached"] and not payload["stale"]
+    assert health == [ADHOC]
+
+
+def test_stale_result_is_served_while_refreshing(health):
+    gate = threading.Event()
+
+    def slow_check(url):
+        gate.wait(2)
+        return {"ok": False, "error": "down"}, 502
+
+    server.get_health_check("preview", ADHOC)
+    server.HEALTH_FETCHERS["preview"] = slow_check
+    _age(("preview", (ADHOC,)), server.HEALTH_TTL_SECONDS + 1)
+    payload, status = server.get_health_check("preview", ADHOC)
+    assert payload["stale"] and payload["ok"] and status == 200
+    gate.set()
+    _wait_for_refresh(("preview", (ADHOC,)))
+    payload, status = server.get_health_check("preview", ADHOC)
+    assert (status, payload["ok"], payload["stale"]) == (502, False, False)
+
+
+def test_force_bypasses_the_cache(health):
+    server.get_health_check("preview", ADHOC)
+    payload, _status = server.get_health_check("preview", ADHOC, force=True)
+    assert not payload["cached"]
+    assert health == [ADHOC, ADHOC]
+
+
+def test_sweep_refreshes_only_configured_targets(health):
+    server.get_health_check("preview", ADHOC)
+    server._health_sweep()
+    _wait_for_refresh(("preview", (CONFIGURED,)))
+    assert health == [ADHOC, CONFIGURED]
+    _age(("preview", (ADHOC,)), server.HEALTH_TTL_SECONDS + 1)
+    _age(("preview", (CONFIGURED,)), server.HEALTH_TTL_SECONDS + 1)
+    server._health_sweep()
+    _wait_for_refresh(("preview", (CONFIGURED,)))
+    assert health == [ADHOC, CONFIGURED, CONFIGURED]
+
+
+def test_sweep_drops_idle_adhoc_entries(health):
+    server.get_health_check("preview", ADHOC)
+    _age(("preview", (ADHOC,)), server.HEALTH_STALE_SECONDS)
+    server._health_sweep()
+    _wait_for_refresh(("preview", (CONFIGURED,)))
+    assert ("preview", (ADHOC,)) not in server.HEALTH_CACHE
+    assert ("preview", (CONFIGURED,)) in server.HEALTH_CACHE
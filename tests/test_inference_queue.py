@@ -0,0 +1,39 @@
+import threading
+import time
+
+import server
+
+
+def test_manual_requests_have_their_own_cap(monkeypatch):
+    monkeypatch.setattr(server, "INFERENCE_MANUAL_QUEUE", 1)
+    backend = "test-manual-cap"
+    manual = server.INFERENCE_PRIORITIES["manual"]
+    routine = server.INFERENCE_PRIORITIES["routine"]
+    ticket, _error, status, _retry = server._inference_acquire(
+        backend, routine, time.time() + 5, reserved=True
+    )
+    assert status == 200
+    results = []
+    waiter = threading.Thread(
+        target=lambda: results.append(
+            server._inference_acquire(backend, manual, time.time() + 0.5)[2]
+        )
+    )
+    waiter.start()
+    while not server.get_inference_queue_snapshot()["backends"][backend]["depth"]:
+        time.sleep(0.01)
+    assert server._inference_acquire(backend, manual, time.time() + 0.5)[2] == 429
+    waiter.join()
+    server._inference_release(ticket, 0.1)
+    assert results == [503]
+
+
+def test_recent_triggers_are_bounded(monkeypatch):
+    monkeypatch.setattr(server, "RECENT_TRIGGERS", {})
+    monkeypatch.setattr(server, "RECENT_TRIGGERS_MAX", 3)
+    for index in range(5):
+        server._note_recent_trigger(f"cam{index}")
+    assert list(server.RECENT_TRIGGERS) == ["cam2", "cam3", "cam4"]
+    server.RECENT_TRIGGERS["cam2"] -= server.RECENT_TRIGGER_WINDOW + 1
+    server._note_recent_trigger("cam5")
+    assert list(server.RECENT_TRIGGERS) == ["cam3", "cam4", "cam5"]
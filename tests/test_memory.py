@@ -0,0 +1,49 @@
+import time
+
+
+def _store(server, response_id, triggered, text="x" * 200):
+    server.store_response(
+        {
+            "id": response_id,
+            "timestamp": time.time(),
+            "text": text,
+            "model": "m",
+            "triggered": triggered,
+            "camera_id": "cam",
+        }
+    )
+
+
+def test_live_buffers_never_evict_triggered_responses(clean_state, monkeypatch):
+    server = clean_state
+    monkeypatch.setattr(server, "MEMORY_BUDGET_BYTES", 8 * 1024 * 1024)
+    for index in range(3):
+        server.record_frame(f"rtsp://cam{index}/stream", b"\xff\xd8frame\xff\xd9")
+    _store(server, "fall", True)
+    _store(server, "calm", False)
+    ids = [item["id"] for item in server.get_responses_snapshot()]
+    assert "fall" in ids
+
+
+def test_evicts_non_triggered_before_triggered(clean_state, monkeypatch):
+    server = clean_state
+    record_bytes = server.RESPONSE_RECORD_OVERHEAD + 1200
+    monkeypatch.setattr(server, "MEMORY_BUDGET_BYTES", record_bytes * 10)
+    for index in range(30):
+        _store(server, f"r{index}", index % 10 == 0, text="x" * 1150)
+    responses = server.get_responses_snapshot()
+    assert {item["id"] for item in responses if item["triggered"]} == {
+        "r0",
+        "r10",
+        "r20",
+    }
+    assert responses[0]["id"] == "r29"
+    assert server.get_memory_snapshot()["evicted"]["responses"]["entries"] > 0
+
+
+def test_budget_disabled(clean_state, monkeypatch):
+    server = clean_state
+    monkeypatch.setattr(server, "MEMORY_BUDGET_BYTES", 0)
+    for index in range(20):
+        _store(server, f"r{index}", False)
+    assert len(server.get_responses_snapshot()) == 20
@@ -0,0 +1,73 @@
+import pytest
+
+import server
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    monkeypatch.setattr(server, "METRICS", {})
+    monkeypatch.setitem(
+        server.SERVER_STATE,
+        "config",
+        {
+            "cameras": [{"id": "front", "streamUrl": "rtsp://10.0.0.2/stream1"}],
+            "ollama": {"host": "127.0.0.1", "port": 11434, "model": "m", "prompt": "p"},
+        },
+    )
+    for name, kind in (
+        ("falldetector_inference_queue_depth", "gauge"),
+        ("falldetector_inference_active", "gauge"),
+        ("falldetector_monitor_running", "gauge"),
+        ("falldetector_responses_stored", "gauge"),
+        ("falldetector_capture_stuck_workers", "gauge"),
+        ("falldetector_sessions", "gauge"),
+        ("falldetector_memory_bytes", "gauge"),
+    ):
+        server._metric_define(name, kind, "State.")
+    yield server
+
+
+def test_help_type_and_labels(metrics):
+    metrics._metric_define("test_total", "counter", "Things counted.")
+    metrics.metric_inc("test_total", camera="front", model="m")
+    metrics.metric_inc("test_total", 2, camera="front", model="m")
+    metrics._metric_define("test_gauge", "gauge", "A level.")
+    metrics.metric_set("test_gauge", 7)
+    lines = metrics.render_metrics().splitlines()
+    assert "# HELP test_total Things counted." in lines
+    assert "# TYPE test_total counter" in lines
+    assert 'test_total{camera="front",model="m"} 3' in lines
+    assert "# TYPE test_gauge gauge" in lines
+    assert "test_gauge 7" in lines
+
+
+def test_label_values_are_escaped(metrics):
+    metrics._metric_define("test_total", "counter", "Things counted.")
+    metrics.metric_inc("test_total", route='a"b\\c\nd')
+    assert 'test_total{route="a\\"b\\\\c\\nd"} 1' in metrics.render_metrics()
+
+
+def test_histogram_buckets(metrics):
+    metrics._metric_define("test_seconds", "histogram", "Durations.", (0.1, 1))
+    metrics.metric_observe("test_seconds", 0.05)
+    metrics.metric_observe("test_seconds", 0.5)
+    metrics.metric_observe("test_seconds", 5)
+    lines = metrics.render_metrics().splitlines()
+    assert 'test_seconds_bucket{le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{le="+Inf"} 3' in lines
+    assert "test_seconds_count 3" in lines
+    assert "test_seconds_sum 5.55" in lines
+
+
+def test_unconfigured_labels_collapse_to_adhoc(metrics):
+    assert metrics._metric_labels("front", "m", "127.0.0.1:11434") == (
+        "front",
+        "m",
+        "127.0.0.1:11434",
+    )
+    assert metrics._metric_labels("random-1", "other", "10.9.9.9:1") == (
+        "adhoc",
+        "adhoc",
+        "adhoc",
+    )
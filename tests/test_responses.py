@@ -0,0 +1,66 @@
+import time
+
+
+def _store(server, response_id, triggered=False, camera_id="cam", timestamp=None):
+    server.store_response(
+        {
+            "id": response_id,
+            "timestamp": timestamp or time.time(),
+            "text": "no fall",
+            "model": "m",
+            "triggered": triggered,
+            "camera_id": camera_id,
+        }
+    )
+
+
+def _ids(items):
+    return [item["id"] for item in items]
+
+
+def test_page_before_cursor_walks_history(clean_state):
+    server = clean_state
+    for index in range(5):
+        _store(server, f"r{index}")
+    first = server.get_responses_page(limit=2)
+    assert _ids(first["responses"]) == ["r4", "r3"]
+    assert first["has_more"]
+    second = server.get_responses_page(
+        before=first["responses"][-1]["seq"], limit=2
+    )
+    assert _ids(second["responses"]) == ["r2", "r1"]
+    last = server.get_responses_page(before=second["responses"][-1]["seq"], limit=2)
+    assert _ids(last["responses"]) == ["r0"]
+    assert not last["has_more"]
+
+
+def test_page_since_cursor_returns_new_and_updated(clean_state):
+    server = clean_state
+    _store(server, "old")
+    cursor = server.get_responses_page()["cursor"]
+    _store(server, "new", triggered=True)
+    server.update_response("old", evidence={"frames": 3})
+    page = server.get_responses_page(since=cursor)
+    assert _ids(page["responses"]) == ["new"]
+    assert _ids(page["updated"]) == ["old"]
+    assert not page["reset"]
+    assert page["cursor"] > cursor
+    assert server.get_responses_page(since=page["cursor"])["responses"] == []
+
+
+def test_page_since_overflow_asks_for_reset(clean_state):
+    server = clean_state
+    cursor = server.get_responses_page()["cursor"]
+    for index in range(4):
+        _store(server, f"r{index}")
+    page = server.get_responses_page(since=cursor, limit=2)
+    assert page["reset"]
+    assert _ids(page["responses"]) == ["r3", "r2"]
+
+
+def test_page_triggered_only(clean_state):
+    server = clean_state
+    for index in range(4):
+        _store(server, f"r{index}", triggered=index % 2 == 0)
+    page = server.get_responses_page(triggered_only=True)
+    assert _ids(page["responses"]) == ["r2", "r0"]
@@ -0,0 +1,87 @@
+import collections
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import server
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(server, "SESSIONS", collections.OrderedDict())
+    monkeypatch.setattr(server, "ACTIVE_SESSION", {"token": None})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), server.RequestHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    def call(path, token="", payload=None):
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{httpd.server_address[1]}{path}",
+            data=json.dumps(payload).encode() if payload is not None else None,
+            headers={"Content-Type": "application/json", "X-Session-Token": token},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=2) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as exc:
+            return exc.code, json.loads(exc.read())
+
+    yield call
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_active_session_is_accepted(api):
+    assert api("/api/session/start", payload={"name": "ann", "token": "a"})[0] == 200
+    assert api("/api/config", "a")[0] == 200
+    assert api("/api/config")[0] == 401
+    status, body = api("/api/config", "b")
+    assert status == 403
+    assert body["active_user"] == "ann"
+
+
+def test_fast_path_skips_the_session_lock(api):
+    api("/api/session/start", payload={"name": "ann", "token": "a"})
+    with server.SESSION_LOCK:
+        assert api("/api/config", "a")[0] == 200
+
+
+def test_idle_session_expires(api):
+    api("/api/session/start", payload={"name": "ann", "token": "a"})
+    server.SESSIONS["a"]["last_seen"] -= server.SESSION_IDLE_SECONDS + 1
+    status, body = api("/api/config", "a")
+    assert status == 401
+    assert "expired" in body["error"]
+    assert server.SESSIONS["a"]["status"] == "expired"
+    assert server.ACTIVE_SESSION["token"] is None
+
+
+def test_kicked_and_closed_sessions_are_refused(api):
+    api("/api/session/start", payload={"name": "ann", "token": "a"})
+    api(
+        "/api/session/takeover",
+        payload={"name": "bob", "token": "b", "confirm": True},
+    )
+    status, body = api("/api/config", "a")
+    assert status == 403
+    assert body["kicked_by"] == "bob"
+    assert api("/api/config", "b")[0] == 200
+    api("/api/session/close", "b", payload={})
+    assert api("/api/config", "b")[0] == 401
+
+
+def test_eviction_keeps_the_active_session(monkeypatch):
+    monkeypatch.setattr(server, "SESSION_MAX_ENTRIES", 3)
+    sessions = collections.OrderedDict()
+    now = server.time.time()
+    for token in ("active", "s1", "s2", "s3", "s4"):
+        sessions[token] = {"last_seen": now, "ended_at": now}
+    sessions["active"]["ended_at"] = 0
+    sessions["old"] = {"last_seen": 0, "ended_at": now - 2 * 60 * 60}
+    monkeypatch.setattr(server, "SESSIONS", sessions)
+    monkeypatch.setattr(server, "ACTIVE_SESSION", {"token": "active"})
+    server._prune_sessions_locked(now)
+    assert list(sessions) == ["active", "s3", "s4"]
@@ -0,0 +1,73 @@
+import os
+
+import cv2
+import numpy
+import pytest
+
+import server
+
+
+SCOPE = ("front", "127.0.0.1:11434", "m", "p", "YES")
+HASH = 0x0F0F0F0F0F0F0F0F
+
+
+@pytest.fixture
+def cache(clean_state, monkeypatch):
+    monkeypatch.setattr(server, "VERDICT_CACHE_DISTANCE", 4)
+    server.store_verdict(SCOPE, HASH, 30, "r1", "no fall", 2.5)
+    yield server
+
+
+def test_exact_and_near_frames_hit(cache):
+    assert cache.lookup_verdict(SCOPE, HASH)["distance"] == 0
+    near = cache.lookup_verdict(SCOPE, HASH ^ 0b1111)
+    assert near["id"] == "r1"
+    assert near["distance"] == 4
+
+
+def test_changed_frames_and_other_scopes_miss(cache):
+    assert cache.lookup_verdict(SCOPE, HASH ^ 0b11111) is None
+    assert cache.lookup_verdict(("back",) + SCOPE[1:], HASH) is None
+    assert cache.lookup_verdict(SCOPE[:2] + ("other",) + SCOPE[3:], HASH) is None
+
+
+def test_closest_entry_wins(cache):
+    cache.store_verdict(SCOPE, HASH ^ 0b1, 30, "r2", "no fall", 1.0)
+    assert cache.lookup_verdict(SCOPE, HASH ^ 0b11)["id"] == "r2"
+
+
+def test_entries_expire(cache, monkeypatch):
+    now = server.time.time()
+    monkeypatch.setattr(server.time, "time", lambda: now + 31)
+    assert cache.lookup_verdict(SCOPE, HASH) is None
+
+
+def test_cache_is_disabled_by_default(monkeypatch):
+    if "FALLDETECTOR_VERDICT_CACHE_SECONDS" not in os.environ:
+        assert server.VERDICT_CACHE_SECONDS == 0
+    monkeypatch.setattr(server, "VERDICT_CACHE_SECONDS", 0.0)
+    assert server._get_verdict_cache_seconds({}) == 0
+    assert server._get_verdict_cache_seconds({"verdictCacheSeconds": ""}) == 0
+    assert server._get_verdict_cache_seconds({"verdictCacheSeconds": "x"}) == 0
+    assert server._get_verdict_cache_seconds({"verdictCacheSeconds": 30}) == 30
+    assert server._get_verdict_cache_seconds({"verdictCacheSeconds": -5}) == 0
+
+
+def test_analyze_skips_the_cache_when_disabled(clean_state, monkeypatch):
+    calls = []
+    frame = cv2.imencode(".jpg", numpy.full((48, 64), 128, numpy.uint8))[1].tobytes()
+    monkeypatch.setattr(server, "VERDICT_CACHE_SECONDS", 0.0)
+    monkeypatch.setattr(server, "fetch_preview_image", lambda url: frame)
+    monkeypatch.setattr(server, "lookup_verdict", lambda *args: calls.append(args))
+    payload = {
+        "host": "127.0.0.1",
+        "port": 9,
+        "model": "m",
+        "prompt": "p",
+        "previewUrl": "http://camera.invalid/snapshot.jpg",
+        "cameraId": "front",
+    }
+    server._ollama_analyze_payload(payload)
+    assert calls == []
+    server._ollama_analyze_payload({**payload, "verdictCacheSeconds": 30})
+    assert len(calls) == 1
@@ -15,6 +15,10 @@ const statusList = document.querySelector("#status-list");
 const runChecksBtn = document.querySelector("#run-checks");
 const clearChecksBtn = document.querySelector("#clear-checks");
 const streamUrlInput = document.querySelector("#stream-url");
+const autoSubstreamToggle = document.querySelector("#auto-substream");
+const inferenceStreamUrlInput = document.querySelector("#inference-stream-url");
+const previewStreamUrlInput = document.querySelector("#preview-stream-url");
+const evidenceStreamUrlInput = document.querySelector("#evidence-stream-url");
 const cameraNameInput = document.querySelector("#camera-name");
 const cameraModelInput = document.querySelector("#camera-model");
 const cameraIpInput = document.querySelector("#camera-ip");
@@ -32,12 +36,18 @@ const ollamaPromptInput = document.querySelector("#ollama-prompt");
 const ollamaTriggerInput = document.querySelector("#ollama-trigger");
 const ollamaTimeoutInput = document.querySelector("#ollama-timeout");
 const ollamaIntervalInput = document.querySelector("#ollama-interval");
+const ollamaAdaptiveToggle = document.querySelector("#ollama-adaptive");
+const ollamaIntervalMinInput = document.querySelector("#ollama-interval-min");
+const ollamaIntervalMaxInput = document.querySelector("#ollama-interval-max");
+const ollamaNearTriggerInput = document.querySelector("#ollama-near-trigger");
 const alertEmailToggle = document.querySelector("#alert-email");
 const senderEmailInput = document.querySelector("#sender-email");
 const gmailUserInput = document.querySelector("#gmail-user");
 const gmailAppPasswordInput = document.querySelector("#gmail-app-password");
 const gmailSenderNameInput = document.querySelector("#gmail-sender-name");
 const motionSnapshotToggle = document.querySelector("#motion-snapshot");
+const verdictCacheInput = document.querySelector("#verdict-cache-seconds");
+const captureBackendSelect = document.querySelector("#capture-backend");
 const cameraForm = document.querySelector("#camera-form");
 const ollamaForm = document.querySelector("#ollama-form");
 const alertForm = document.querySelector("#alert-form");
@@ -65,6 +75,8 @@ const responsesPanel = document.querySelector("#responses-panel");
 const responsesWindow = document.querySelector("#responses-window");
 const filterYesOnly = document.querySelector("#filter-yes-only");
 const refreshResponsesBtn = document.querySelector("#refresh-responses");
+const exportFormatSelect = document.querySelector("#export-format");
+const exportResponsesBtn = document.querySelector("#export-responses");
 const fetchModelsBtn = document.querySelector("#fetch-models");
 const pullModelBtn = document.querySelector("#pull-model");
 const cancelPullBtn = document.querySelector("#cancel-pull");
@@ -72,6 +84,8 @@ const ollamaCustomInput = document.querySelector("#ollama-model-custom");
 const modelFetchStatus = document.querySelector("#model-fetch-status");
 const modelPullStatus = document.querySelector("#model-pull-status");
 const modelPullProgress = document.querySelector("#model-pull-progress");
+const pullHostsInput = document.querySelector("#pull-hosts");
+const modelPullHosts = document.querySelector("#model-pull-hosts");
 const liveModelLabel = document.querySelector("#live-model");
 const liveCameraModelLabel = document.querySelector("#live-camera-model");
 const testInferenceBtn = document.querySelector("#test-inference");
@@ -99,6 +113,8 @@ const SESSION_NAME_KEY = "fallDetectorSessionName";
 let sessionToken = "";
 let sessionName = "";
 let sessionBlocked = false;
+let sessionHeartbeatTimer = null;
+let sessionHeartbeatSeconds = 60;
 let sessionReadyResolve = null;
 const sessionReady = new Promise((resolve) => {
   sessionReadyResolve = resolve;
@@ -111,12 +127,26 @@ const DEFAULT_TIMEOUT_SECONDS = 180;
 const DEFAULT_CAMERA_MODEL = "Tapo C210";
 
 let previewTimer = null;
+let previewStreaming = false;
 let checksRunning = false;
 let armedState = false;
 let armFeedbackTimer = null;
 let monitorTimer = null;
 let alertCount = 0;
 let ollamaResponses = [];
+let responsesCursor = null;
+let responsesHasMore = false;
+let responsesLoadingOlder = false;
+let responsesFetchInFlight = false;
+let responsesRenderQueued = false;
+const responseHeights = new Map();
+const RESPONSES_PAGE_SIZE = 100;
+const RESPONSES_POLL_MS = 15000;
+const RESPONSES_RETENTION_SECONDS = 48 * 60 * 60;
+const RESPONSES_OVERSCAN = 6;
+const RESPONSE_ROW_ESTIMATE = 72;
+const RESPONSE_EVIDENCE_ROW_ESTIMATE = 240;
+const RESPONSE_ROW_GAP = 12;
 let lastAnalyzeError = "";
 let lastAnalyzeErrorAt = 0;
 let ollamaModels = [];
@@ -125,6 +155,7 @@ let consecutiveTimeouts = 0;
 let pullInFlight = false;
 let pullStatusTimer = null;
 let pullRequested = false;
+const PULL_STATUS_POLL_MS = 1000;
 let lastEmailAlertErrorAt = 0;
 let fetchModelsInFlight = false;
 let fetchModelsWaitingTimer = null;
@@ -161,9 +192,34 @@ const blockSession = (message) => {
   if (typeof stopPreview === "function") {
     stopPreview();
   }
+  if (sessionHeartbeatTimer) {
+    window.clearInterval(sessionHeartbeatTimer);
+    sessionHeartbeatTimer = null;
+  }
   showSessionOverlay(message || "Session closed.");
 };
 
+const sendSessionHeartbeat = async () => {
+  try {
+    await apiFetch("/api/session/heartbeat", { method: "POST" });
+  } catch (error) {
+    // apiFetch already blocks the session on 401/403.
+  }
+};
+
+const startSessionHeartbeat = (seconds) => {
+  if (Number.isFinite(seconds) && seconds > 0) {
+    sessionHeartbeatSeconds = seconds;
+  }
+  if (sessionHeartbeatTimer) {
+    window.clearInterval(sessionHeartbeatTimer);
+  }
+  sessionHeartbeatTimer = window.setInterval(
+    sendSessionHeartbeat,
+    sessionHeartbeatSeconds * 1000
+  );
+};
+
 const ensureSessionToken = () => {
   let token = localStorage.getItem(SESSION_TOKEN_KEY);
   if (!token) {
@@ -226,6 +282,7 @@ const beginSession = async () => {
     sessionReadyResolve();
     return;
   }
+  let heartbeatSeconds = 0;
   try {
     const response = await fetch("/api/session/start", {
       method: "POST",
@@ -265,11 +322,15 @@ const beginSession = async () => {
         sessionReadyResolve();
         return;
       }
+      heartbeatSeconds = Number(takeoverPayload.heartbeat_seconds);
     } else if (!response.ok) {
       const payload = await response.json().catch(() => ({}));
       blockSession(payload.error || "Unable to start a session.");
       sessionReadyResolve();
       return;
+    } else {
+      const payload = await response.json().catch(() => ({}));
+      heartbeatSeconds = Number(payload.heartbeat_seconds);
     }
   } catch (error) {
     blockSession("Unable to reach the session service.");
@@ -281,6 +342,7 @@ const beginSession = async () => {
   }
   document.body.classList.remove("session-blocked");
   sessionReadyResolve();
+  startSessionHeartbeat(heartbeatSeconds);
   await fetchServerState();
   await fetchServerConfig();
 };
@@ -354,6 +416,39 @@ const fetchServerConfig = async () => {
   }
 };
 
+const describeConfigChanges = (changes) => {
+  if (!changes || changes.impact === "none") {
+    return "";
+  }
+  const parts = [];
+  const cameraChanges = changes.cameras || {};
+  [
+    ["added", "added"],
+    ["removed", "removed"],
+    ["capture", "capture changed"],
+  ].forEach(([key, label]) => {
+    const count = (cameraChanges[key] || []).length;
+    if (count) {
+      parts.push(`${count} camera${count === 1 ? "" : "s"} ${label}`);
+    }
+  });
+  const ollama = changes.ollama || {};
+  if (ollama.connection || ollama.model) {
+    parts.push("Ollama host or model updated");
+  } else if (ollama.schedule || ollama.inference) {
+    parts.push("Ollama settings updated");
+  }
+  if (changes.alerts) {
+    parts.push("alerts updated");
+  }
+  const applied = changes.applied || {};
+  const restarted = (applied.streams_stopped || []).length;
+  if (restarted) {
+    parts.push(`${restarted} stream${restarted === 1 ? "" : "s"} restarted`);
+  }
+  return parts.length ? `Applied: ${parts.join(", ")}.` : "";
+};
+
 const saveConfigToServer = async (payload) => {
   try {
     const response = await apiFetch("/api/config", {
@@ -364,6 +459,10 @@ const saveConfigToServer = async (payload) => {
     const saved = await response.json();
     if (saved && saved.ok) {
       serverConfigLoaded = true;
+      const summary = describeConfigChanges(saved.changes);
+      if (summary) {
+        addStatus("Server config", "info", summary);
+      }
       return true;
     }
   } catch (error) {
@@ -616,21 +715,52 @@ const setPreviewSrc = () => {
 };
 
 const setRtspPreview = () => {
-  const streamUrl = streamUrlInput.value.trim();
+  const previewStreamUrl = previewStreamUrlInput
+    ? previewStreamUrlInput.value.trim()
+    : "";
+  const streamUrl = previewStreamUrl || streamUrlInput.value.trim();
   if (!streamUrl || !streamUrl.startsWith("rtsp://")) {
     setOverlayMessage("Enter a valid RTSP URL for snapshot preview.");
     return;
   }
+  const autoSubstream =
+    !previewStreamUrl && (!autoSubstreamToggle || autoSubstreamToggle.checked);
   const cacheBusted = `/api/rtsp-snapshot?rtsp=${encodeURIComponent(
     streamUrl
-  )}&session=${encodeURIComponent(sessionToken)}&t=${Date.now()}`;
+  )}&auto=${autoSubstream ? "1" : "0"}&session=${encodeURIComponent(
+    sessionToken
+  )}&t=${Date.now()}`;
   previewImg.src = cacheBusted;
   streamContainer.classList.add("active");
 };
 
+const setRtspStreamPreview = () => {
+  const active = getActiveCamera();
+  if (!active || !active.id) {
+    return false;
+  }
+  const intervalSeconds = Number(snapshotIntervalInput.value) || DEFAULT_SNAPSHOT_INTERVAL;
+  const fps = Math.max(1, Math.min(10, Math.round(10 / intervalSeconds) || 1));
+  previewStreaming = true;
+  previewImg.src = `/api/stream/${encodeURIComponent(
+    active.id
+  )}.mjpeg?fps=${fps}&session=${encodeURIComponent(sessionToken)}&t=${Date.now()}`;
+  streamContainer.classList.add("active");
+  return true;
+};
+
+const startRtspPollingPreview = () => {
+  previewStreaming = false;
+  clearInterval(previewTimer);
+  setRtspPreview();
+  const intervalSeconds = Number(snapshotIntervalInput.value) || DEFAULT_SNAPSHOT_INTERVAL;
+  previewTimer = window.setInterval(setRtspPreview, intervalSeconds * 1000);
+};
+
 const stopPreview = () => {
   clearInterval(previewTimer);
   previewTimer = null;
+  previewStreaming = false;
   previewImg.removeAttribute("src");
   setOverlayMessage("Stream preview placeholder");
 };
@@ -648,21 +778,25 @@ const startPreview = () => {
     previewModeSelect.value = "rtsp";
   }
   if (previewModeSelect.value === "rtsp") {
-    setRtspPreview();
-  } else {
-    setPreviewSrc();
+    if (!setRtspStreamPreview()) {
+      startRtspPollingPreview();
+    }
+    return;
   }
+  setPreviewSrc();
 
   if (streamContainer.classList.contains("active") && previewModeSelect.value === "snapshot") {
     const intervalSeconds = Number(snapshotIntervalInput.value) || DEFAULT_SNAPSHOT_INTERVAL;
     previewTimer = window.setInterval(setPreviewSrc, intervalSeconds * 1000);
   }
-  if (streamContainer.classList.contains("active") && previewModeSelect.value === "rtsp") {
-    const intervalSeconds = Number(snapshotIntervalInput.value) || DEFAULT_SNAPSHOT_INTERVAL;
-    previewTimer = window.setInterval(setRtspPreview, intervalSeconds * 1000);
-  }
 };
 
+previewImg.addEventListener("error", () => {
+  if (previewStreaming) {
+    startRtspPollingPreview();
+  }
+});
+
 const syncCaptureInterval = () => {
   const intervalSeconds = Number(snapshotIntervalInput.value) || DEFAULT_SNAPSHOT_INTERVAL;
   if (captureIntervalLabel) {
@@ -725,6 +859,14 @@ const createCameraId = () => {
   return `cam-${Date.now()}-${Math.floor(Math.random() * 100000)}`;
 };
 
+const parseVerdictCacheSeconds = (value) => {
+  if (value === undefined || value === null || value === "") {
+    return "";
+  }
+  const seconds = Number(value);
+  return Number.isFinite(seconds) && seconds >= 0 ? seconds : "";
+};
+
 const normalizeCamera = (camera) => {
   const snapshotInterval = Number(camera.snapshotInterval);
   return {
@@ -736,6 +878,15 @@ const normalizeCamera = (camera) => {
     rtspUser: camera.rtspUser ? String(camera.rtspUser) : "",
     rtspPass: camera.rtspPass ? String(camera.rtspPass) : "",
     streamProfile: camera.streamProfile ? String(camera.streamProfile) : "main",
+    autoSubstream:
+      camera.autoSubstream !== undefined ? Boolean(camera.autoSubstream) : true,
+    inferenceStreamUrl: camera.inferenceStreamUrl
+      ? String(camera.inferenceStreamUrl)
+      : "",
+    previewStreamUrl: camera.previewStreamUrl ? String(camera.previewStreamUrl) : "",
+    evidenceStreamUrl: camera.evidenceStreamUrl
+      ? String(camera.evidenceStreamUrl)
+      : "",
     previewUrl: camera.previewUrl ? String(camera.previewUrl) : "",
     previewMode: camera.previewMode ? String(camera.previewMode) : "mjpeg",
     snapshotInterval: Number.isFinite(snapshotInterval)
@@ -745,6 +896,8 @@ const normalizeCamera = (camera) => {
       camera.motionSnapshotting !== undefined
         ? Boolean(camera.motionSnapshotting)
         : true,
+    verdictCacheSeconds: parseVerdictCacheSeconds(camera.verdictCacheSeconds),
+    captureBackend: camera.captureBackend === "ffmpeg" ? "ffmpeg" : "opencv",
   };
 };
 
@@ -757,10 +910,22 @@ const buildCameraFromForm = () => ({
   rtspUser: rtspUserInput.value.trim(),
   rtspPass: rtspPassInput.value.trim(),
   streamProfile: streamProfileSelect.value,
+  autoSubstream: autoSubstreamToggle ? autoSubstreamToggle.checked : true,
+  inferenceStreamUrl: inferenceStreamUrlInput
+    ? inferenceStreamUrlInput.value.trim()
+    : "",
+  previewStreamUrl: previewStreamUrlInput ? previewStreamUrlInput.value.trim() : "",
+  evidenceStreamUrl: evidenceStreamUrlInput
+    ? evidenceStreamUrlInput.value.trim()
+    : "",
   previewUrl: previewUrlInput.value.trim(),
   previewMode: previewModeSelect.value,
   snapshotInterval: Number(snapshotIntervalInput.value) || DEFAULT_SNAPSHOT_INTERVAL,
   motionSnapshotting: motionSnapshotToggle ? motionSnapshotToggle.checked : false,
+  verdictCacheSeconds: verdictCacheInput
+    ? parseVerdictCacheSeconds(verdictCacheInput.value.trim())
+    : "",
+  captureBackend: captureBackendSelect ? captureBackendSelect.value : "opencv",
 });
 
 const buildBlankCamera = () => ({
@@ -772,10 +937,16 @@ const buildBlankCamera = () => ({
   rtspUser: "",
   rtspPass: "",
   streamProfile: "main",
+  autoSubstream: true,
+  inferenceStreamUrl: "",
+  previewStreamUrl: "",
+  evidenceStreamUrl: "",
   previewUrl: "",
   previewMode: "mjpeg",
   snapshotInterval: DEFAULT_SNAPSHOT_INTERVAL,
   motionSnapshotting: true,
+  verdictCacheSeconds: "",
+  captureBackend: "opencv",
 });
 
 const getActiveCamera = () =>
@@ -814,6 +985,26 @@ const applyCameraToForm = (camera) => {
   if (streamProfileSelect) {
     streamProfileSelect.value = camera.streamProfile || "main";
   }
+  if (autoSubstreamToggle) {
+    autoSubstreamToggle.checked =
+      camera.autoSubstream !== undefined ? Boolean(camera.autoSubstream) : true;
+  }
+  if (inferenceStreamUrlInput) {
+    inferenceStreamUrlInput.value = camera.inferenceStreamUrl || "";
+  }
+  if (previewStreamUrlInput) {
+    previewStreamUrlInput.value = camera.previewStreamUrl || "";
+  }
+  if (evidenceStreamUrlInput) {
+    evidenceStreamUrlInput.value = camera.evidenceStreamUrl || "";
+  }
+  if (verdictCacheInput) {
+    verdictCacheInput.value =
+      camera.verdictCacheSeconds === undefined ? "" : camera.verdictCacheSeconds;
+  }
+  if (captureBackendSelect) {
+    captureBackendSelect.value = camera.captureBackend || "opencv";
+  }
   if (previewUrlInput) {
     previewUrlInput.value = camera.previewUrl || "";
   }
@@ -1234,7 +1425,7 @@ const runSyntaxChecks = () => {
   items.forEach((item) => addStatus(item.title, item.state, item.detail));
 };
 
-const checkPreviewConnection = async () => {
+const checkPreviewConnection = async (force = false) => {
   if (previewModeSelect.value === "rtsp") {
     const streamUrl = streamUrlInput.value.trim();
     if (!streamUrl || !streamUrl.startsWith("rtsp://")) {
@@ -1277,7 +1468,9 @@ const checkPreviewConnection = async () => {
 
   try {
     const response = await apiFetch(
-      `/api/check-preview?url=${encodeURIComponent(previewUrl)}`
+      `/api/check-preview?url=${encodeURIComponent(previewUrl)}&force=${
+        force ? "1" : "0"
+      }`
     );
     const payload = await response.json();
     if (payload.ok) {
@@ -1311,7 +1504,7 @@ const checkPreviewConnection = async () => {
   }
 };
 
-const checkOllamaConnection = async () => {
+const checkOllamaConnection = async (force = false) => {
   const host = ollamaHostInput.value.trim();
   const port = Number(ollamaPortInput.value);
   if (!isValidHost(host) || !(port >= 1 && port <= 65535)) {
@@ -1321,7 +1514,9 @@ const checkOllamaConnection = async () => {
 
   try {
     const response = await apiFetch(
-      `/api/check-ollama?host=${encodeURIComponent(host)}&port=${port}`
+      `/api/check-ollama?host=${encodeURIComponent(host)}&port=${port}&force=${
+        force ? "1" : "0"
+      }`
     );
     const payload = await response.json();
     if (payload.ok) {
@@ -1368,8 +1563,8 @@ const runChecks = async () => {
   addStatus("Validation", "info", "Running syntax checks...");
   runSyntaxChecks();
   addStatus("Connectivity", "info", "Testing preview + Ollama endpoints...");
-  await checkPreviewConnection();
-  await checkOllamaConnection();
+  await checkPreviewConnection(true);
+  await checkOllamaConnection(true);
   checksRunning = false;
   updatePanelErrors(buildValidationItems());
   updateReadinessState();
@@ -1495,11 +1690,20 @@ const runInferenceTest = async () => {
         trigger,
         timeoutSeconds,
         streamUrl,
+        autoSubstream: autoSubstreamToggle ? autoSubstreamToggle.checked : true,
+        inferenceStreamUrl: inferenceStreamUrlInput
+          ? inferenceStreamUrlInput.value.trim()
+          : "",
+        evidenceStreamUrl: evidenceStreamUrlInput
+          ? evidenceStreamUrlInput.value.trim()
+          : "",
         previewUrl,
         previewMode,
+        captureBackend: captureBackendSelect ? captureBackendSelect.value : "opencv",
         cameraId: activeCameraId || "",
         cameraName,
         cameraModel,
+        priority: "manual",
       }),
     });
     const payload = await response.json();
@@ -1601,6 +1805,16 @@ const buildConfigPayload = () => {
         Number(ollamaTimeoutInput ? ollamaTimeoutInput.value : "") ||
         DEFAULT_TIMEOUT_SECONDS,
       intervalSeconds: getInferenceIntervalSeconds(),
+      adaptiveInterval: ollamaAdaptiveToggle ? ollamaAdaptiveToggle.checked : false,
+      minIntervalSeconds: Number(
+        ollamaIntervalMinInput ? ollamaIntervalMinInput.value : ""
+      ) || null,
+      maxIntervalSeconds: Number(
+        ollamaIntervalMaxInput ? ollamaIntervalMaxInput.value : ""
+      ) || null,
+      nearTriggerWords: ollamaNearTriggerInput
+        ? ollamaNearTriggerInput.value.trim()
+        : "",
     },
     alerts: {
       emailEnabled: alertEmailToggle.checked,
@@ -1686,6 +1900,20 @@ const applyConfig = (payload) => {
         ollamaIntervalInput.value = ollama.timeoutSeconds;
       }
     }
+    if (ollamaAdaptiveToggle && ollama.adaptiveInterval !== undefined) {
+      ollamaAdaptiveToggle.checked = Boolean(ollama.adaptiveInterval);
+    }
+    if (ollamaIntervalMinInput && ollama.minIntervalSeconds) {
+      ollamaIntervalMinInput.value = ollama.minIntervalSeconds;
+    }
+    if (ollamaIntervalMaxInput && ollama.maxIntervalSeconds) {
+      ollamaIntervalMaxInput.value = ollama.maxIntervalSeconds;
+    }
+    if (ollamaNearTriggerInput && ollama.nearTriggerWords !== undefined) {
+      ollamaNearTriggerInput.value = Array.isArray(ollama.nearTriggerWords)
+        ? ollama.nearTriggerWords.join(", ")
+        : String(ollama.nearTriggerWords || "");
+    }
   }
   if (payload.alerts) {
     const alerts = payload.alerts;
@@ -1836,64 +2064,256 @@ const handleSaveConfig = async (event) => {
   addStatus("Save", "ok", "Configuration saved on server.");
 };
 
+const responseKey = (item) => item.id || `${item.timestamp}-${item.seq}`;
+
+const getResponseRowHeight = (item) =>
+  responseHeights.get(responseKey(item)) ||
+  (item.evidence && item.evidence.frames
+    ? RESPONSE_EVIDENCE_ROW_ESTIMATE
+    : RESPONSE_ROW_ESTIMATE);
+
+const buildResponseNode = (item) => {
+  const entry = document.createElement("div");
+  entry.className = "response-item";
+  if (item.triggered) {
+    entry.classList.add("yes");
+  }
+
+  const meta = document.createElement("div");
+  meta.className = "response-meta";
+  const timestamp = new Date(item.timestamp * 1000);
+  const cameraLabel = item.camera_name || item.camera_model || "";
+  const metaParts = [timestamp.toLocaleString(), item.model || "ollama"];
+  if (cameraLabel) {
+    metaParts.push(cameraLabel);
+  }
+  if (item.cached) {
+    metaParts.push("cached");
+  }
+  meta.textContent = metaParts.join(" · ");
+
+  const body = document.createElement("div");
+  body.textContent = item.text || "No response text.";
+
+  entry.appendChild(meta);
+  entry.appendChild(body);
+  if (item.id && item.evidence && item.evidence.frames) {
+    const base = `/api/evidence/${encodeURIComponent(item.id)}`;
+    const session = `session=${encodeURIComponent(sessionToken)}`;
+    const clipLink = document.createElement("a");
+    clipLink.href = `${base}.mjpeg?${session}`;
+    clipLink.target = "_blank";
+    clipLink.rel = "noopener";
+    clipLink.title = `Replay ${item.evidence.frames} frames around the trigger`;
+    const strip = document.createElement("img");
+    strip.className = "response-evidence";
+    strip.loading = "lazy";
+    strip.alt = "Frames before and after the trigger";
+    strip.src = `${base}.jpg?${session}`;
+    strip.addEventListener("load", () => {
+      responseHeights.set(responseKey(item), entry.offsetHeight);
+      scheduleResponsesRender();
+    });
+    clipLink.appendChild(strip);
+    entry.appendChild(clipLink);
+  }
+  return entry;
+};
+
+const buildResponseSpacer = (height) => {
+  const spacer = document.createElement("div");
+  spacer.className = "responses-spacer";
+  spacer.style.height = `${Math.max(0, height)}px`;
+  return spacer;
+};
+
 const renderResponses = () => {
+  responsesRenderQueued = false;
   if (!responsesWindow) {
     return;
   }
-  responsesWindow.innerHTML = "";
-  const showYesOnly = filterYesOnly ? filterYesOnly.checked : false;
-  const filtered = showYesOnly
-    ? ollamaResponses.filter((item) => item.triggered)
-    : ollamaResponses;
-
-  if (filtered.length === 0) {
+  if (ollamaResponses.length === 0) {
     const empty = document.createElement("div");
     empty.className = "list-empty";
     empty.textContent = "No responses yet.";
-    responsesWindow.appendChild(empty);
+    responsesWindow.replaceChildren(empty);
     return;
   }
 
-  filtered.forEach((item) => {
-    const entry = document.createElement("div");
-    entry.className = "response-item";
-    if (item.triggered) {
-      entry.classList.add("yes");
+  const scrollTop = responsesWindow.scrollTop;
+  const viewHeight = responsesWindow.clientHeight || 260;
+  let start = 0;
+  let top = 0;
+  while (start < ollamaResponses.length - 1) {
+    const height = getResponseRowHeight(ollamaResponses[start]) + RESPONSE_ROW_GAP;
+    if (top + height > scrollTop) {
+      break;
     }
+    top += height;
+    start += 1;
+  }
+  const first = Math.max(0, start - RESPONSES_OVERSCAN);
+  for (let index = start - 1; index >= first; index -= 1) {
+    top -= getResponseRowHeight(ollamaResponses[index]) + RESPONSE_ROW_GAP;
+  }
+  let end = start;
+  let bottomEdge = top;
+  for (let index = first; index < start; index += 1) {
+    bottomEdge += getResponseRowHeight(ollamaResponses[index]) + RESPONSE_ROW_GAP;
+  }
+  while (end < ollamaResponses.length && bottomEdge < scrollTop + viewHeight) {
+    bottomEdge += getResponseRowHeight(ollamaResponses[end]) + RESPONSE_ROW_GAP;
+    end += 1;
+  }
+  const last = Math.min(ollamaResponses.length, end + RESPONSES_OVERSCAN);
+  let remaining = 0;
+  for (let index = end; index < ollamaResponses.length; index += 1) {
+    remaining += getResponseRowHeight(ollamaResponses[index]) + RESPONSE_ROW_GAP;
+  }
+  for (let index = end; index < last; index += 1) {
+    remaining -= getResponseRowHeight(ollamaResponses[index]) + RESPONSE_ROW_GAP;
+  }
 
-    const meta = document.createElement("div");
-    meta.className = "response-meta";
-    const timestamp = new Date(item.timestamp * 1000);
-    const cameraLabel = item.camera_name || item.camera_model || "";
-    const metaParts = [timestamp.toLocaleString(), item.model || "ollama"];
-    if (cameraLabel) {
-      metaParts.push(cameraLabel);
+  const visible = ollamaResponses.slice(first, last);
+  const nodes = visible.map(buildResponseNode);
+  responsesWindow.replaceChildren(
+    buildResponseSpacer(top),
+    ...nodes,
+    buildResponseSpacer(remaining)
+  );
+  nodes.forEach((node, index) => {
+    if (node.offsetHeight) {
+      responseHeights.set(responseKey(visible[index]), node.offsetHeight);
     }
-    meta.textContent = metaParts.join(" · ");
+  });
 
-    const body = document.createElement("div");
-    body.textContent = item.text || "No response text.";
+  if (last >= ollamaResponses.length - RESPONSES_OVERSCAN && responsesHasMore) {
+    loadOlderResponses();
+  }
+};
 
-    entry.appendChild(meta);
-    entry.appendChild(body);
-    responsesWindow.appendChild(entry);
-  });
+const scheduleResponsesRender = () => {
+  if (responsesRenderQueued) {
+    return;
+  }
+  responsesRenderQueued = true;
+  window.requestAnimationFrame(renderResponses);
+};
+
+const getResponsesFilterQuery = () =>
+  filterYesOnly && filterYesOnly.checked ? "&triggered=1" : "";
+
+const pruneExpiredResponses = () => {
+  const cutoff = Date.now() / 1000 - RESPONSES_RETENTION_SECONDS;
+  while (
+    ollamaResponses.length > 0 &&
+    ollamaResponses[ollamaResponses.length - 1].timestamp < cutoff
+  ) {
+    responseHeights.delete(responseKey(ollamaResponses.pop()));
+  }
 };
 
-const fetchResponses = async () => {
+const loadOlderResponses = async () => {
+  if (responsesLoadingOlder || !responsesHasMore || ollamaResponses.length === 0) {
+    return;
+  }
+  responsesLoadingOlder = true;
+  const oldest = ollamaResponses[ollamaResponses.length - 1];
   try {
-    const response = await apiFetch("/api/ollama-responses");
+    const response = await apiFetch(
+      `/api/ollama-responses?before=${oldest.seq}&limit=${RESPONSES_PAGE_SIZE}${getResponsesFilterQuery()}`
+    );
     const payload = await response.json();
     if (payload.ok) {
-      ollamaResponses = payload.responses || [];
+      const known = new Set(ollamaResponses.map(responseKey));
+      (payload.responses || []).forEach((item) => {
+        if (!known.has(responseKey(item))) {
+          ollamaResponses.push(item);
+        }
+      });
+      responsesHasMore = Boolean(payload.has_more);
+      scheduleResponsesRender();
+    }
+  } catch (error) {
+    // Silently ignore; older pages load again on the next scroll.
+  } finally {
+    responsesLoadingOlder = false;
+  }
+};
+
+const fetchResponses = async ({ reset = false } = {}) => {
+  if (responsesFetchInFlight) {
+    return;
+  }
+  responsesFetchInFlight = true;
+  let reload = false;
+  try {
+    const filter = getResponsesFilterQuery();
+    if (reset || responsesCursor === null) {
+      const response = await apiFetch(
+        `/api/ollama-responses?limit=${RESPONSES_PAGE_SIZE}${filter}`
+      );
+      const payload = await response.json();
+      if (payload.ok) {
+        ollamaResponses = payload.responses || [];
+        responseHeights.clear();
+        responsesCursor = payload.cursor;
+        responsesHasMore = Boolean(payload.has_more);
+        if (responsesWindow) {
+          responsesWindow.scrollTop = 0;
+        }
+        renderResponses();
+      }
+      return;
+    }
+    const response = await apiFetch(
+      `/api/ollama-responses?since=${responsesCursor}&limit=${RESPONSES_PAGE_SIZE}${filter}`
+    );
+    const payload = await response.json();
+    if (!payload.ok) {
+      return;
+    }
+    if (payload.reset) {
+      reload = true;
+      return;
+    }
+    const updated = new Map(
+      (payload.updated || []).map((item) => [responseKey(item), item])
+    );
+    if (updated.size > 0) {
+      ollamaResponses = ollamaResponses.map(
+        (item) => updated.get(responseKey(item)) || item
+      );
+    }
+    const known = new Set(ollamaResponses.map(responseKey));
+    const added = (payload.responses || []).filter(
+      (item) => !known.has(responseKey(item))
+    );
+    if (added.length > 0) {
+      ollamaResponses = added.concat(ollamaResponses);
+      if (responsesWindow && responsesWindow.scrollTop > 0) {
+        responsesWindow.scrollTop += added.reduce(
+          (total, item) => total + getResponseRowHeight(item) + RESPONSE_ROW_GAP,
+          0
+        );
+      }
+    }
+    responsesCursor = payload.cursor;
+    pruneExpiredResponses();
+    if (added.length > 0 || updated.size > 0) {
       renderResponses();
     }
   } catch (error) {
     // Silently ignore; responses panel is optional.
+  } finally {
+    responsesFetchInFlight = false;
+    if (reload) {
+      fetchResponses({ reset: true });
+    }
   }
 };
 
-const fetchModels = async () => {
+const fetchModels = async (force = false) => {
   const host = ollamaHostInput.value.trim();
   const port = Number(ollamaPortInput.value);
   if (!host || !(port >= 1 && port <= 65535)) {
@@ -1922,7 +2342,9 @@ const fetchModels = async () => {
   }, 250);
   try {
     const response = await apiFetch(
-      `/api/ollama-tags?host=${encodeURIComponent(host)}&port=${port}`,
+      `/api/ollama-tags?host=${encodeURIComponent(host)}&port=${port}&force=${
+        force ? "1" : "0"
+      }`,
       { signal: controller.signal }
     );
     const payload = await response.json();
@@ -1990,6 +2412,45 @@ const fetchModels = async () => {
   }
 };
 
+const formatBytesMb = (bytes) => `${Math.round(bytes / 1024 / 1024)}MB`;
+
+const formatPullProgress = (item) => {
+  if (!item.total) {
+    return "";
+  }
+  const percent = Math.min(100, Math.round((item.completed / item.total) * 100));
+  let text = `${percent}% · ${formatBytesMb(item.completed)} / ${formatBytesMb(
+    item.total
+  )}`;
+  if (item.bytes_per_second) {
+    text = `${text} · ${formatBytesMb(item.bytes_per_second)}/s`;
+  }
+  if (item.eta_seconds) {
+    text = `${text} · ${Math.ceil(item.eta_seconds)}s left`;
+  }
+  return text;
+};
+
+const renderPullHosts = (hosts) => {
+  if (!modelPullHosts) {
+    return;
+  }
+  modelPullHosts.innerHTML = "";
+  if (!hosts || hosts.length < 2) {
+    return;
+  }
+  hosts.forEach((item) => {
+    const row = document.createElement("li");
+    row.className = `pull-host ${item.state}`;
+    const progress = formatPullProgress(item);
+    const attempts = item.attempts > 1 ? ` · attempt ${item.attempts}` : "";
+    row.textContent = `${item.backend}: ${item.status}${
+      progress ? ` (${progress})` : ""
+    }${attempts}`;
+    modelPullHosts.appendChild(row);
+  });
+};
+
 const updatePullStatus = async () => {
   try {
     const response = await apiFetch("/api/ollama-pull-status");
@@ -1997,50 +2458,53 @@ const updatePullStatus = async () => {
     if (!payload.ok) {
       return;
     }
+    renderPullHosts(payload.hosts);
     if (payload.in_progress) {
       pullInFlight = true;
       setPullControls(true);
-      const target =
-        payload.model && payload.host && payload.port
-          ? `${payload.model} on ${payload.host}:${payload.port}`
-          : payload.model
-            ? payload.model
-            : "model";
-      let detail = payload.status || `Pulling ${target}…`;
-      if (payload.completed && payload.total) {
-        const percent = Math.min(
-          100,
-          Math.round((payload.completed / payload.total) * 100)
-        );
-        const completedMb = Math.round(payload.completed / 1024 / 1024);
-        const totalMb = Math.round(payload.total / 1024 / 1024);
-        detail = `${detail} (${percent}% · ${completedMb}MB / ${totalMb}MB)`;
-      }
-      setModelPullStatus("info", detail);
+      const progress = formatPullProgress(payload);
+      const detail = payload.status || `Pulling ${payload.model || "model"}…`;
+      setModelPullStatus("info", progress ? `${detail} (${progress})` : detail);
       if (payload.completed && payload.total) {
         setModelPullProgress(payload.completed, payload.total, false);
       } else {
         setModelPullProgress(0, 100, true);
       }
-      if (pullRequested && !pullStatusTimer) {
-        pullStatusTimer = window.setInterval(updatePullStatus, 5000);
+      if (!pullStatusTimer) {
+        pullStatusTimer = window.setInterval(updatePullStatus, PULL_STATUS_POLL_MS);
       }
+      return;
+    }
+    pullInFlight = false;
+    setPullControls(false);
+    if (pullStatusTimer) {
+      window.clearInterval(pullStatusTimer);
+      pullStatusTimer = null;
+    }
+    if (payload.status) {
+      setModelPullStatus(payload.error ? "error" : "", payload.status);
+    }
+    if (payload.total) {
+      setModelPullProgress(payload.completed, payload.total, false);
     } else {
-      pullInFlight = false;
-      setPullControls(false);
-      if (payload.status) {
-        setModelPullStatus("", payload.status);
-      }
-      if (payload.total) {
-        setModelPullProgress(payload.total, payload.total, false);
+      setModelPullProgress(0, 100, false);
+    }
+    if (pullRequested) {
+      pullRequested = false;
+      const hosts = payload.hosts || [];
+      const done = hosts.filter((item) => item.state === "done").length;
+      if (payload.error) {
+        addStatus("Model pull", "error", payload.error);
+      } else if (done > 0 && done === hosts.length) {
+        addStatus(
+          "Model pull",
+          "ok",
+          hosts.length > 1 ? `Pulled to ${done} hosts.` : payload.status
+        );
       } else {
-        setModelPullProgress(0, 100, false);
+        addStatus("Model pull", "warn", payload.status || "Pull stopped.");
       }
-      if (pullStatusTimer) {
-        window.clearInterval(pullStatusTimer);
-        pullStatusTimer = null;
-      }
-      pullRequested = false;
+      await fetchModels(true);
     }
   } catch (error) {
     // Ignore status fetch failures.
@@ -2089,11 +2553,17 @@ const analyzeOnce = async () => {
           trigger,
           timeoutSeconds,
           streamUrl,
+          autoSubstream: camera.autoSubstream !== false,
+          inferenceStreamUrl: camera.inferenceStreamUrl || "",
+          evidenceStreamUrl: camera.evidenceStreamUrl || "",
+          verdictCacheSeconds: camera.verdictCacheSeconds,
+          captureBackend: camera.captureBackend || "opencv",
           previewUrl,
           previewMode,
           cameraId: camera.id,
           cameraName: camera.name,
           cameraModel: camera.model,
+          priority: "routine",
         }),
       });
       const payload = await response.json();
@@ -2530,13 +3000,32 @@ if (importConfigBtn && configFileInput) {
   });
 }
 if (filterYesOnly) {
-  filterYesOnly.addEventListener("change", renderResponses);
+  filterYesOnly.addEventListener("change", () => fetchResponses({ reset: true }));
 }
 if (refreshResponsesBtn) {
-  refreshResponsesBtn.addEventListener("click", fetchResponses);
+  refreshResponsesBtn.addEventListener("click", () =>
+    fetchResponses({ reset: true })
+  );
+}
+if (exportResponsesBtn) {
+  exportResponsesBtn.addEventListener("click", () => {
+    const params = new URLSearchParams({
+      format: exportFormatSelect ? exportFormatSelect.value : "ndjson",
+      session: sessionToken,
+    });
+    if (filterYesOnly && filterYesOnly.checked) {
+      params.set("triggered", "1");
+    }
+    const link = document.createElement("a");
+    link.href = `/api/ollama-responses/export?${params.toString()}`;
+    link.download = "";
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+  });
 }
 if (fetchModelsBtn) {
-  fetchModelsBtn.addEventListener("click", fetchModels);
+  fetchModelsBtn.addEventListener("click", () => fetchModels(true));
 }
 if (pullModelBtn) {
   pullModelBtn.addEventListener("click", async () => {
@@ -2552,126 +3041,56 @@ if (pullModelBtn) {
       setModelPullStatus("error", "Missing host, port, or model.");
       return;
     }
-    addStatus("Model pull", "info", `Pulling ${model} from Ollama...`);
+    const extraHosts = pullHostsInput
+      ? pullHostsInput.value
+          .split(",")
+          .map((item) => item.trim())
+          .filter(Boolean)
+      : [];
+    const hosts = [`${host}:${port}`, ...extraHosts];
+    const target = hosts.length > 1 ? `${hosts.length} hosts` : host;
+    addStatus("Model pull", "info", `Pulling ${model} to ${target}...`);
     setModelPullStatus("info", `Pulling ${model}…`);
     setModelPullProgress(0, 100, true);
     pullInFlight = true;
     setPullControls(true);
-    pullRequested = true;
-    if (!pullStatusTimer) {
-      pullStatusTimer = window.setInterval(updatePullStatus, 5000);
-    }
     try {
       const response = await apiFetch("/api/ollama-pull", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ host, port, model, stream: true }),
+        body: JSON.stringify({ model, hosts }),
       });
-      if (!response.ok || !response.body) {
-        const payload = await response.json();
+      const payload = await response.json();
+      if (!payload.ok) {
         addStatus("Model pull", "error", payload.error || "Model pull failed.");
         setModelPullStatus("error", payload.error || "Model pull failed.");
         setModelPullProgress(0, 100, false);
         pullInFlight = false;
         setPullControls(false);
-        if (payload && payload.in_progress) {
-          setModelPullStatus("info", payload.status || "Another pull is in progress.");
-          setModelPullProgress(payload.completed || 0, payload.total || 100, true);
-          pullInFlight = true;
-          setPullControls(true);
+        if (payload.in_progress) {
+          await updatePullStatus();
         }
         return;
       }
-
-      const reader = response.body.getReader();
-      const decoder = new TextDecoder();
-      let buffer = "";
-      let lastStatus = "";
-      let lastProgressText = "";
-      let lastBytes = 0;
-      let lastBytesAt = 0;
-      let smoothRate = null;
-      while (true) {
-        const { value, done } = await reader.read();
-        if (done) {
-          break;
-        }
-        buffer += decoder.decode(value, { stream: true });
-        let lineBreak = buffer.indexOf("\n");
-        while (lineBreak >= 0) {
-          const line = buffer.slice(0, lineBreak).trim();
-          buffer = buffer.slice(lineBreak + 1);
-          if (line) {
-            try {
-              const payload = JSON.parse(line);
-              if (payload.error) {
-                throw new Error(payload.error);
-              }
-              if (payload.status) {
-                lastStatus = payload.status;
-                setModelPullStatus("info", payload.status);
-              }
-              if (payload.completed && payload.total) {
-                setModelPullProgress(payload.completed, payload.total, false);
-                const percent = Math.min(
-                  100,
-                  Math.round((payload.completed / payload.total) * 100)
-                );
-                const completedMb = Math.round(payload.completed / 1024 / 1024);
-                const totalMb = Math.round(payload.total / 1024 / 1024);
-                const now = Date.now();
-                let speedText = " · 0MB/s";
-                if (lastBytesAt && payload.completed >= lastBytes) {
-                  const elapsedSec = (now - lastBytesAt) / 1000;
-                  if (elapsedSec > 0) {
-                    const rate = (payload.completed - lastBytes) / elapsedSec;
-                    const alpha = 0.2;
-                    smoothRate = smoothRate === null ? rate : alpha * rate + (1 - alpha) * smoothRate;
-                    const rateMb = Math.round(smoothRate / 1024 / 1024);
-                    speedText = ` · ${rateMb}MB/s`;
-                  }
-                }
-                lastBytes = payload.completed;
-                lastBytesAt = now;
-                lastProgressText = `${percent}% · ${completedMb}MB / ${totalMb}MB${speedText}`;
-                if (lastStatus) {
-                  setModelPullStatus("info", `${lastStatus} (${lastProgressText})`);
-                } else {
-                  setModelPullStatus("info", `Downloading… ${lastProgressText}`);
-                }
-              }
-            } catch (error) {
-              throw error;
-            }
-          }
-          lineBreak = buffer.indexOf("\n");
-        }
-      }
-      if (lastStatus) {
-        const message = lastProgressText
-          ? `${lastStatus} (${lastProgressText})`
-          : lastStatus;
-        addStatus("Model pull", "ok", message);
-        setModelPullStatus("ok", message);
-      } else {
-        addStatus("Model pull", "ok", "Pull complete.");
-        setModelPullStatus("ok", "Pull complete.");
+      if (payload.busy && payload.busy.length) {
+        addStatus(
+          "Model pull",
+          "warn",
+          `Skipped ${payload.busy.join(", ")}: a pull is already running there.`
+        );
       }
-      setModelPullProgress(100, 100, false);
-      await fetchModels();
+      pullRequested = true;
+      await updatePullStatus();
     } catch (error) {
-      addStatus("Model pull", "error", "Failed to reach Ollama host.");
-      setModelPullStatus("error", "Failed to reach Ollama host.");
+      addStatus("Model pull", "error", "Failed to reach the server.");
+      setModelPullStatus("error", "Failed to reach the server.");
       setModelPullProgress(0, 100, false);
-    } finally {
       pullInFlight = false;
       setPullControls(false);
-      if (!pullStatusTimer) {
-        pullRequested = false;
-      }
     }
   });
 }
+
 if (cancelPullBtn) {
   cancelPullBtn.addEventListener("click", async () => {
     if (!pullInFlight) {
@@ -2689,25 +3108,19 @@ if (cancelPullBtn) {
       const payload = await response.json();
       if (payload.ok) {
         addStatus("Model pull", "warn", payload.message || "Pull cancelled.");
-        setModelPullStatus("error", payload.message || "Pull cancelled.");
-        setModelPullProgress(0, 100, false);
-        pullInFlight = false;
-        setPullControls(false);
-        if (pullStatusTimer) {
-          window.clearInterval(pullStatusTimer);
-          pullStatusTimer = null;
-        }
         pullRequested = false;
+        await updatePullStatus();
       } else {
         addStatus("Model pull", "error", payload.error || "Cancel failed.");
         setModelPullStatus("error", payload.error || "Cancel failed.");
       }
     } catch (error) {
-      addStatus("Model pull", "error", "Failed to reach Ollama host.");
-      setModelPullStatus("error", "Failed to reach Ollama host.");
+      addStatus("Model pull", "error", "Failed to reach the server.");
+      setModelPullStatus("error", "Failed to reach the server.");
     }
   });
 }
+
 if (ollamaModelInput) {
   ollamaModelInput.addEventListener("change", toggleCustomModelInput);
 }
@@ -2736,6 +3149,12 @@ updateLiveModelLabel();
 setArmedState(armedState);
 setMinimalMode(minimalModePreference, false);
 fetchResponses();
+window.setInterval(fetchResponses, RESPONSES_POLL_MS);
+if (responsesWindow) {
+  responsesWindow.addEventListener("scroll", scheduleResponsesRender, {
+    passive: true,
+  });
+}
 toggleCustomModelInput();
 setModelPullStatus("", "Idle.");
 setModelPullProgress(0, 100, false);